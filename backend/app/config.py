@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,3 +9,89 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", os.getenv("SUPABASE_Service_Key"))
 JWT_SECRET = os.getenv("JWT_SECRET", "supersecretkey")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin")
+
+# Storage: "supabase", or "sqlite" for the embedded single-node backend (see app/sqlite_backend.py)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "talentscout.db")  # ":memory:" for tests and benchmarks
+
+# Supabase REST connection pool (shared keep-alive httpx client)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_KEEPALIVE_EXPIRY = float(os.getenv("DB_KEEPALIVE_EXPIRY", "30"))  # seconds an idle connection is kept
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "5"))  # seconds
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "15"))  # seconds, read/write/pool
+DB_HTTP2 = os.getenv("DB_HTTP2", "true").lower() in ("1", "true", "yes")
+
+# Interview prompt window: recent turns sent verbatim, older turns folded into a summary
+CONTEXT_RECENT_TURNS = int(os.getenv("CONTEXT_RECENT_TURNS", "6"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", "400"))
+
+# Add a Server-Timing header with per-stage durations (db, gemini, pdf_extract, ...) to every response
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+# In-process interview session cache (per worker)
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "1000"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "1800"))  # seconds
+
+# Persist interview turns from a background queue instead of before responding
+PERSIST_WRITE_BEHIND = os.getenv("PERSIST_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+
+# Background jobs (report generation, resume analysis); see app/services/job_service.py
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # concurrent jobs per process
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "5"))  # seconds, doubled per attempt
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "300"))  # seconds; also the lease before a stuck job is reclaimed
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "5"))  # seconds between sweeps for runnable jobs
+
+# Resume keyword table cache
+KEYWORD_CACHE_TTL = float(os.getenv("KEYWORD_CACHE_TTL", "300"))  # seconds
+
+# Bulk resume ingestion
+RESUME_BULK_WORKERS = int(os.getenv("RESUME_BULK_WORKERS", str(os.cpu_count() or 2)))
+RESUME_BULK_BATCH_SIZE = int(os.getenv("RESUME_BULK_BATCH_SIZE", "50"))
+RESUME_BULK_MAX_FILES = int(os.getenv("RESUME_BULK_MAX_FILES", "1000"))
+RESUME_BULK_MAX_BYTES = int(os.getenv("RESUME_BULK_MAX_BYTES", str(256 * 1024 * 1024)))  # uploads, and PDFs unzipped from them
+
+# PDF extraction limits
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+PDF_TIME_LIMIT = float(os.getenv("PDF_TIME_LIMIT", "20"))  # seconds
+PDF_SPOOL_THRESHOLD = int(os.getenv("PDF_SPOOL_THRESHOLD", str(4 * 1024 * 1024)))  # larger uploads go to a temp file
+RESUME_HASH_CACHE_SIZE = int(os.getenv("RESUME_HASH_CACHE_SIZE", "256"))  # uploads remembered by content hash
+# Uploads waiting for their analysis job; must be shared by every process that runs jobs
+RESUME_UPLOAD_DIR = os.getenv("RESUME_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "talentscout-uploads"))
+
+# Admission control for outbound Gemini calls (see app/services/admission.py)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))  # calls in flight per process
+LLM_QUEUE_SIZE = int(os.getenv("LLM_QUEUE_SIZE", "100"))  # waiting calls before new ones get 429
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))  # seconds a call may wait for a slot
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "1000"))  # requests per minute, per model; 0 = unlimited
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "1000000"))  # tokens per minute, per model; 0 = unlimited
+
+# Gemini model routing / circuit breakers
+MODEL_BREAKER_COOLDOWN = float(os.getenv("MODEL_BREAKER_COOLDOWN", "30"))  # seconds, after repeated failures
+MODEL_RATE_LIMIT_COOLDOWN = float(os.getenv("MODEL_RATE_LIMIT_COOLDOWN", "60"))  # seconds, after ResourceExhausted
+MODEL_FAILURE_THRESHOLD = int(os.getenv("MODEL_FAILURE_THRESHOLD", "3"))
+MODEL_HEDGE_ENABLED = os.getenv("MODEL_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# LLM response cache (reports / answer analysis; the interview chat opts out)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "512"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))  # seconds
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH")  # optional on-disk tier
+
+# Server-side context caching of static system instructions (needs a prompt above the model's minimum cacheable size)
+GEMINI_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() in ("1", "true", "yes")
+GEMINI_CONTEXT_CACHE_TTL = float(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600"))  # seconds
+
+# Ask Gemini for schema-constrained JSON (response_mime_type / response_schema) instead of repairing free text
+GEMINI_STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "true").lower() in ("1", "true", "yes")
+
+# LLM backend: "gemini", or "fake" for the offline stand-in used in load tests (see services/fake_gemini.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.8"))  # median seconds to first token
+FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.4"))  # lognormal spread
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "80"))
+FAKE_LLM_SEED = os.getenv("FAKE_LLM_SEED", "talentscout")
+FAKE_LLM_CASSETTE = os.getenv("FAKE_LLM_CASSETTE")  # JSON-lines file of recorded responses
+FAKE_LLM_CASSETTE_MODE = os.getenv("FAKE_LLM_CASSETTE_MODE", "replay").lower()  # replay | record
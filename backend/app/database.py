@@ -1,12 +1,122 @@
-from supabase import create_client, Client
-from app.config import SUPABASE_URL, SUPABASE_KEY
-
-_supabase: Client = None
-
-def get_supabase() -> Client:
-    global _supabase
-    if not _supabase:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise RuntimeError("Missing SUPABASE credentials in .env")
-        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    return _supabase
+"""Async database access.
+
+``init_db()`` runs in the FastAPI lifespan hook and creates one shared
+client for the process: an async PostgREST client for Supabase's REST API
+over a pooled, keep-alive (optionally HTTP/2) ``httpx`` transport, or the
+embedded ``SQLiteClient`` when ``STORAGE_BACKEND=sqlite``. Both expose the
+same query builder with an awaitable ``execute()``; ``get_db()`` returns
+the client.
+"""
+
+import time
+
+import httpx
+
+from app import metrics
+from app.config import (
+    SUPABASE_URL,
+    SUPABASE_KEY,
+    STORAGE_BACKEND,
+    SQLITE_PATH,
+    DB_POOL_SIZE,
+    DB_KEEPALIVE_EXPIRY,
+    DB_CONNECT_TIMEOUT,
+    DB_TIMEOUT,
+    DB_HTTP2,
+)
+
+_db = None
+
+class _TimedQuery:
+    """Wraps a query builder so that ``execute()`` is counted and timed."""
+
+    def __init__(self, builder, table: str):
+        self._builder = builder
+        self._table = table
+
+    async def execute(self):
+        start = time.perf_counter()
+        try:
+            with metrics.span("db"):
+                return await self._builder.execute()
+        finally:
+            metrics.db_query_seconds.observe(time.perf_counter() - start, table=self._table)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def chained(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Builders return a (possibly new) builder from each filter/modifier
+            return _TimedQuery(result, self._table) if hasattr(result, "execute") else result
+        return chained
+
+class _TimedClient:
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.table(name), name)
+
+    def rpc(self, name: str, params: dict = None) -> _TimedQuery:
+        return _TimedQuery(self._client.rpc(name, params or {}), f"rpc:{name}")
+
+    async def aclose(self):
+        await self._client.aclose()
+
+def _postgrest_client():
+    from postgrest import AsyncPostgrestClient
+
+    class PooledPostgrestClient(AsyncPostgrestClient):
+        # postgrest builds a bare httpx client by default; swap in the tuned pool
+        def create_session(self, base_url, headers, timeout, *args, **kwargs):
+            return httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                http2=DB_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=DB_POOL_SIZE,
+                    max_keepalive_connections=DB_POOL_SIZE,
+                    keepalive_expiry=DB_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(DB_TIMEOUT, connect=DB_CONNECT_TIMEOUT),
+                follow_redirects=True,
+            )
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise RuntimeError("Missing SUPABASE credentials in .env")
+    return PooledPostgrestClient(
+        f"{SUPABASE_URL.rstrip('/')}/rest/v1",
+        headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+    )
+
+async def init_db():
+    """Create the shared client (called once from the app lifespan)."""
+    global _db
+    if _db is None:
+        if STORAGE_BACKEND == "sqlite":
+            from app.sqlite_backend import SQLiteClient
+            _db = _TimedClient(SQLiteClient(SQLITE_PATH))
+        else:
+            _db = _TimedClient(_postgrest_client())
+    return _db
+
+async def close_db():
+    global _db
+    if _db is not None:
+        await _db.aclose()
+        _db = None
+
+UNIQUE_VIOLATION = "23505"
+
+def is_unique_violation(error: BaseException) -> bool:
+    """True for a duplicate-key error from either backend (both carry the Postgres SQLSTATE in ``code``)."""
+    return getattr(error, "code", None) == UNIQUE_VIOLATION
+
+def get_db():
+    """The shared database client; :func:`init_db` must have run."""
+    if _db is None:
+        raise RuntimeError("Database not initialized – init_db() runs in the app lifespan")
+    return _db
@@ -1,11 +1,35 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import interviews, candidates, resumes, auth
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app import metrics
+from app.config import METRICS_SERVER_TIMING
+from app.database import init_db, close_db
+from app.routers import interviews, candidates, resumes, auth, jobs
+from app.services import job_service, persistence_service, resume_service
+from app.services.admission import AdmissionRejected
+from app.services.gemini_service import router as model_router, admission
+from app.services.llm_cache import llm_cache
+from app.services.model_registry import registry as model_registry
+from contextlib import asynccontextmanager
+import asyncio
 import logging
+import time
 
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI(title="TalentScout API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await job_service.start()
+    resume_service.start_bulk_pool()
+    yield
+    resume_service.stop_bulk_pool()
+    await job_service.stop()
+    await persistence_service.flush()
+    await asyncio.to_thread(model_registry.close)
+    await close_db()
+
+app = FastAPI(title="TalentScout API", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -18,14 +42,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    timing = metrics.RequestTiming()
+    metrics.current_request.set(timing)
+    start = time.perf_counter()
+    response = await call_next(request)
+    if METRICS_SERVER_TIMING:
+        # Sent with the headers, so for a streamed body (SSE) it covers the time to the first byte only
+        response.headers["Server-Timing"] = timing.server_timing(time.perf_counter() - start)
+
+    body = response.body_iterator
+
+    async def observed_body():
+        # Observe once the body is fully sent (or the client goes away), not when
+        # the headers are, so streamed replies are timed end to end
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            elapsed = time.perf_counter() - start
+            # Label by route template, not raw path, so interview ids don't explode the series
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            metrics.http_request_seconds.observe(elapsed, method=request.method, route=route, status=response.status_code)
+            metrics.db_queries_per_request.observe(timing.count("db"), route=route)
+
+    response.body_iterator = observed_body()
+    return response
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
 app.include_router(interviews.router, prefix="/api/interviews", tags=["Interviews"])
 app.include_router(candidates.router, prefix="/api/candidates", tags=["Candidates"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["Resumes"])
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/api/health")
 def health_check():
-    return {"status": "ok", "service": "TalentScout API"}
+    return {
+        "status": "ok",
+        "service": "TalentScout API",
+        "models": model_router.snapshot(),
+        "admission": admission.snapshot(),
+        "llm_cache": llm_cache.stats(),
+        "model_registry": model_registry.snapshot(),
+        "jobs": job_service.snapshot(),
+    }
 # Force reload
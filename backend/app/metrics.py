@@ -0,0 +1,201 @@
+"""In-process metrics with a Prometheus text endpoint and per-request timing.
+
+Counters and histograms live in module-level registries and are rendered
+by ``/api/metrics`` in the Prometheus exposition format. ``span(stage)``
+times a block of work into the ``talentscout_stage_seconds`` histogram and
+also adds it to the current request's breakdown, which the middleware in
+``app/main.py`` reports as a ``Server-Timing`` header when
+``METRICS_SERVER_TIMING`` is enabled.
+
+Metrics are per worker process; scrape each worker (or run one worker)
+for a complete picture.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# Latency buckets (seconds) shared by all timing histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else f"{bound:g}"
+                    lines.append(f"{self.name}_bucket{_label_text((*self.labels, 'le'), (*key, le))} {cumulative:g}")
+                lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {series[-1]:g}")
+                lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative:g}")
+        return lines
+
+
+_registry: list[Counter | Histogram] = []
+
+
+def counter(name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, help, labels)
+    _registry.append(metric)
+    return metric
+
+
+def histogram(name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+    metric = Histogram(name, help, labels, buckets)
+    _registry.append(metric)
+    return metric
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Metrics recorded by the services
+# ---------------------------------------------------------------------------
+
+http_request_seconds = histogram(
+    "talentscout_http_request_seconds", "HTTP request latency", ("method", "route", "status")
+)
+stage_seconds = histogram("talentscout_stage_seconds", "Time spent per processing stage", ("stage",))
+db_queries_per_request = histogram(
+    "talentscout_db_queries_per_request", "Database round trips per HTTP request", ("route",), COUNT_BUCKETS
+)
+db_query_seconds = histogram("talentscout_db_query_seconds", "Database round-trip latency", ("table",))
+gemini_call_seconds = histogram(
+    "talentscout_gemini_call_seconds", "Gemini call latency per model and outcome", ("model", "outcome")
+)
+gemini_retries = counter("talentscout_gemini_retries_total", "Retry rounds after every model failed", ("call",))
+gemini_fallbacks = counter("talentscout_gemini_fallbacks_total", "Calls that ended with the canned fallback", ("call",))
+gemini_json_parses = counter(
+    "talentscout_gemini_json_parses_total", "Gemini JSON answers by the parse tier they needed", ("outcome",)
+)
+llm_cache_lookups = counter("talentscout_llm_cache_lookups_total", "LLM response cache lookups by result", ("result",))
+llm_cache_stores = counter("talentscout_llm_cache_stores_total", "Responses written to the LLM cache")
+write_behind_turns = counter(
+    "talentscout_write_behind_turns_total", "Write-behind interview turns by outcome", ("outcome",)
+)
+jobs_total = counter("talentscout_jobs_total", "Background job attempts by outcome", ("kind", "outcome"))
+job_seconds = histogram("talentscout_job_seconds", "Background job run time per attempt", ("kind",))
+admission_wait_seconds = histogram(
+    "talentscout_admission_wait_seconds", "Time Gemini calls waited for admission", ("priority",)
+)
+admission_rejected = counter(
+    "talentscout_admission_rejected_total", "Gemini calls rejected by admission control", ("priority", "reason")
+)
+pdf_pages = histogram("talentscout_pdf_pages", "Pages per extracted PDF", (), COUNT_BUCKETS)
+
+
+# ---------------------------------------------------------------------------
+# Per-request stage timing
+# ---------------------------------------------------------------------------
+
+class RequestTiming:
+    """Stage totals for one request, shared with worker threads via the context."""
+
+    def __init__(self) -> None:
+        self._stages: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def count(self, stage: str) -> int:
+        with self._lock:
+            return int(self._stages.get(stage, (0, 0.0))[0])
+
+    def server_timing(self, total: float) -> str:
+        with self._lock:
+            parts = [
+                f'{stage};dur={seconds * 1000:.1f};desc="{int(count)}x"'
+                for stage, (count, seconds) in self._stages.items()
+            ]
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+current_request: contextvars.ContextVar[RequestTiming | None] = contextvars.ContextVar("current_request", default=None)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        timing = current_request.get()
+        if timing is not None:
+            timing.add(stage, elapsed)
@@ -1,26 +1,138 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.database import get_supabase
+from app.database import get_db
 from typing import List, Optional
+import base64
+import datetime
+import json
+import uuid
 
 router = APIRouter()
 
+CANDIDATE_FIELDS = {"id", "name", "email", "phone", "experience", "position", "location", "tech_stack", "status", "created_at"}
+MAX_PAGE_SIZE = 200
+
+def _encode_cursor(row: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps([row["created_at"], row["id"]]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Return ``(created_at, id)`` from a cursor, re-serialized in canonical form.
+
+    Both values end up inside a PostgREST filter string, so anything that
+    doesn't parse as a timestamp and a uuid is rejected rather than passed on.
+    """
+    try:
+        created_at, candidate_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        timestamp = datetime.datetime.fromisoformat(created_at)
+        if timestamp.tzinfo is None:
+            raise ValueError("cursor timestamp has no timezone")
+        created_at = timestamp.astimezone(datetime.timezone.utc).isoformat(timespec="microseconds")
+        return created_at, str(uuid.UUID(candidate_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/")
-async def list_candidates(status: Optional[str] = None):
+async def list_candidates(
+    status: Optional[str] = None,
+    position: Optional[str] = None,
+    location: Optional[str] = None,
+    min_experience: Optional[float] = None,
+    fields: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """One page of candidates, newest first, keyset-paginated on (created_at, id).
+
+    Pass the returned `next_cursor` back as `cursor` for the next page.
+    `fields` is an optional comma-separated column projection.
+    """
+    columns = ["*"]
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(requested) - CANDIDATE_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        # id and created_at are always needed to build the next cursor
+        columns = list(dict.fromkeys(["id", "created_at", *requested]))
+
     try:
-        sb = get_supabase()
-        query = sb.table("candidates").select("*").order("created_at", desc=True)
+        query = (
+            get_db().table("candidates")
+            .select(", ".join(columns))
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(limit + 1)
+        )
         if status:
             query = query.eq("status", status)
-        res = query.execute()
-        return res.data
+        if position:
+            query = query.ilike("position", f"%{position}%")
+        if location:
+            query = query.ilike("location", f"%{location}%")
+        if min_experience is not None:
+            query = query.gte("experience", min_experience)
+        if cursor:
+            created_at, last_id = _decode_cursor(cursor)
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{last_id})')
+        res = await query.execute()
+
+        items = res.data[:limit]
+        has_more = len(res.data) > limit
+        return {
+            "items": items,
+            "next_cursor": _encode_cursor(items[-1]) if has_more else None,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _scores_by_candidate(candidate_ids: List[str]) -> dict:
+    """Scores for many candidates from one embedded query, grouped per candidate.
+
+    Candidates may have several interviews; their scores are merged, newest
+    interview last, and averaged per phase.
+    """
+    res = await (
+        get_db().table("interviews")
+        .select("id, candidate_id, current_step, created_at, interview_scores(*)")
+        .in_("candidate_id", candidate_ids)
+        .order("created_at")
+        .execute()
+    )
+    grouped = {cid: {"interviews": [], "scores": [], "phase_averages": {}, "avg_score": None} for cid in candidate_ids}
+    for interview in res.data:
+        entry = grouped[interview["candidate_id"]]
+        scores = sorted(interview.pop("interview_scores") or [], key=lambda s: s["created_at"])
+        entry["interviews"].append(interview)
+        entry["scores"].extend(scores)
+
+    for entry in grouped.values():
+        by_phase = {}
+        for s in entry["scores"]:
+            if s["score"] is not None:
+                by_phase.setdefault(s["category"], []).append(float(s["score"]))
+        entry["phase_averages"] = {phase: round(sum(v) / len(v), 1) for phase, v in by_phase.items()}
+        values = [v for vs in by_phase.values() for v in vs]
+        entry["avg_score"] = round(sum(values) / len(values), 1) if values else None
+    return grouped
+
+@router.get("/scores/batch")
+async def get_scores_batch(ids: str = Query(..., description="Comma-separated candidate ids")):
+    """Scores for a page of candidates in one round trip, keyed by candidate id."""
+    candidate_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(candidate_ids) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PAGE_SIZE} ids per request")
+    if not candidate_ids:
+        return {}
+    try:
+        return await _scores_by_candidate(candidate_ids)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{candidate_id}")
 async def get_candidate(candidate_id: str):
     try:
-        sb = get_supabase()
-        res = sb.table("candidates").select("*").eq("id", candidate_id).single().execute()
+        res = await get_db().table("candidates").select("*").eq("id", candidate_id).single().execute()
         if not res.data:
             raise HTTPException(status_code=404, detail="Candidate not found")
         return res.data
@@ -30,36 +142,16 @@ async def get_candidate(candidate_id: str):
 @router.get("/{candidate_id}/scores")
 async def get_candidate_scores(candidate_id: str):
     try:
-        sb = get_supabase()
-        # Get interview ID first
-        interview = sb.table("interviews").select("id").eq("candidate_id", candidate_id).single().execute()
-        if not interview.data:
-            return []
-            
-        scores = sb.table("interview_scores").select("*").eq("interview_id", interview.data["id"]).execute()
-        return scores.data
+        # Works for candidates with any number of interviews, unlike .single()
+        return (await _scores_by_candidate([candidate_id]))[candidate_id]["scores"]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/stats/summary")
-async def get_stats():
+async def get_stats(days: int = Query(30, ge=1, le=365)):
+    """Dashboard summary from the trigger-maintained counters (see get_stats_summary in the schema)."""
     try:
-        sb = get_supabase()
-        candidates = sb.table("candidates").select("id", "status", count="exact").execute()
-        total = candidates.count
-        
-        # Simplified stats for demo
-        completed = sb.table("candidates").select("*", count="exact").eq("status", "Completed").execute().count
-        
-        # Calculate average score
-        scores_res = sb.table("interview_scores").select("score").execute()
-        scores = [s["score"] for s in scores_res.data if s["score"] is not None]
-        avg_score = round(sum(scores) / len(scores), 1) if scores else 0
-        
-        return {
-            "total_candidates": total,
-            "completed_interviews": completed,
-            "avg_score": avg_score
-        }
+        res = await get_db().rpc("get_stats_summary", {"p_days": days}).execute()
+        return res.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
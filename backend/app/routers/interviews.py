@@ -1,39 +1,127 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, WebSocket
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any
-from app.database import get_supabase
-from app.services.interview_service import start_interview, process_message, get_interview_status, get_interview_report
+import asyncio
+import json
+import logging
+import uuid
+from app.services.interview_service import InterviewNotFound, start_interview, process_message, open_message_stream, get_interview_status, get_stored_report, request_report
+from app.routers.jobs import accepted
+from app.services.admission import AdmissionRejected
+from app.services.interview_channel import InterviewChannel
 from app.models.schemas import InterviewStart, InterviewMessage, InterviewStatus
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 @router.post("/start")
 async def start_new_interview(data: InterviewStart):
     try:
-        result = start_interview(data.candidate.dict())
+        result = await start_interview(data.candidate.dict())
         return result
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{interview_id}/message")
 async def send_message(interview_id: str, message: InterviewMessage):
     try:
-        result = process_message(interview_id, message.content)
+        result = await process_message(interview_id, message.content)
         return result
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{interview_id}/message/stream")
+async def stream_message(interview_id: str, message: InterviewMessage):
+    """Server-sent events: `delta` events with reply text, then a final `done` event."""
+    try:
+        events = await open_message_stream(interview_id, message.content)
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def event_source():
+        try:
+            async for event in events:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/{interview_id}/ws")
+async def interview_channel(websocket: WebSocket, interview_id: str):
+    """One connection for the whole interview; see `interview_channel` for the frames."""
+    await websocket.accept()
+    try:
+        uuid.UUID(interview_id)
+    except ValueError:
+        await websocket.close(code=4404, reason="Interview not found")
+        return
+    channel = InterviewChannel(interview_id)
+    try:
+        snapshot = await channel.open()
+    except InterviewNotFound:
+        # Final: the client stops reconnecting
+        await websocket.close(code=4404, reason="Interview not found")
+        return
+    except Exception as e:
+        # e.g. the database is unreachable; the client retries with backoff
+        logger.error(f"Could not open interview channel {interview_id}: {type(e).__name__}: {e}")
+        await websocket.close(code=1011, reason="Could not load the interview")
+        return
+
+    async def send():
+        await websocket.send_json(snapshot)
+        while True:
+            await websocket.send_json(await channel.outbox.get())
+
+    async def receive():
+        while True:
+            try:
+                frame = await websocket.receive_json()
+            except (ValueError, KeyError):
+                frame = {}
+            await channel.handle(frame if isinstance(frame, dict) else {})
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        # Both loops run until the socket goes away (WebSocketDisconnect or a failed send)
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        channel.close()
+
 @router.get("/{interview_id}/status")
 async def get_status(interview_id: str):
     try:
-        result = get_interview_status(interview_id)
+        result = await get_interview_status(interview_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=404, detail="Interview not found")
 
 @router.get("/{interview_id}/report")
-async def get_report(interview_id: str):
+async def get_report(interview_id: str, regenerate: bool = False):
+    """The stored report if it is current, else `202` with a job that builds it (see `/api/jobs/{id}`)."""
     try:
-        result = get_interview_report(interview_id)
-        return result
+        # Loads the interview even when regenerating, so an unknown id is a 404
+        report = await get_stored_report(interview_id)
+        if report is not None and not regenerate:
+            return report
+        job = await request_report(interview_id, regenerate=regenerate)
+    except InterviewNotFound:
+        raise HTTPException(status_code=404, detail="Interview not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return accepted(job)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from app.services import job_service
+
+router = APIRouter()
+
+MAX_WAIT = 60  # seconds
+
+def accepted(job: dict) -> JSONResponse:
+    """`202 Accepted` for a queued job, pointing at its status route."""
+    location = f"/api/jobs/{job['id']}"
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job["id"], "status": job["status"], "status_url": location},
+        headers={"Location": location},
+    )
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, wait: float = Query(0, ge=0, le=MAX_WAIT)):
+    """Job status and, once `done`, its result.
+
+    With `wait`, long-polls: the response is held until the job finishes or
+    `wait` seconds pass, whichever comes first.
+    """
+    try:
+        job = await job_service.wait(job_id, wait) if wait else await job_service.get(job_id)
+    except Exception:
+        job = None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
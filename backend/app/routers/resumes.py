@@ -1,6 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from app.services.resume_service import extract_text_from_pdf, analyze_resume_text, save_resume
-from app.database import get_supabase
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import asyncio
+import json
+from app.config import RESUME_BULK_MAX_BYTES
+from app.services.resume_service import analyze_known_upload, submit_analysis, expand_uploads, ingest_resumes_bulk, read_limited, PDFLimitError
+from app.routers.jobs import accepted
+from app.database import get_db
+from app.services.keyword_cache import keyword_cache
 
 router = APIRouter()
 
@@ -13,13 +20,13 @@ async def analyze_resume_endpoint(
         if file.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files allowed")
         
-        sb = get_supabase()
+        db = get_db()
         
         # Handle dummy/missing candidate
         target_candidate_id = candidate_id
         if not candidate_id or candidate_id == "00000000-0000-0000-0000-000000000000":
             # Create a guest candidate
-            guest_user = sb.table("candidates").insert({
+            guest_user = await db.table("candidates").insert({
                 "name": "Guest Candidate",
                 "email": "guest@example.com",
                 "status": "Resume Uploaded"
@@ -30,10 +37,10 @@ async def analyze_resume_endpoint(
                 raise HTTPException(status_code=500, detail="Failed to create guest candidate")
         else:
              # Verify candidate exists
-            check = sb.table("candidates").select("id").eq("id", candidate_id).execute()
+            check = await db.table("candidates").select("id").eq("id", candidate_id).execute()
             if not check.data:
                 # If not found, create one or fail. Let's create one to be safe for demo.
-                 guest_user = sb.table("candidates").insert({
+                 guest_user = await db.table("candidates").insert({
                     "id": candidate_id, # Try to use the provided ID if UUID valid, else let DB gen
                     "name": "Unknown Candidate",
                     "email": "unknown@example.com"
@@ -42,40 +49,82 @@ async def analyze_resume_endpoint(
                  # Better to just create a new one if not found.
                  if not guest_user.data:
                      # Fallback to creating new without ID
-                     guest_user = sb.table("candidates").insert({
+                     guest_user = await db.table("candidates").insert({
                         "name": "Guest Candidate",
                         "email": "guest@example.com"
                     }).execute()
                      target_candidate_id = guest_user.data[0]["id"]
 
-        content = extract_text_from_pdf(file.file)
-        analysis = analyze_resume_text(content)
-        
-        result = save_resume(target_candidate_id, file.filename, content, analysis)
-        
-        return result
+        # A file analyzed before is answered now; a new one is extracted and
+        # scored by a background job (202; poll /api/jobs/{job_id})
+        content_hash, resume = await analyze_known_upload(file.file, file.filename, target_candidate_id)
+        if resume is not None:
+            return resume
+        job = await submit_analysis(file.file, file.filename, target_candidate_id, content_hash)
+        return accepted(job)
+    except HTTPException:
+        raise
+    except PDFLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         print(f"Error in analyze_resume: {e}") # Debug log
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analyze/bulk")
+async def analyze_resumes_bulk(
+    files: List[UploadFile] = File(...),
+    candidate_id: Optional[str] = Form(None)
+):
+    """Analyze many PDFs (or zip archives of PDFs), streaming NDJSON events as each finishes."""
+    try:
+        uploads = []
+        budget = RESUME_BULK_MAX_BYTES
+        for f in files:
+            data = await asyncio.to_thread(read_limited, f.file, budget)
+            budget -= len(data)
+            uploads.append((f.filename, data))
+        items = await asyncio.to_thread(expand_uploads, uploads)
+    except PDFLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read uploads: {e}")
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF files found")
+
+    async def ndjson():
+        try:
+            async for event in ingest_resumes_bulk(items, candidate_id):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
 @router.get("/keywords")
 async def get_keywords():
     try:
-        sb = get_supabase()
-        res = sb.table("resume_keywords").select("*").execute()
-        return res.data
+        return (await keyword_cache.get()).keywords
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/keywords")
 async def add_keyword(keyword: str, category: str, weight: float = 1.0):
     try:
-        sb = get_supabase()
-        res = sb.table("resume_keywords").insert({
+        res = await get_db().table("resume_keywords").insert({
             "keyword": keyword, 
             "category": category, 
             "weight": weight
         }).execute()
+        await keyword_cache.refresh()
         return res.data[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/keywords/refresh")
+async def refresh_keywords():
+    """Reload the keyword cache after edits made outside the API."""
+    try:
+        snapshot = await keyword_cache.refresh()
+        return {"version": snapshot.version, "total_keywords": len(snapshot.keywords)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
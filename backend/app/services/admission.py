@@ -0,0 +1,230 @@
+"""Admission control for outbound Gemini calls.
+
+Every call in ``gemini_service`` first takes a slot from its process-wide
+``admission`` controller. At most ``LLM_MAX_CONCURRENCY`` calls run at
+once, and each model has a requests-per-minute and a tokens-per-minute
+bucket (``GEMINI_RPM``, ``GEMINI_TPM``); a call is admitted only while
+some model has budget for it. Callers that can't start yet wait in a
+bounded priority queue, live interview turns ahead of summaries, reports
+and analysis.
+
+When the queue is full and holds nothing of lower priority to displace, or
+a caller has waited ``LLM_QUEUE_TIMEOUT``, the call fails fast with
+:class:`AdmissionRejected`, which the API answers with ``429`` and
+``Retry-After``, instead of stacking more requests behind a rate limit.
+
+Buckets are charged per attempt, so retries and hedged duplicates count
+against the model they hit. Calls admitted in the same instant may take a
+bucket briefly below zero; later callers wait until it has refilled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app import metrics
+from app.config import LLM_MAX_CONCURRENCY, LLM_QUEUE_SIZE, LLM_QUEUE_TIMEOUT, GEMINI_RPM, GEMINI_TPM
+
+INTERACTIVE = 0  # live interview turns
+BACKGROUND = 1  # summaries, reports, answer analysis
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class AdmissionRejected(Exception):
+    """The call was not admitted; retry after ``retry_after`` seconds."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units a minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.level
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is now)."""
+        self._refill()
+        # A request larger than the whole bucket only waits for a full bucket
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def drain(self) -> None:
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        models: list[str],
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        queue_size: int = LLM_QUEUE_SIZE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT,
+        rpm: float = GEMINI_RPM,
+        tpm: float = GEMINI_TPM,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        # model -> (requests bucket, tokens bucket); a limit of 0 disables that bucket
+        self.buckets = {
+            m: (TokenBucket(rpm) if rpm > 0 else None, TokenBucket(tpm) if tpm > 0 else None) for m in models
+        }
+        self.active = 0
+        self._waiting: list[list] = []  # heap of [priority, seq, tokens, future]
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    # -- budget -------------------------------------------------------------
+
+    def wait_time(self, model: str, tokens: int) -> float:
+        requests, token_bucket = self.buckets[model]
+        return max(
+            requests.wait_time(1) if requests else 0.0,
+            token_bucket.wait_time(tokens) if token_bucket else 0.0,
+        )
+
+    def _ready_in(self, tokens: int) -> float:
+        return min(self.wait_time(m, tokens) for m in self.buckets)
+
+    def throttled(self, model: str) -> bool:
+        """True while ``model`` is out of budget; the router tries it last."""
+        return self.wait_time(model, 0) > 0
+
+    def charge(self, model: str, tokens: int) -> None:
+        """Record one request of ``tokens`` against ``model`` (called per attempt)."""
+        requests, token_bucket = self.buckets[model]
+        if requests:
+            requests.take(1)
+        if token_bucket:
+            token_bucket.take(tokens)
+
+    def exhaust(self, model: str) -> None:
+        """The API rate limited ``model``: hold callers until its request bucket refills."""
+        requests, _ = self.buckets[model]
+        if requests:
+            requests.drain()
+
+    # -- slots --------------------------------------------------------------
+
+    @asynccontextmanager
+    async def admit(self, priority: int, tokens: int) -> AsyncIterator[None]:
+        """Hold a slot for the enclosed call."""
+        await self.acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int, tokens: int) -> None:
+        """Take a slot, queueing by ``priority`` if none is free; pair with :meth:`release`."""
+        start = time.monotonic()
+        if not self._waiting and self.active < self.max_concurrency and self._ready_in(tokens) == 0:
+            self.active += 1
+            metrics.admission_wait_seconds.observe(0, priority=PRIORITY_NAMES[priority])
+            return
+
+        if len(self._waiting) >= self.queue_size:
+            self._displace(priority, tokens)
+
+        entry = [priority, next(self._seq), tokens, asyncio.get_running_loop().create_future()]
+        heapq.heappush(self._waiting, entry)
+        self._dispatch()
+        future = entry[3]
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(entry)
+            raise self._reject(priority, "queue_timeout", tokens) from None
+        except asyncio.CancelledError:
+            self._discard(entry)
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()  # granted just as the caller went away
+            raise
+        metrics.admission_wait_seconds.observe(time.monotonic() - start, priority=PRIORITY_NAMES[priority])
+
+    def release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+
+    def _displace(self, priority: int, tokens: int) -> None:
+        # Make room by rejecting the newest lowest-priority waiter, if it ranks below this caller
+        victim = max((e for e in self._waiting if not e[3].done()), default=None)
+        if victim is None or victim[0] <= priority:
+            raise self._reject(priority, "queue_full", tokens)
+        self._discard(victim)
+        victim[3].set_exception(self._reject(victim[0], "displaced", victim[2]))
+
+    def _discard(self, entry: list) -> None:
+        if entry in self._waiting:
+            self._waiting.remove(entry)
+            heapq.heapify(self._waiting)
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiters in priority order while capacity and budget allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting and self.active < self.max_concurrency:
+            priority, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            delay = self._ready_in(tokens)
+            if delay > 0:
+                # Strict priority: the head waits for budget, and nothing overtakes it
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._waiting)
+            self.active += 1
+            future.set_result(None)
+
+    def _reject(self, priority: int, reason: str, tokens: int) -> AdmissionRejected:
+        metrics.admission_rejected.inc(priority=PRIORITY_NAMES[priority], reason=reason)
+        # Budget wait if that's the bottleneck, else roughly the time for the queue to move
+        retry_after = max(self._ready_in(tokens), 1.0 if reason != "queue_timeout" else self.queue_timeout / 2)
+        return AdmissionRejected(f"Gemini capacity exceeded ({reason.replace('_', ' ')})", retry_after)
+
+    def snapshot(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": sum(1 for e in self._waiting if not e[3].done()),
+            "max_concurrency": self.max_concurrency,
+            "models": {
+                m: {
+                    "requests": round(r.available(), 1) if r else None,
+                    "tokens": round(t.available()) if t else None,
+                }
+                for m, (r, t) in self.buckets.items()
+            },
+        }
@@ -0,0 +1,95 @@
+"""Rolling context window for the interview agent.
+
+The last ``CONTEXT_RECENT_TURNS`` turns are sent to the model verbatim; older
+turns are folded into a running summary stored in ``interviews.metadata``
+under ``summary`` / ``summarized_count``. Folding happens after a turn has
+been answered, so it never adds latency to the candidate's reply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.config import CONTEXT_RECENT_TURNS, SUMMARY_TOKEN_BUDGET
+from app.database import get_db
+from app.services.gemini_service import summarize_transcript
+from app.services.session_cache import sessions
+
+logger = logging.getLogger(__name__)
+
+WINDOW_MESSAGES = CONTEXT_RECENT_TURNS * 2
+# Fold in batches of half a window so the summary is not rewritten every turn
+FOLD_BATCH = max(CONTEXT_RECENT_TURNS, 1)
+
+_folding: set[str] = set()
+_tasks: set[asyncio.Task] = set()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _cap_summary(summary: str) -> str:
+    max_chars = SUMMARY_TOKEN_BUDGET * 4
+    if len(summary) <= max_chars:
+        return summary
+    return summary[:max_chars].rsplit("\n", 1)[0]
+
+
+def window(messages: list[dict], metadata: dict | None) -> tuple[str | None, list[dict]]:
+    """Return ``(summary, recent_messages)`` to build the prompt from."""
+    metadata = metadata or {}
+    summary = metadata.get("summary")
+    summarized = metadata.get("summarized_count", 0) if summary else 0
+
+    recent = messages[summarized:]
+    # If folding has fallen behind (e.g. the summarizer is failing), drop the
+    # overflow rather than let the prompt grow without bound.
+    max_recent = WINDOW_MESSAGES + FOLD_BATCH
+    if len(recent) > max_recent:
+        recent = recent[-WINDOW_MESSAGES:]
+    return summary, recent
+
+
+def schedule_fold(interview_id: str, messages: list[dict], metadata: dict | None) -> None:
+    """Fold turns that have left the window into the summary, in the background."""
+    metadata = metadata or {}
+    summarized = metadata.get("summarized_count", 0) if metadata.get("summary") else 0
+    cutoff = len(messages) - WINDOW_MESSAGES
+    if cutoff - summarized < FOLD_BATCH or interview_id in _folding:
+        return
+
+    _folding.add(interview_id)
+    task = asyncio.create_task(_fold(interview_id, messages[summarized:cutoff], dict(metadata), cutoff))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _fold(interview_id: str, new_messages: list[dict], metadata: dict, cutoff: int) -> None:
+    try:
+        summary = await summarize_transcript(
+            metadata.get("summary"), new_messages, SUMMARY_TOKEN_BUDGET
+        )
+        if summary is None:
+            logger.warning(f"Summary fold failed for interview {interview_id}; will retry next turn")
+            return
+
+        metadata["summary"] = _cap_summary(summary)
+        metadata["summarized_count"] = cutoff
+        await (
+            get_db().table("interviews")
+            .update({"metadata": metadata})
+            .eq("id", interview_id)
+            .execute()
+        )
+        sessions.update(interview_id, metadata=metadata)
+        logger.info(
+            f"Folded {len(new_messages)} messages into summary for interview {interview_id} "
+            f"(~{estimate_tokens(metadata['summary'])} tokens)"
+        )
+    except Exception as e:
+        logger.error(f"Summary fold error for interview {interview_id}: {type(e).__name__}: {e}")
+    finally:
+        _folding.discard(interview_id)
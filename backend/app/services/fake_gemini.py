@@ -0,0 +1,261 @@
+"""Offline stand-in for the Gemini client (``LLM_BACKEND=fake``).
+
+``FakeModel`` exposes the one method the Gemini service uses,
+``generate_content_async`` (plain and ``stream=True``), so the model registry
+can hand it out in place of ``genai.GenerativeModel`` and nothing upstream
+changes. Responses are synthesized from the prompt with a seeded RNG, which
+makes runs repeatable and free of quota and network noise:
+
+- latency is drawn from a lognormal distribution (``FAKE_LLM_LATENCY`` is
+  the median, ``FAKE_LLM_LATENCY_SIGMA`` the spread);
+- ``FAKE_LLM_ERROR_RATE`` / ``FAKE_LLM_RATE_LIMIT_RATE`` inject
+  ``ServiceUnavailable`` / ``ResourceExhausted`` failures;
+- streams are paced at ``FAKE_LLM_TOKENS_PER_SECOND`` after the first token.
+
+A cassette file (``FAKE_LLM_CASSETTE``) makes the fake replay real answers:
+in ``record`` mode calls go to Gemini and each response text is appended to
+the cassette; in ``replay`` mode recorded texts are served (with the same
+simulated latency) and anything not on the cassette is synthesized.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+from typing import Any, AsyncIterator
+
+from google.api_core import exceptions as api_exceptions
+
+from app.config import (
+    FAKE_LLM_LATENCY,
+    FAKE_LLM_LATENCY_SIGMA,
+    FAKE_LLM_ERROR_RATE,
+    FAKE_LLM_RATE_LIMIT_RATE,
+    FAKE_LLM_TOKENS_PER_SECOND,
+    FAKE_LLM_SEED,
+    FAKE_LLM_CASSETTE,
+    FAKE_LLM_CASSETTE_MODE,
+)
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+PHASE_ORDER = ["technical", "project", "problem_solving", "behavioral", "completed"]
+# Chance that a synthesized interview reply moves on to the next phase
+ADVANCE_PROBABILITY = 0.35
+
+_PHASE_LINE = re.compile(r"Current Phase:\s*(\w+)")
+_NAME_LINE = re.compile(r"Name:\s*([^\n]+)")
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class Cassette:
+    """Append-only JSON-lines file of ``{"key", "text"}`` records."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, str] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["text"]
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        return self._entries.get(key)
+
+    def record(self, key: str, text: str) -> None:
+        with self._lock:
+            self._entries[key] = text
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "text": text}) + "\n")
+
+
+def request_key(model_name: str, system_instruction: str | None, contents: Any, generation_config: Any) -> str:
+    """Stable identity of a request, used for cassette lookups and seeding."""
+    config = generation_config
+    if config is not None and not isinstance(config, dict):
+        config = {k: v for k, v in vars(config).items() if v is not None}
+    payload = json.dumps([model_name, system_instruction, _prompt_text(contents), config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _prompt_text(contents: Any) -> str:
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(str(part) for part in contents)
+    return str(contents)
+
+
+class FakeModel:
+    """Drop-in for ``genai.GenerativeModel`` (``generate_content_async`` only)."""
+
+    def __init__(
+        self,
+        model_name: str,
+        system_instruction: str | None = None,
+        recorder: Any = None,
+        cassette: Cassette | None = None,
+    ) -> None:
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self._recorder = recorder  # real model, only in record mode
+        self._cassette = cassette
+
+    async def generate_content_async(self, contents: Any, generation_config: Any = None, stream: bool = False):
+        key = request_key(self.model_name, self.system_instruction, contents, generation_config)
+
+        if self._recorder is not None:
+            return await self._record(key, contents, generation_config, stream)
+
+        rng = random.Random(f"{FAKE_LLM_SEED}:{key}:{next(_calls)}")
+        await asyncio.sleep(_latency(rng))
+        roll = rng.random()
+        if roll < FAKE_LLM_RATE_LIMIT_RATE:
+            raise api_exceptions.ResourceExhausted(f"fake quota exceeded for {self.model_name}")
+        if roll < FAKE_LLM_RATE_LIMIT_RATE + FAKE_LLM_ERROR_RATE:
+            raise api_exceptions.ServiceUnavailable(f"fake outage for {self.model_name}")
+
+        text = self._cassette.get(key) if self._cassette is not None else None
+        if text is None:
+            text = self._synthesize(_prompt_text(contents), random.Random(f"{FAKE_LLM_SEED}:{key}"))
+
+        if stream:
+            return _stream(text)
+        return FakeResponse(text)
+
+    async def _record(self, key: str, contents: Any, generation_config: Any, stream: bool):
+        if not stream:
+            response = await self._recorder.generate_content_async(contents, generation_config=generation_config)
+            self._cassette.record(key, response.text)
+            return response
+
+        response = await self._recorder.generate_content_async(contents, generation_config=generation_config, stream=True)
+
+        async def chunks() -> AsyncIterator[FakeResponse]:
+            parts = []
+            async for chunk in response:
+                parts.append(chunk.text)
+                yield chunk
+            self._cassette.record(key, "".join(parts))
+
+        return chunks()
+
+    def _synthesize(self, prompt: str, rng: random.Random) -> str:
+        instruction = self.system_instruction or ""
+        if "TalentScout" in instruction:
+            return json.dumps(_interview_reply(prompt, rng))
+        if "HR analyst" in instruction:
+            return json.dumps(_report(rng))
+        if "interview response" in instruction:
+            return json.dumps(_analysis(rng))
+        return _summary(prompt)
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def __next__(self) -> int:
+        with self._lock:
+            self._n += 1
+            return self._n
+
+
+# Makes each call's latency/failure draw distinct while the text stays a function of the request
+_calls = _Counter()
+
+
+def _latency(rng: random.Random) -> float:
+    if FAKE_LLM_LATENCY <= 0:
+        return 0.0
+    return rng.lognormvariate(0, FAKE_LLM_LATENCY_SIGMA) * FAKE_LLM_LATENCY
+
+
+async def _stream(text: str) -> AsyncIterator[FakeResponse]:
+    chunk_size = CHARS_PER_TOKEN * 4
+    delay = 4 / FAKE_LLM_TOKENS_PER_SECOND if FAKE_LLM_TOKENS_PER_SECOND > 0 else 0
+    for i in range(0, len(text), chunk_size):
+        if i and delay:
+            await asyncio.sleep(delay)
+        yield FakeResponse(text[i:i + chunk_size])
+
+
+def _interview_reply(prompt: str, rng: random.Random) -> dict:
+    match = _PHASE_LINE.search(prompt)
+    phase = match.group(1) if match and match.group(1) in PHASE_ORDER else "technical"
+    name_match = _NAME_LINE.search(prompt)
+    first_name = name_match.group(1).split()[0] if name_match else "there"
+    opening = "Candidate:" not in prompt
+
+    if not opening and rng.random() < ADVANCE_PROBABILITY:
+        phase = PHASE_ORDER[min(PHASE_ORDER.index(phase) + 1, len(PHASE_ORDER) - 1)]
+
+    if opening:
+        reply = f"Hi {first_name}, welcome to your interview! To start, walk me through a recent technical problem you solved."
+    elif phase == "completed":
+        reply = f"Thanks {first_name}, that wraps up our interview. The hiring team will review your profile and be in touch."
+    else:
+        topic = phase.replace("_", " ")
+        reply = f"Good, thanks. Let's keep going with the {topic} part: question {rng.randint(1, 999)} – how would you approach it?"
+
+    return {
+        "reply": reply,
+        "phase": phase,
+        "score": None if opening else rng.randint(3, 10),
+        "assessment": None if opening else rng.choice(["Clear and specific.", "Somewhat vague.", "Solid reasoning."]),
+    }
+
+
+def _report(rng: random.Random) -> dict:
+    score = round(rng.uniform(4, 9), 1)
+    return {
+        "overall_score": score,
+        "recommendation": "Hire" if score >= 7 else "Maybe",
+        "summary": "Synthetic report produced by the offline Gemini backend.",
+        "strengths": ["Communicates clearly", "Relevant experience"],
+        "improvements": ["Go deeper on system design"],
+        "detailed_feedback": "Generated without calling Gemini; use for load and integration testing only.",
+    }
+
+
+def _analysis(rng: random.Random) -> dict:
+    return {
+        "score": rng.randint(3, 10),
+        "strengths": ["Response provided"],
+        "improvements": ["Add concrete examples"],
+        "overall_assessment": "Synthetic analysis from the offline Gemini backend.",
+    }
+
+
+def _summary(prompt: str) -> str:
+    turns = prompt.count("Candidate:")
+    return f"- {turns} further candidate answers covered (synthetic summary)."
+
+
+_cassette: Cassette | None = None
+
+
+def cassette() -> Cassette | None:
+    """The configured cassette, loaded on first use (None when not configured)."""
+    global _cassette
+    if _cassette is None and FAKE_LLM_CASSETTE and FAKE_LLM_CASSETTE_MODE in ("record", "replay"):
+        _cassette = Cassette(FAKE_LLM_CASSETTE)
+        logger.info(f"Loaded LLM cassette {FAKE_LLM_CASSETTE} ({len(_cassette)} entries, {FAKE_LLM_CASSETTE_MODE} mode)")
+    return _cassette
@@ -2,38 +2,114 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-import time
 import logging
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 import google.generativeai as genai
 
-from app.config import GEMINI_API_KEY
+from app import metrics
+from app.config import GEMINI_STRUCTURED_OUTPUT
+from app.services.admission import AdmissionController, AdmissionRejected, INTERACTIVE, BACKGROUND
+from app.services.model_registry import registry
+from app.services.model_router import ModelRouter, InvalidResponse, AllModelsFailed, is_rate_limited
+from app.services.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
-_configured = False
 MAX_RETRIES = 3
 BASE_DELAY = 1  # seconds
 
 
-def _ensure_configured() -> None:
-    global _configured
-    if not _configured:
-        if not GEMINI_API_KEY:
-            raise RuntimeError("GEMINI_API_KEY is not set in backend/.env")
-        genai.configure(api_key=GEMINI_API_KEY)
-        _configured = True
+MODELS = ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-2.0-flash-lite"]
 
+# Shared by the interview, summary, report and analysis paths
+admission = AdmissionController(MODELS)
+router = ModelRouter(MODELS, throttled=admission.throttled)
 
-MODELS = ["gemini-2.5-flash", "gemini-2.0-flash", "gemini-2.0-flash-lite"]
 
+def _estimate_tokens(prompt: str, system_instruction: str | None, generation_config: dict) -> int:
+    """Rough token cost of a call (~4 characters per token, plus the output cap)."""
+    chars = len(prompt) + len(system_instruction or "")
+    return chars // 4 + generation_config.get("max_output_tokens", 0)
+
+
+def _charged(attempt: Callable[[str], Awaitable[Any]], tokens: int) -> Callable[[str], Awaitable[Any]]:
+    """Wrap ``attempt`` so each try is counted against the model's rate-limit buckets."""
+    async def charged(model_name: str) -> Any:
+        admission.charge(model_name, tokens)
+        try:
+            return await attempt(model_name)
+        except Exception as e:
+            if is_rate_limited(e):
+                admission.exhaust(model_name)
+            raise
+    return charged
+
+
+async def _routed_call(
+    attempt: Callable[[str], Awaitable[Any]],
+    prompt: str,
+    generation_config: dict,
+    *,
+    cache: bool,
+    system_instruction: str | None = None,
+    retries: int = MAX_RETRIES,
+    label: str = "Gemini",
+    priority: int = BACKGROUND,
+) -> Any:
+    """Run ``attempt`` through admission control and the model router, consulting the response cache if asked.
+
+    Raises :class:`AllModelsFailed` when no model produced a usable result,
+    and :class:`AdmissionRejected` when the call could not get a slot;
+    failures are never cached.
+    """
+    key = llm_cache.key(MODELS, generation_config, prompt, system_instruction) if cache else None
+    if key is not None:
+        hit = llm_cache.get(key)
+        if hit is not None:
+            return hit
+
+    tokens = _estimate_tokens(prompt, system_instruction, generation_config)
+    async with admission.admit(priority, tokens):
+        with metrics.span("gemini"):
+            result = await router.call(_charged(attempt, tokens), retries=retries, base_delay=BASE_DELAY, label=label)
+    if key is not None:
+        llm_cache.set(key, result)
+    return result
+
+
+def _json_config(config: dict, schema: dict) -> dict:
+    """Add JSON-mode/response-schema settings to a generation config when enabled."""
+    if not GEMINI_STRUCTURED_OUTPUT:
+        return config
+    return {**config, "response_mime_type": "application/json", "response_schema": schema}
+
+
+def _parse_json(text: str, label: str) -> dict | None:
+    """Parse a model's JSON answer, falling back to :func:`_extract_json` and counting why.
+
+    With structured output on, any outcome other than "strict" means a model
+    ignored the response schema.
+    """
+    try:
+        result = json.loads(text)
+        if isinstance(result, dict):
+            metrics.gemini_json_parses.inc(outcome="strict")
+            return result
+    except (json.JSONDecodeError, TypeError):
+        pass
 
-def _get_model(model_name: str = None):
-    _ensure_configured()
-    return genai.GenerativeModel(model_name or MODELS[0])
+    result = _extract_json(text)
+    if result is None:
+        metrics.gemini_json_parses.inc(outcome="failed")
+    else:
+        metrics.gemini_json_parses.inc(outcome="lenient")
+        logger.warning(f"{label} needed lenient JSON parsing")
+    return result
 
 
 def _extract_json(text: str) -> dict | None:
@@ -101,12 +177,38 @@ You MUST respond with a JSON object containing these keys:
 """
 
 
-def generate_next_message(
+FALLBACK_REPLY = "That's interesting! Could you elaborate on that a bit more? I'd love to understand your experience better."
+
+PHASES = ["technical", "project", "problem_solving", "behavioral", "completed"]
+
+INTERVIEW_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "reply": {"type": "STRING"},
+        "phase": {"type": "STRING", "format": "enum", "enum": PHASES},
+        "score": {"type": "NUMBER", "nullable": True},
+        "assessment": {"type": "STRING", "nullable": True},
+    },
+    "required": ["reply", "phase", "score", "assessment"],
+}
+
+INTERVIEW_GENERATION_CONFIG = _json_config(
+    dict(temperature=0.7, max_output_tokens=800), INTERVIEW_RESPONSE_SCHEMA
+)
+
+
+def _build_interview_prompt(
     candidate_info: dict,
     messages: list[dict],
     current_phase: str,
-) -> dict[str, Any]:
-    """Generate the next interviewer message using full conversation context."""
+    summary: str | None = None,
+) -> str:
+    """Assemble the candidate profile and transcript for one turn.
+
+    ``INTERVIEW_SYSTEM_PROMPT`` is not included; it is sent as the model's
+    system instruction. ``messages`` may be only the recent tail of the
+    transcript; anything older is represented by ``summary``.
+    """
     tech_stack = candidate_info.get("tech_stack", "General")
     if isinstance(tech_stack, list):
         tech_stack = ", ".join(tech_stack)
@@ -121,7 +223,7 @@ def generate_next_message(
 - Current Phase: {current_phase}
 """
 
-    # Build full prompt with system instructions + conversation history
+    # Build the per-turn prompt from the conversation history
     conversation_lines = []
     for msg in messages:
         label = "Candidate" if msg["role"] == "user" else "TalentScout"
@@ -138,10 +240,13 @@ def generate_next_message(
 - Reference what they just said in your response.
 - Decide whether to ask a follow-up, move to the next topic, or transition to a new phase."""
 
-    full_prompt = f"""{INTERVIEW_SYSTEM_PROMPT}
-
-{context_block}
+    summary_block = f"""
+## Earlier in the interview (summary)
+{summary}
+""" if summary else ""
 
+    return f"""{context_block}
+{summary_block}
 ## Conversation so far
 {conversation_text}
 
@@ -150,68 +255,348 @@ def generate_next_message(
 
 Respond ONLY with a valid JSON object."""
 
-    for model_name in MODELS:
-        for attempt in range(MAX_RETRIES):
-            try:
-                model = _get_model(model_name)
-                response = model.generate_content(
-                    full_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.7,
-                        max_output_tokens=800,
-                    ),
-                )
 
-                raw_text = response.text
-                logger.info(f"Gemini [{model_name}] response (attempt {attempt+1}): {raw_text[:300]}")
-
-                result = _extract_json(raw_text)
-                if result and "reply" in result:
-                    return {
-                        "reply": result["reply"],
-                        "phase": result.get("phase", current_phase),
-                        "score": result.get("score"),
-                        "assessment": result.get("assessment"),
-                    }
-                else:
-                    logger.warning(f"Gemini returned invalid JSON structure: {raw_text[:300]}")
-                    # If we got text but not valid JSON, use the raw text as reply
-                    if raw_text and len(raw_text) > 10:
-                        return {
-                            "reply": raw_text.strip(),
-                            "phase": current_phase,
-                            "score": None,
-                            "assessment": None,
-                        }
+def _parse_interview_reply(raw_text: str, current_phase: str) -> dict[str, Any] | None:
+    """Turn raw model output into the reply dict, or None if it is unusable."""
+    result = _parse_json(raw_text, "Interview reply")
+    if result and "reply" in result:
+        return {
+            "reply": result["reply"],
+            "phase": result.get("phase", current_phase),
+            "score": result.get("score"),
+            "assessment": result.get("assessment"),
+        }
+
+    logger.warning(f"Gemini returned invalid JSON structure: {raw_text[:300]}")
+    # If we got text but not valid JSON, use the raw text as reply
+    if raw_text and len(raw_text) > 10:
+        return {
+            "reply": raw_text.strip(),
+            "phase": current_phase,
+            "score": None,
+            "assessment": None,
+        }
+    return None
 
-            except Exception as e:
-                logger.error(f"Gemini [{model_name}] error (attempt {attempt+1}/{MAX_RETRIES}): {type(e).__name__}: {e}")
-                if "ResourceExhausted" in type(e).__name__:
-                    # Rate limited — try next model immediately
-                    logger.info(f"Rate limited on {model_name}, trying next model...")
-                    break
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(BASE_DELAY * (2 ** attempt))
-                    continue
 
-    # Fallback if all retries fail
+def _fallback_reply(current_phase: str) -> dict[str, Any]:
     logger.error("All Gemini retries exhausted – returning fallback message")
     return {
-        "reply": "That's interesting! Could you elaborate on that a bit more? I'd love to understand your experience better.",
+        "reply": FALLBACK_REPLY,
         "phase": current_phase,
         "score": None,
         "assessment": None,
     }
 
 
+async def generate_next_message(
+    candidate_info: dict,
+    messages: list[dict],
+    current_phase: str,
+    summary: str | None = None,
+    cache: bool = False,
+) -> dict[str, Any]:
+    """Generate the next interviewer message using full conversation context.
+
+    Uncached by default: the chat runs at a temperature where identical
+    prompts are expected to produce fresh replies. Admitted ahead of
+    background calls; raises :class:`AdmissionRejected` when over capacity.
+    """
+    full_prompt = _build_interview_prompt(candidate_info, messages, current_phase, summary)
+
+    async def attempt(model_name: str) -> dict[str, Any]:
+        model = await registry.get(model_name, INTERVIEW_SYSTEM_PROMPT)
+        response = await model.generate_content_async(
+            full_prompt,
+            generation_config=genai.types.GenerationConfig(**INTERVIEW_GENERATION_CONFIG),
+        )
+
+        raw_text = response.text
+        logger.debug(f"Gemini [{model_name}] response: {raw_text[:300]}")
+
+        result = _parse_interview_reply(raw_text, current_phase)
+        if not result:
+            raise InvalidResponse("unusable interview reply")
+        return result
+
+    try:
+        return await _routed_call(
+            attempt, full_prompt, INTERVIEW_GENERATION_CONFIG,
+            cache=cache, system_instruction=INTERVIEW_SYSTEM_PROMPT, priority=INTERACTIVE,
+        )
+    except AllModelsFailed:
+        # Fallback if all retries fail
+        return _fallback_reply(current_phase)
+
+
+# ---------------------------------------------------------------------------
+# Streaming variant
+# ---------------------------------------------------------------------------
+
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_REPLY_KEY = re.compile(r'"reply"\s*:\s*"')
+
+
+def _hex(digits: str) -> int | None:
+    try:
+        return int(digits, 16) if len(digits) == 4 else None
+    except ValueError:
+        return None
+
+
+class ReplyStreamParser:
+    """Incrementally pull the ``reply`` string out of a JSON object being streamed.
+
+    Feed raw model chunks in arrival order; each call returns the reply text
+    decoded since the previous call. Other keys (``phase``, ``score``, ...) are
+    ignored here and read from the complete text once the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos: int | None = None  # index of the next undecoded reply char
+        self.done = False
+        self.reply = ""
+
+    @property
+    def emitted(self) -> bool:
+        return bool(self.reply)
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        if self.done:
+            return ""
+        if self._pos is None:
+            match = _REPLY_KEY.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        out = []
+        buf, i = self._buffer, self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # Escape sequence – wait for the rest of it if it was split across chunks
+            if i + 1 >= len(buf):
+                break
+            esc = buf[i + 1]
+            if esc == "u":
+                if i + 6 > len(buf):
+                    break
+                code = _hex(buf[i + 2:i + 6])
+                if code is not None and 0xD800 <= code < 0xDC00:
+                    # High surrogate: decode it together with the low half that should follow
+                    rest = buf[i + 6:i + 12]
+                    if len(rest) < 6 and rest[:2] == "\\u"[:len(rest)]:
+                        break  # the low half may still be on its way
+                    low = _hex(rest[2:]) if rest.startswith("\\u") else None
+                    if low is not None and 0xDC00 <= low < 0xE000:
+                        code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                        i += 6
+                if code is not None:
+                    out.append(chr(code))
+                i += 6
+            else:
+                out.append(_JSON_ESCAPES.get(esc, esc))
+                i += 2
+
+        self._pos = i
+        delta = "".join(out)
+        self.reply += delta
+        return delta
+
+
+async def stream_next_message(
+    candidate_info: dict,
+    messages: list[dict],
+    current_phase: str,
+    summary: str | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Stream the next interviewer message.
+
+    Yields ``{"type": "delta", "text": ...}`` events as the ``reply`` field
+    arrives and finishes with a single ``{"type": "done", ...}`` event carrying
+    the same keys as :func:`generate_next_message`. The admission slot is
+    held until the iterator finishes or is closed; :class:`AdmissionRejected`
+    is raised from the first ``__anext__``.
+    """
+    full_prompt = _build_interview_prompt(candidate_info, messages, current_phase, summary)
+    tokens = _estimate_tokens(full_prompt, INTERVIEW_SYSTEM_PROMPT, INTERVIEW_GENERATION_CONFIG)
+    async with admission.admit(INTERACTIVE, tokens):
+        async for event in _stream_attempts(full_prompt, current_phase, tokens):
+            yield event
+
+
+async def _stream_attempts(full_prompt: str, current_phase: str, tokens: int) -> AsyncIterator[dict[str, Any]]:
+    # Streams can't be hedged or transparently retried once text is out, so
+    # walk the router's ranking by hand and report outcomes back to it.
+    for attempt in range(MAX_RETRIES):
+        if attempt:
+            metrics.gemini_retries.inc(call="Stream")
+        for model_name in router.ranked():
+            parser = ReplyStreamParser()
+            raw_parts: list[str] = []
+            start = time.monotonic()
+            try:
+                admission.charge(model_name, tokens)
+                model = await registry.get(model_name, INTERVIEW_SYSTEM_PROMPT)
+                response = await model.generate_content_async(
+                    full_prompt,
+                    generation_config=genai.types.GenerationConfig(**INTERVIEW_GENERATION_CONFIG),
+                    stream=True,
+                )
+                async for chunk in response:
+                    raw_parts.append(chunk.text)
+                    delta = parser.feed(chunk.text)
+                    if delta:
+                        yield {"type": "delta", "text": delta}
+
+            except Exception as e:
+                if is_rate_limited(e):
+                    admission.exhaust(model_name)
+                router.record_failure(model_name, e, time.monotonic() - start)
+                logger.error(f"Gemini [{model_name}] stream error (attempt {attempt+1}/{MAX_RETRIES}): {type(e).__name__}: {e}")
+                if parser.emitted:
+                    # Part of the reply already reached the client – finish with what we have
+                    yield {"type": "done", "reply": parser.reply, "phase": current_phase, "score": None, "assessment": None}
+                    return
+                continue
+
+            raw_text = "".join(raw_parts)
+            logger.debug(f"Gemini [{model_name}] streamed response (attempt {attempt+1}): {raw_text[:300]}")
+            result = _parse_interview_reply(raw_text, current_phase)
+            if parser.emitted:
+                router.record_success(model_name, time.monotonic() - start)
+                # Keep the final reply identical to what the client already received
+                result = result or {"phase": current_phase, "score": None, "assessment": None}
+                yield {"type": "done", **result, "reply": parser.reply}
+                return
+            if result:
+                router.record_success(model_name, time.monotonic() - start)
+                yield {"type": "delta", "text": result["reply"]}
+                yield {"type": "done", **result}
+                return
+            # Same outcome as the non-streaming path: retried, not held against the model's health
+            router.record_failure(model_name, InvalidResponse("unusable interview reply"), time.monotonic() - start)
+            logger.error(f"Gemini [{model_name}] streamed an unusable reply (attempt {attempt+1}/{MAX_RETRIES})")
+
+        if attempt < MAX_RETRIES - 1:
+            await asyncio.sleep(BASE_DELAY * (2 ** attempt))
+
+    metrics.gemini_fallbacks.inc(call="Stream")
+    result = _fallback_reply(current_phase)
+    yield {"type": "delta", "text": result["reply"]}
+    yield {"type": "done", **result}
+
+
+# ---------------------------------------------------------------------------
+# Rolling transcript summary
+# ---------------------------------------------------------------------------
+
+SUMMARY_SYSTEM_PROMPT = """\
+You maintain a running summary of a technical interview so the interviewer can drop old turns from its context.
+
+Rewrite the current summary so it also covers the new turns. Keep every question already asked (so none is repeated), the candidate's key claims, technologies and projects mentioned, and how well they answered.
+Use terse bullet points and respond with the summary text only.
+"""
+
+
+async def summarize_transcript(
+    previous_summary: str | None,
+    messages: list[dict],
+    max_tokens: int,
+) -> str | None:
+    """Fold ``messages`` into ``previous_summary``. Returns None if every model fails or it isn't admitted."""
+    conversation_text = "\n".join(
+        f"{'Candidate' if m['role'] == 'user' else 'TalentScout'}: {m['content']}"
+        for m in messages
+    )
+
+    prompt = f"""## Current summary
+{previous_summary or "(empty – this is the beginning of the interview.)"}
+
+## New turns to fold in
+{conversation_text}
+
+Stay under {max_tokens} tokens."""
+
+    async def attempt(model_name: str) -> str:
+        model = await registry.get(model_name, SUMMARY_SYSTEM_PROMPT)
+        response = await model.generate_content_async(
+            prompt,
+            generation_config=genai.types.GenerationConfig(
+                temperature=0.2,
+                max_output_tokens=max_tokens,
+            ),
+        )
+        text = response.text.strip()
+        if not text:
+            raise InvalidResponse("empty summary")
+        return text
+
+    try:
+        return await _routed_call(
+            attempt, prompt, {"temperature": 0.2, "max_output_tokens": max_tokens},
+            cache=False, system_instruction=SUMMARY_SYSTEM_PROMPT, retries=1, label="Summary",
+        )
+    except (AllModelsFailed, AdmissionRejected):
+        return None
+
+
 # ---------------------------------------------------------------------------
 # Interview report generation
 # ---------------------------------------------------------------------------
 
-def generate_interview_report(
+REPORT_UNAVAILABLE_SUMMARY = "Automated analysis unavailable. Manual review recommended."
+
+
+REPORT_SYSTEM_PROMPT = """\
+You are an expert HR analyst reviewing a completed technical interview.
+
+Provide a comprehensive interview summary in this JSON format:
+{
+    "overall_score": <weighted average 0-10>,
+    "recommendation": "<Strong Hire | Hire | Maybe | No Hire>",
+    "summary": "<2-3 sentence overall summary>",
+    "strengths": ["<strength 1>", "<strength 2>", ...],
+    "improvements": ["<area 1>", "<area 2>", ...],
+    "detailed_feedback": "<paragraph with specific observations from the interview>"
+}
+
+Respond ONLY with valid JSON.
+"""
+
+REPORT_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "overall_score": {"type": "NUMBER"},
+        "recommendation": {"type": "STRING", "format": "enum", "enum": ["Strong Hire", "Hire", "Maybe", "No Hire"]},
+        "summary": {"type": "STRING"},
+        "strengths": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "improvements": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "detailed_feedback": {"type": "STRING"},
+    },
+    "required": ["overall_score", "recommendation", "summary", "strengths", "improvements", "detailed_feedback"],
+}
+
+REPORT_GENERATION_CONFIG = _json_config(
+    dict(temperature=0.5, max_output_tokens=1000), REPORT_RESPONSE_SCHEMA
+)
+
+
+async def generate_interview_report(
     candidate_info: dict,
     scores: list[dict],
     messages: list[dict],
+    cache: bool = True,
 ) -> dict[str, Any]:
     """Generate a comprehensive interview report/summary."""
     tech_stack = candidate_info.get("tech_stack", "General")
@@ -228,9 +613,7 @@ def generate_interview_report(
         for m in messages
     )
 
-    prompt = f"""You are an expert HR analyst reviewing a completed technical interview.
-
-## Candidate
+    prompt = f"""## Candidate
 - Name: {candidate_info.get('name')}
 - Position: {candidate_info.get('position')}
 - Experience: {candidate_info.get('experience')} years
@@ -240,47 +623,33 @@ def generate_interview_report(
 {scores_text}
 
 ## Full Transcript
-{conversation_text}
-
-## Instructions
-Provide a comprehensive interview summary in this JSON format:
-{{
-    "overall_score": <weighted average 0-10>,
-    "recommendation": "<Strong Hire | Hire | Maybe | No Hire>",
-    "summary": "<2-3 sentence overall summary>",
-    "strengths": ["<strength 1>", "<strength 2>", ...],
-    "improvements": ["<area 1>", "<area 2>", ...],
-    "detailed_feedback": "<paragraph with specific observations from the interview>"
-}}
-
-Respond ONLY with valid JSON."""
+{conversation_text}"""
+
+    async def attempt(model_name: str) -> dict[str, Any]:
+        model = await registry.get(model_name, REPORT_SYSTEM_PROMPT)
+        response = await model.generate_content_async(
+            [prompt],
+            generation_config=genai.types.GenerationConfig(**REPORT_GENERATION_CONFIG),
+        )
+        result = _parse_json(response.text, "Report")
+        if not result:
+            raise InvalidResponse("report was not valid JSON")
+        return result
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            _ensure_configured()
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            response = model.generate_content(
-                [prompt],
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.5,
-                    max_output_tokens=1000,
-                ),
-            )
-            result = _extract_json(response.text)
-            if result:
-                return result
-        except Exception as e:
-            logger.error(f"Report generation error (attempt {attempt+1}): {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(BASE_DELAY)
-                continue
+    try:
+        return await _routed_call(
+            attempt, prompt, REPORT_GENERATION_CONFIG,
+            cache=cache, system_instruction=REPORT_SYSTEM_PROMPT, label="Report",
+        )
+    except AllModelsFailed:
+        pass
 
     # Fallback
     avg = sum(s.get("score", 5) for s in scores) / max(len(scores), 1)
     return {
         "overall_score": round(avg, 1),
         "recommendation": "Maybe",
-        "summary": "Automated analysis unavailable. Manual review recommended.",
+        "summary": REPORT_UNAVAILABLE_SUMMARY,
         "strengths": ["Completed the interview"],
         "improvements": ["Analysis could not be generated"],
         "detailed_feedback": "The AI analysis service was unavailable. Please review the interview transcript manually.",
@@ -291,42 +660,60 @@ Respond ONLY with valid JSON."""
 # Resume analysis helper (kept for resume endpoint)
 # ---------------------------------------------------------------------------
 
-def analyze_response(question: str, answer: str) -> dict[str, Any]:
-    """Score a candidate answer (0-10) with strengths/improvements."""
-    for attempt in range(MAX_RETRIES):
-        try:
-            _ensure_configured()
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            prompt = f"""Analyze this interview response:
-
-Question: {question}
-Answer: {answer}
+ANALYSIS_SYSTEM_PROMPT = """\
+Analyze the interview response you are given.
 
 Respond with JSON:
-{{
+{
     "score": <0-10>,
     "strengths": [<list>],
     "improvements": [<list>],
     "overall_assessment": "<brief evaluation>"
-}}
-
-Respond ONLY with valid JSON."""
-
-            response = model.generate_content(
-                [prompt],
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=500,
-                ),
-            )
-            result = _extract_json(response.text)
-            if result:
-                return result
-        except Exception as e:
-            logger.error(f"Analyze response error: {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(BASE_DELAY * (2 ** attempt))
-                continue
+}
+
+Respond ONLY with valid JSON.
+"""
+
+# Same fields as ScoreSchema, minus the category the caller already knows
+ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "score": {"type": "NUMBER"},
+        "strengths": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "improvements": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "overall_assessment": {"type": "STRING"},
+    },
+    "required": ["score", "strengths", "improvements", "overall_assessment"],
+}
+
+ANALYSIS_GENERATION_CONFIG = _json_config(
+    dict(temperature=0.7, max_output_tokens=500), ANALYSIS_RESPONSE_SCHEMA
+)
+
+
+async def analyze_response(question: str, answer: str, cache: bool = True) -> dict[str, Any]:
+    """Score a candidate answer (0-10) with strengths/improvements."""
+    prompt = f"""Question: {question}
+Answer: {answer}"""
+
+    async def attempt(model_name: str) -> dict[str, Any]:
+        model = await registry.get(model_name, ANALYSIS_SYSTEM_PROMPT)
+        response = await model.generate_content_async(
+            [prompt],
+            generation_config=genai.types.GenerationConfig(**ANALYSIS_GENERATION_CONFIG),
+        )
+        result = _parse_json(response.text, "Analysis")
+        if not result:
+            raise InvalidResponse("analysis was not valid JSON")
+        return result
+
+    try:
+        return await _routed_call(
+            attempt, prompt, ANALYSIS_GENERATION_CONFIG,
+            cache=cache, system_instruction=ANALYSIS_SYSTEM_PROMPT, label="Analyze response",
+        )
+    except AllModelsFailed:
+        pass
 
     return {
         "score": 5,
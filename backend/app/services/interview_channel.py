@@ -0,0 +1,163 @@
+"""WebSocket channel for a live interview.
+
+One connection carries a whole interview: candidate messages go up, the
+interviewer's reply streams back, and nothing is re-established per turn.
+While a channel is open its session is pinned in ``session_cache``, so
+turns never go back to the database to reload it.
+
+Frames are JSON objects with a ``type``:
+
+client -> server
+    ``{"type": "message", "id": ..., "content": ...}`` – a candidate message;
+    ``id`` is chosen by the client and makes resends idempotent.
+    ``{"type": "ping"}``
+
+server -> client
+    ``session`` – sent first on every connect: transcript, current step,
+    ``last_message_id`` (the last completed turn) and ``pending`` (a turn
+    still in flight, with the reply streamed so far, or null).
+    ``delta`` / ``done`` – reply text and the final message, as over SSE.
+    ``error`` – the turn failed; ``retry_after`` is set when it was not admitted.
+    ``pong``
+
+A turn runs as its own task rather than inside the connection, so a
+dropped socket does not lose it. A client that reconnects gets the
+snapshot, then the rest of a reply still in flight; a message resent with
+an id the server already has attaches to that turn instead of starting
+another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+
+from app.services.admission import AdmissionRejected
+from app.services.interview_service import get_interview_status, open_message_stream
+from app.services.session_cache import sessions
+
+logger = logging.getLogger(__name__)
+
+
+class _LiveTurn:
+    """A turn being answered, and the channels listening to it."""
+
+    def __init__(self, message_id: str, content: str) -> None:
+        self.message_id = message_id
+        self.content = content
+        self.reply = ""
+        self.done: dict | None = None  # the final event, once sent
+        self.listeners: set[asyncio.Queue] = set()
+
+    def publish(self, event: dict) -> None:
+        for outbox in self.listeners:
+            outbox.put_nowait(event)
+
+    def listen(self, outbox: asyncio.Queue) -> None:
+        self.listeners.add(outbox)
+        if self.done is not None:
+            # Answered already and only being persisted: nothing more will stream
+            outbox.put_nowait(self.done)
+
+
+_live: dict[str, _LiveTurn] = {}  # interview id -> turn in flight
+_tasks: set[asyncio.Task] = set()
+
+
+class InterviewChannel:
+    """Server side of one WebSocket connection; events to send go to ``outbox``."""
+
+    def __init__(self, interview_id: str) -> None:
+        self.interview_id = interview_id
+        self.outbox: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def open(self) -> dict:
+        """Load and pin the session; return the ``session`` snapshot to send first."""
+        status = await get_interview_status(self.interview_id)
+        sessions.pin(self.interview_id)
+
+        session = sessions.get(self.interview_id) or {}
+        messages = [{"role": m["role"], "content": m["content"]} for m in status["messages"]]
+        live = _live.get(self.interview_id)
+        pending = None
+        if live is not None:
+            live.listen(self.outbox)
+            # The turn may not have recorded its user message yet
+            if not messages or messages[-1] != {"role": "user", "content": live.content}:
+                messages.append({"role": "user", "content": live.content})
+            pending = {"id": live.message_id, "reply": live.reply}
+
+        return {
+            "type": "session",
+            "interview_id": self.interview_id,
+            "current_step": status["current_step"],
+            "messages": messages,
+            "last_message_id": session.get("last_message_id"),
+            "pending": pending,
+        }
+
+    def close(self) -> None:
+        live = _live.get(self.interview_id)
+        if live is not None:
+            live.listeners.discard(self.outbox)
+        sessions.unpin(self.interview_id)
+
+    async def handle(self, frame: dict) -> None:
+        kind = frame.get("type")
+        if kind == "ping":
+            self.outbox.put_nowait({"type": "pong"})
+            return
+        content = frame.get("content")
+        if kind != "message" or not isinstance(content, str) or not content.strip():
+            self.outbox.put_nowait({"type": "error", "detail": "Expected a message frame with content"})
+            return
+        message_id = str(frame.get("id") or uuid.uuid4())
+
+        live = _live.get(self.interview_id)
+        if live is not None:
+            if live.message_id == message_id:
+                live.listen(self.outbox)  # a resend of the turn in flight
+            else:
+                self.outbox.put_nowait({
+                    "type": "error", "id": message_id, "detail": "The previous message is still being answered",
+                })
+            return
+
+        session = sessions.get(self.interview_id) or {}
+        if session.get("last_message_id") == message_id:
+            # A resend of a turn that finished while the client was away
+            last = session["messages"][-1]
+            self.outbox.put_nowait({
+                "type": "done", "id": message_id, "message": last["content"], "current_step": session["step"],
+            })
+            return
+
+        live = _LiveTurn(message_id, content)
+        live.listeners.add(self.outbox)
+        _live[self.interview_id] = live
+        task = asyncio.create_task(_run_turn(self.interview_id, live))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+
+async def _run_turn(interview_id: str, live: _LiveTurn) -> None:
+    try:
+        events = await open_message_stream(interview_id, live.content)
+        async for event in events:
+            if event["type"] == "delta":
+                live.reply += event["text"]
+            event = {**event, "id": live.message_id}
+            if event["type"] == "done":
+                live.done = event
+            live.publish(event)
+        # Only now has the turn been recorded, reply included: until then a
+        # resend must attach to the live turn, not be answered from the session
+        sessions.update(interview_id, last_message_id=live.message_id)
+    except AdmissionRejected as e:
+        live.publish({"type": "error", "id": live.message_id, "detail": str(e), "retry_after": e.retry_after})
+    except Exception as e:
+        logger.error(f"Interview {interview_id} turn failed: {type(e).__name__}: {e}")
+        live.publish({"type": "error", "id": live.message_id, "detail": "The interviewer could not reply"})
+    finally:
+        _live.pop(interview_id, None)
@@ -1,23 +1,38 @@
 """Stateless interview flow engine – powered by conversation-driven AI agent.
 
-Each interview row in Supabase tracks *current_step*. The AI agent decides
-when to transition between phases based on the full conversation history.
+Each interview row in the database tracks *current_step*. The AI agent decides
+when to transition between phases based on the recent conversation plus a
+running summary of older turns (see ``context_service``).
 """
 
 from __future__ import annotations
+import asyncio
+import hashlib
 import json
-from typing import Any
+import uuid
+from typing import Any, AsyncIterator
 
-from app.database import get_supabase
+from app.database import get_db
 from app.services.gemini_service import (
     generate_next_message,
     generate_interview_report,
+    stream_next_message,
+    REPORT_UNAVAILABLE_SUMMARY,
 )
+from app.services import job_service
+from app.services.admission import AdmissionRejected
+from app.services.context_service import window, schedule_fold
+from app.services.session_cache import sessions
+from app.services.persistence_service import submit_turn
 
 
-def start_interview(candidate_data: dict) -> dict:
+class InterviewNotFound(LookupError):
+    """No interview exists with the given id."""
+
+
+async def start_interview(candidate_data: dict) -> dict:
     """Create candidate + interview rows and generate the first AI message."""
-    sb = get_supabase()
+    db = get_db()
 
     # Normalize tech_stack to a clean string for DB storage
     tech_stack = candidate_data.get("tech_stack", "")
@@ -27,8 +42,8 @@ def start_interview(candidate_data: dict) -> dict:
         tech_stack_str = tech_stack
 
     # Insert candidate
-    candidate_row = (
-        sb.table("candidates")
+    candidate_row = await (
+        db.table("candidates")
         .insert(
             {
                 "name": candidate_data["name"],
@@ -45,9 +60,10 @@ def start_interview(candidate_data: dict) -> dict:
     )
     candidate_id = candidate_row.data[0]["id"]
 
-    # Create interview session
-    interview_row = (
-        sb.table("interviews")
+    # Create the interview session while the agent writes its greeting;
+    # the greeting only needs the candidate profile
+    interview_row, ai_result = await asyncio.gather(
+        db.table("interviews")
         .insert(
             {
                 "candidate_id": candidate_id,
@@ -55,21 +71,37 @@ def start_interview(candidate_data: dict) -> dict:
                 "metadata": {"phases_visited": ["technical"]},
             }
         )
-        .execute()
+        .execute(),
+        generate_next_message(
+            candidate_info=candidate_data,
+            messages=[],  # No messages yet
+            current_phase="technical",
+        ),
+        return_exceptions=True,
     )
+    if isinstance(ai_result, AdmissionRejected):
+        # Over capacity: remove the candidate (and its interview) so the client's retry starts clean
+        await db.table("candidates").delete().eq("id", candidate_id).execute()
+    for outcome in (interview_row, ai_result):
+        if isinstance(outcome, BaseException):
+            raise outcome
     interview_id = interview_row.data[0]["id"]
 
-    # Generate first AI message using the agent
-    ai_result = generate_next_message(
-        candidate_info=candidate_data,
-        messages=[],  # No messages yet
-        current_phase="technical",
-    )
+    # Seed the session cache so the following turns need no reads
+    sessions.put(interview_id, {
+        "interview_id": interview_id,
+        "step": "technical",
+        "candidate": candidate_row.data[0],
+        "metadata": interview_row.data[0].get("metadata") or {},
+        "messages": [],
+        "scores": [],
+        "report": None,
+    })
 
     greeting = ai_result["reply"]
 
     # Store the assistant message
-    _store_message(interview_id, "assistant", greeting, "technical")
+    await _store_message(interview_id, "assistant", greeting, "technical")
 
     return {
         "interview_id": interview_id,
@@ -79,151 +111,317 @@ def start_interview(candidate_data: dict) -> dict:
     }
 
 
-def process_message(interview_id: str, user_content: str) -> dict:
+async def process_message(interview_id: str, user_content: str) -> dict:
     """Handle a user message and return the AI's dynamic response."""
-    sb = get_supabase()
-
-    # Fetch interview + candidate
-    interview = (
-        sb.table("interviews")
-        .select("*, candidates(*)")
-        .eq("id", interview_id)
-        .single()
-        .execute()
+    turn = await _begin_turn(interview_id, user_content)
+    if turn is None:
+        return _COMPLETED_RESPONSE
+
+    # Call the AI agent with the recent turns plus the running summary
+    summary, recent = window(turn["messages"], turn["metadata"])
+    try:
+        ai_result = await generate_next_message(
+            candidate_info=turn["candidate_info"],
+            messages=recent,
+            current_phase=turn["step"],
+            summary=summary,
+        )
+    except BaseException:
+        _abandon_turn(turn)
+        raise
+
+    result = await _finish_turn(turn, ai_result)
+    _schedule_fold(turn, ai_result)
+    return result
+
+
+async def open_message_stream(interview_id: str, user_content: str) -> AsyncIterator[dict]:
+    """Streaming counterpart of :func:`process_message`.
+
+    The interview is loaded and the stream started before this returns, so
+    lookup errors and :class:`AdmissionRejected` surface to the caller rather
+    than mid-stream. The returned iterator yields ``delta`` events with reply
+    text, then one ``done`` event; the turn is persisted after ``done`` has
+    been sent, even if the client disconnects right then. A turn that ends
+    before its reply is complete (stream error, client gone) is abandoned.
+    """
+    turn = await _begin_turn(interview_id, user_content)
+    if turn is None:
+        async def completed() -> AsyncIterator[dict]:
+            yield {"type": "done", **_COMPLETED_RESPONSE}
+        return completed()
+
+    summary, recent = window(turn["messages"], turn["metadata"])
+    stream = stream_next_message(
+        candidate_info=turn["candidate_info"],
+        messages=recent,
+        current_phase=turn["step"],
+        summary=summary,
     )
-    data = interview.data
-    step = data["current_step"]
-    candidate = data["candidates"]
+    try:
+        first = await anext(stream)
+    except BaseException:
+        _abandon_turn(turn)
+        await stream.aclose()
+        raise
+
+    async def events() -> AsyncIterator[dict]:
+        ai_result = None
+        try:
+            try:
+                event = first
+                while event["type"] != "done":
+                    yield event
+                    event = await anext(stream)
+            finally:
+                # Ends the stream and frees its admission slot, also if the client went away
+                await stream.aclose()
+            ai_result = event
+            yield {"type": "done", "message": ai_result["reply"], "current_step": ai_result["phase"]}
+        finally:
+            if ai_result is None:
+                _abandon_turn(turn)
+            else:
+                # The reply is complete: record the turn even when the generator is being
+                # closed at the "done" yield. A task, so a cancelled await cannot stop it.
+                await asyncio.shield(_complete_turn(turn, ai_result))
+
+    return events()
+
+
+async def _complete_turn(turn: dict, ai_result: dict) -> None:
+    await _finish_turn(turn, ai_result)
+    _schedule_fold(turn, ai_result)
+
+
+_COMPLETED_RESPONSE = {
+    "message": "This interview has already been completed. Thank you!",
+    "current_step": "completed",
+}
+
+
+async def _begin_turn(interview_id: str, user_content: str) -> dict | None:
+    """Load the session, record the user message in it and return the turn context.
+
+    The message reaches the database together with the rest of the turn in
+    :func:`_finish_turn`. Returns None if the interview is already completed.
+    """
+    session = sessions.get(interview_id) or await _load_session(interview_id)
+    step = session["step"]
 
     if step == "completed":
-        return {
-            "message": "This interview has already been completed. Thank you!",
-            "current_step": "completed",
-        }
+        return None
+
+    messages = [{"role": m["role"], "content": m["content"]} for m in session["messages"]]
+
+    sessions.append(interview_id, "messages", {"role": "user", "content": user_content, "step": step})
+    messages.append({"role": "user", "content": user_content})
+
+    return {
+        "interview_id": interview_id,
+        "user_content": user_content,
+        "step": step,
+        "candidate": session["candidate"],
+        "candidate_info": _candidate_info(session["candidate"]),
+        "messages": messages,
+        "metadata": session["metadata"],
+    }
 
-    # Store user message
-    _store_message(interview_id, "user", user_content, step)
 
-    # Fetch full message history
-    msgs_res = (
-        sb.table("interview_messages")
-        .select("role, content")
-        .eq("interview_id", interview_id)
-        .order("created_at")
+async def _load_session(interview_id: str) -> dict:
+    """Fetch an interview with its candidate, transcript and scores in one query."""
+    try:
+        uuid.UUID(interview_id)
+    except ValueError:
+        raise InterviewNotFound(interview_id) from None
+    interview = await (
+        get_db().table("interviews")
+        .select("*, candidates(*), interview_messages(role, content, step, created_at), interview_scores(*), interview_reports(report, transcript_hash)")
+        .eq("id", interview_id)
+        .limit(1)
         .execute()
     )
-    messages = [{"role": m["role"], "content": m["content"]} for m in msgs_res.data]
+    if not interview.data:
+        raise InterviewNotFound(interview_id)
+    d = interview.data[0]
+    messages = sorted(d.get("interview_messages") or [], key=lambda m: m["created_at"])
+    report = d.get("interview_reports")
+    if isinstance(report, list):
+        report = report[0] if report else None
+    session = {
+        "interview_id": d["id"],
+        "step": d["current_step"],
+        "candidate": d["candidates"],
+        "metadata": d.get("metadata") or {},
+        "messages": [
+            {"role": m["role"], "content": m["content"], "step": m["step"]}
+            for m in messages
+        ],
+        "scores": d.get("interview_scores") or [],
+        "report": report,
+    }
+    sessions.put(interview_id, session)
+    return sessions.get(interview_id) or session
+
 
-    # Build candidate info for the agent
-    tech_stack = candidate.get("tech_stack", "")
-    candidate_info = {
+def _candidate_info(candidate: dict) -> dict:
+    """Build candidate info for the agent."""
+    return {
         "name": candidate.get("name", "Candidate"),
         "position": candidate.get("position", "Software Engineer"),
         "experience": candidate.get("experience", 0),
-        "tech_stack": tech_stack,
+        "tech_stack": candidate.get("tech_stack", ""),
         "location": candidate.get("location", ""),
     }
 
-    # Call the AI agent
-    ai_result = generate_next_message(
-        candidate_info=candidate_info,
-        messages=messages,
-        current_phase=step,
-    )
+
+async def _finish_turn(turn: dict, ai_result: dict) -> dict:
+    """Persist a turn in one batched write, then apply it to the session cache.
+
+    If the write fails the turn is abandoned, so the cache never holds a turn
+    the database does not.
+    """
+    interview_id = turn["interview_id"]
+    step = turn["step"]
 
     reply = ai_result["reply"]
     next_step = ai_result["phase"]
+    score = ai_result.get("score")
 
-    # Save score if the AI assessed the last answer
-    if ai_result.get("score") is not None:
-        _save_score(interview_id, step, {
-            "score": ai_result["score"],
-            "assessment": ai_result.get("assessment", ""),
+    try:
+        await submit_turn({
+            "interview_id": interview_id,
+            "user_content": turn["user_content"],
+            "user_step": step,
+            "reply": reply,
+            "next_step": next_step,
+            "score": score,
+            "assessment": ai_result.get("assessment"),
         })
+    except BaseException:
+        # Never recorded: the cache must not get ahead of the database
+        _abandon_turn(turn)
+        raise
 
-    # Update interview state
-    update_data: dict[str, Any] = {"current_step": next_step}
+    if score is not None:
+        sessions.append(interview_id, "scores", {
+            "interview_id": interview_id,
+            "category": step,
+            "score": score,
+            "strengths": [],
+            "improvements": [],
+            "assessment": ai_result.get("assessment") or "",
+        })
+    if next_step == "completed":
+        sessions.update(interview_id, candidate={**turn["candidate"], "status": "Completed"})
+    sessions.update(interview_id, step=next_step)
+    sessions.append(interview_id, "messages", {"role": "assistant", "content": reply, "step": next_step})
 
     if next_step == "completed":
-        update_data["completed_at"] = "now()"
-        sb.table("candidates").update({"status": "Completed"}).eq(
-            "id", candidate["id"]
-        ).execute()
+        # Build the report now so the admin page never waits on the LLM
+        await request_report(interview_id)
 
-    sb.table("interviews").update(update_data).eq("id", interview_id).execute()
+    return {"message": reply, "current_step": next_step}
 
-    # Store assistant reply
-    _store_message(interview_id, "assistant", reply, next_step)
 
-    return {"message": reply, "current_step": next_step}
+def _abandon_turn(turn: dict) -> None:
+    # The turn got no reply; take back the user message _begin_turn cached so
+    # the cache keeps matching the database, which never saw it
+    sessions.remove(turn["interview_id"], "messages", {"role": "user", "content": turn["user_content"], "step": turn["step"]})
 
 
-def get_interview_status(interview_id: str) -> dict:
-    sb = get_supabase()
-    interview = (
-        sb.table("interviews")
-        .select("*, candidates(name), interview_messages(*)")
-        .eq("id", interview_id)
-        .single()
-        .execute()
-    )
-    d = interview.data
-    messages = sorted(d.get("interview_messages", []), key=lambda m: m["created_at"])
+def _schedule_fold(turn: dict, ai_result: dict) -> None:
+    messages = turn["messages"] + [{"role": "assistant", "content": ai_result["reply"]}]
+    schedule_fold(turn["interview_id"], messages, turn["metadata"])
+
+
+async def get_interview_status(interview_id: str) -> dict:
+    session = sessions.get(interview_id) or await _load_session(interview_id)
     return {
-        "interview_id": d["id"],
-        "current_step": d["current_step"],
-        "candidate_name": d["candidates"]["name"],
-        "messages": [
-            {"role": m["role"], "content": m["content"], "step": m["step"]}
-            for m in messages
-        ],
+        "interview_id": session["interview_id"],
+        "current_step": session["step"],
+        "candidate_name": session["candidate"]["name"],
+        "messages": session["messages"],
     }
 
 
-def get_interview_report(interview_id: str) -> dict:
-    """Generate a comprehensive interview report."""
-    sb = get_supabase()
+async def get_stored_report(interview_id: str) -> dict | None:
+    """Return the stored interview report if it is still current, else None.
 
-    # Fetch interview + candidate
-    interview = (
-        sb.table("interviews")
-        .select("*, candidates(*)")
-        .eq("id", interview_id)
-        .single()
-        .execute()
+    Reports are generated once (normally in the background when the
+    interview completes) and stored in ``interview_reports``. A stored report
+    is served as long as the transcript it was built from is unchanged.
+    """
+    session = sessions.get(interview_id) or await _load_session(interview_id)
+    stored = session.get("report")
+    if stored and stored["transcript_hash"] == _transcript_hash(session["messages"]):
+        return stored["report"]
+    return None
+
+
+async def request_report(interview_id: str, regenerate: bool = False) -> dict:
+    """Queue report generation as a background job and return the job.
+
+    A generation already queued or running for the interview is returned
+    instead of starting a second one; ``regenerate`` bypasses the LLM cache.
+    """
+    return await job_service.submit(
+        "interview_report",
+        {"interview_id": interview_id, "regenerate": regenerate},
+        dedupe_key=f"report:{interview_id}",
     )
-    candidate = interview.data["candidates"]
 
-    # Fetch scores
-    scores = (
-        sb.table("interview_scores")
-        .select("*")
-        .eq("interview_id", interview_id)
-        .execute()
+
+@job_service.handler("interview_report")
+async def _report_job(payload: dict) -> dict:
+    report = await _generate_and_store_report(payload["interview_id"], use_cache=not payload.get("regenerate"))
+    if report.get("summary") == REPORT_UNAVAILABLE_SUMMARY:
+        # Every model failed; fail the attempt so the job is retried later
+        raise RuntimeError("Report generation unavailable")
+    return report
+
+
+async def _generate_and_store_report(interview_id: str, use_cache: bool) -> dict:
+    # Candidate, scores and transcript all come from the session
+    session = sessions.get(interview_id) or await _load_session(interview_id)
+    transcript_hash = _transcript_hash(session["messages"])
+
+    report = await generate_interview_report(
+        candidate_info=session["candidate"],
+        scores=session["scores"],
+        messages=[{"role": m["role"], "content": m["content"]} for m in session["messages"]],
+        cache=use_cache,
     )
 
-    # Fetch messages
-    msgs = (
-        sb.table("interview_messages")
-        .select("role, content")
-        .eq("interview_id", interview_id)
-        .order("created_at")
+    if report.get("summary") == REPORT_UNAVAILABLE_SUMMARY:
+        # Don't pin the canned fallback; the next request retries the LLM
+        return report
+
+    await (
+        get_db().table("interview_reports")
+        .upsert(
+            {"interview_id": interview_id, "report": report, "transcript_hash": transcript_hash},
+            on_conflict="interview_id",
+        )
         .execute()
     )
+    sessions.update(interview_id, report={"report": report, "transcript_hash": transcript_hash})
+    return report
 
-    return generate_interview_report(
-        candidate_info=candidate,
-        scores=scores.data,
-        messages=msgs.data,
-    )
+
+def _transcript_hash(messages: list[dict]) -> str:
+    digest = hashlib.sha256()
+    for m in messages:
+        digest.update(f"{m['role']}\x00{m['content']}\x00".encode())
+    return digest.hexdigest()
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _store_message(interview_id: str, role: str, content: str, step: str) -> None:
-    get_supabase().table("interview_messages").insert(
+async def _store_message(interview_id: str, role: str, content: str, step: str) -> None:
+    await get_db().table("interview_messages").insert(
         {
             "interview_id": interview_id,
             "role": role,
@@ -231,16 +429,4 @@ def _store_message(interview_id: str, role: str, content: str, step: str) -> Non
             "step": step,
         }
     ).execute()
-
-
-def _save_score(interview_id: str, category: str, analysis: dict) -> None:
-    get_supabase().table("interview_scores").insert(
-        {
-            "interview_id": interview_id,
-            "category": category,
-            "score": analysis.get("score", 5),
-            "strengths": analysis.get("strengths", []),
-            "improvements": analysis.get("improvements", []),
-            "assessment": analysis.get("assessment", ""),
-        }
-    ).execute()
+    sessions.append(interview_id, "messages", {"role": role, "content": content, "step": step})
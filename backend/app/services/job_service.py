@@ -0,0 +1,332 @@
+"""Background jobs for work too slow to run inside a request.
+
+A job is a row in the ``jobs`` table (see ``supabase_schema.sql``) moving
+through ``queued`` -> ``running`` -> ``done`` / ``failed``. Services
+register a coroutine per job kind with :func:`handler`; the API submits a
+job, answers ``202`` with its id, and clients poll or long-poll
+``GET /api/jobs/{id}`` for the result.
+
+``JOB_WORKERS`` tasks per process run the jobs. A job is claimed with a
+conditional update on its attempt counter, so only one worker (in any
+process) runs a given attempt. A failed attempt is retried with
+exponential backoff up to ``JOB_MAX_ATTEMPTS``; a running job whose
+worker died is reclaimed once its ``locked_until`` lease expires, and
+failed if that was its last attempt (a payload that crashes the worker
+must not be retried forever). Because
+the queue is the table, queued jobs survive a restart: a periodic sweep
+picks up anything runnable that this process doesn't already hold.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from app import metrics
+from app.config import JOB_WORKERS, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY, JOB_TIMEOUT, JOB_POLL_INTERVAL
+from app.database import get_db, is_unique_violation
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Everything but the payload, which the status and claim reads don't need
+PUBLIC_COLUMNS = "id, kind, status, attempts, max_attempts, result, error, created_at, started_at, finished_at"
+CLAIM_COLUMNS = "id, kind, status, attempts, max_attempts, run_after, locked_until"
+
+
+class PermanentError(Exception):
+    """Raised by a handler when retrying cannot help (bad input, missing rows)."""
+
+
+_handlers: dict[str, Callable[[dict], Awaitable[Any]]] = {}
+_queue: asyncio.Queue | None = None
+_pending: set[str] = set()  # ids queued or running in this process
+_tasks: list[asyncio.Task] = []
+_changed: asyncio.Condition | None = None
+
+
+def handler(kind: str):
+    """Register ``fn(payload) -> result`` as the runner for jobs of ``kind``."""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def _timestamp(offset: float = 0) -> str:
+    ts = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=offset)
+    return ts.isoformat(timespec="microseconds")
+
+
+def _parse(value: str | None) -> datetime.datetime | None:
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def _lease_expired(job: dict) -> bool:
+    return job["locked_until"] is None or _parse(job["locked_until"]) < datetime.datetime.now(datetime.timezone.utc)
+
+
+def _claimable(job: dict) -> bool:
+    if job["status"] == QUEUED:
+        return _parse(job["run_after"]) <= datetime.datetime.now(datetime.timezone.utc)
+    if job["status"] == RUNNING:
+        return _lease_expired(job) and job["attempts"] < job["max_attempts"]
+    return False
+
+
+def _abandoned(job: dict) -> bool:
+    """Running, lease expired, no attempts left: its worker died on the last one."""
+    return job["status"] == RUNNING and _lease_expired(job) and job["attempts"] >= job["max_attempts"]
+
+
+# ---------------------------------------------------------------------------
+# Submitting and reading jobs
+# ---------------------------------------------------------------------------
+
+async def submit(kind: str, payload: dict, dedupe_key: str | None = None) -> dict:
+    """Queue a job and return its public row.
+
+    With a ``dedupe_key``, an unfinished job with the same key is returned
+    instead of queueing a second one, so client retries don't double the work.
+    A unique index on unfinished jobs' keys decides races between submitters:
+    the insert that loses re-reads the winner.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+    db = get_db()
+    row = {
+        "kind": kind,
+        "payload": payload,
+        "status": QUEUED,
+        "dedupe_key": dedupe_key,
+        "attempts": 0,
+        "max_attempts": JOB_MAX_ATTEMPTS,
+        "run_after": _timestamp(),
+    }
+
+    while True:
+        try:
+            res = await db.table("jobs").insert(row).execute()
+            break
+        except Exception as e:
+            if dedupe_key is None or not is_unique_violation(e):
+                raise
+        existing = await (
+            db.table("jobs")
+            .select(PUBLIC_COLUMNS)
+            .eq("dedupe_key", dedupe_key)
+            .in_("status", [QUEUED, RUNNING])
+            .limit(1)
+            .execute()
+        )
+        if existing.data:
+            return existing.data[0]
+        # The other job finished in between; the key is free again
+
+    job = res.data[0]
+    _enqueue(job["id"])
+    return {k: job.get(k) for k in PUBLIC_COLUMNS.split(", ")}
+
+
+async def get(job_id: str) -> dict | None:
+    res = await get_db().table("jobs").select(PUBLIC_COLUMNS).eq("id", job_id).limit(1).execute()
+    return res.data[0] if res.data else None
+
+
+async def wait(job_id: str, timeout: float) -> dict | None:
+    """Long-poll: return the job once it is done or failed, or after ``timeout`` seconds.
+
+    Jobs finished by this process wake the waiter at once; jobs run by
+    another process are noticed on the next re-read, every ``JOB_POLL_INTERVAL``.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        job = await get(job_id)
+        remaining = deadline - time.monotonic()
+        if job is None or job["status"] in (DONE, FAILED) or remaining <= 0:
+            return job
+        async with _condition():
+            try:
+                await asyncio.wait_for(_condition().wait(), min(remaining, JOB_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+
+
+def _condition() -> asyncio.Condition:
+    global _changed
+    if _changed is None:
+        _changed = asyncio.Condition()
+    return _changed
+
+
+async def _notify() -> None:
+    async with _condition():
+        _condition().notify_all()
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+def _enqueue(job_id: str) -> None:
+    if _queue is not None and job_id not in _pending:
+        _pending.add(job_id)
+        _queue.put_nowait(job_id)
+
+
+async def start() -> None:
+    """Start the workers and the sweep (called from the app lifespan)."""
+    global _queue
+    if _tasks:
+        return
+    _queue = asyncio.Queue()
+    _tasks.extend(asyncio.create_task(_work()) for _ in range(JOB_WORKERS))
+    _tasks.append(asyncio.create_task(_sweep()))
+
+
+async def stop() -> None:
+    """Cancel the workers; interrupted jobs go back to the queue."""
+    global _queue
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    _pending.clear()
+    _queue = None
+
+
+def snapshot() -> dict:
+    return {"workers": JOB_WORKERS if _tasks else 0, "pending": len(_pending)}
+
+
+async def _sweep() -> None:
+    # Picks up jobs queued before a restart, by other processes, or due for a retry
+    while True:
+        try:
+            now = _timestamp()
+            res = await (
+                get_db().table("jobs")
+                .select("id")
+                .or_(f'and(status.eq.{QUEUED},run_after.lte."{now}"),and(status.eq.{RUNNING},locked_until.lt."{now}")')
+                .order("created_at")
+                .limit(JOB_WORKERS * 4)
+                .execute()
+            )
+            for row in res.data:
+                _enqueue(row["id"])
+        except Exception as e:
+            logger.error(f"Job sweep failed: {type(e).__name__}: {e}")
+        await asyncio.sleep(JOB_POLL_INTERVAL)
+
+
+async def _work() -> None:
+    while True:
+        job_id = await _queue.get()
+        try:
+            await _run(job_id)
+        except Exception as e:
+            logger.error(f"Job {job_id} could not be run: {type(e).__name__}: {e}")
+        finally:
+            _pending.discard(job_id)
+            _queue.task_done()
+
+
+async def _run(job_id: str) -> None:
+    db = get_db()
+    res = await db.table("jobs").select(CLAIM_COLUMNS).eq("id", job_id).limit(1).execute()
+    if not res.data:
+        return
+    job = res.data[0]
+    if _abandoned(job):
+        await _fail_abandoned(job)
+        return
+    if not _claimable(job):
+        return
+
+    # Conditional on the attempt count we read: if another worker claimed it first, nothing matches
+    claimed = await (
+        db.table("jobs")
+        .update({
+            "status": RUNNING,
+            "attempts": job["attempts"] + 1,
+            "started_at": _timestamp(),
+            "locked_until": _timestamp(JOB_TIMEOUT),
+        })
+        .eq("id", job_id)
+        .eq("attempts", job["attempts"])
+        .execute()
+    )
+    if not claimed.data:
+        return
+    job = claimed.data[0]  # now with the payload
+
+    start = time.perf_counter()
+    try:
+        run = _handlers.get(job["kind"])
+        if run is None:
+            raise PermanentError(f"No handler registered for job kind {job['kind']!r}")
+        result = await asyncio.wait_for(run(job["payload"]), JOB_TIMEOUT)
+    except asyncio.CancelledError:
+        # Shutting down: hand the attempt back so the job reruns after the restart
+        await db.table("jobs").update({
+            "status": QUEUED, "attempts": job["attempts"] - 1, "locked_until": None,
+        }).eq("id", job_id).execute()
+        raise
+    except Exception as e:
+        await _fail(job, e)
+    else:
+        await db.table("jobs").update({
+            "status": DONE,
+            "result": result,
+            "error": None,
+            "payload": {},  # inputs (e.g. the uploaded PDF) aren't needed once done
+            "finished_at": _timestamp(),
+            "locked_until": None,
+        }).eq("id", job_id).execute()
+        metrics.jobs_total.inc(kind=job["kind"], outcome=DONE)
+    finally:
+        metrics.job_seconds.observe(time.perf_counter() - start, kind=job["kind"])
+    await _notify()
+
+
+async def _fail(job: dict, error: Exception) -> None:
+    message = f"{type(error).__name__}: {error}"
+    retry = not isinstance(error, PermanentError) and job["attempts"] < job["max_attempts"]
+    logger.error(
+        f"Job {job['id']} ({job['kind']}) failed on attempt {job['attempts']}/{job['max_attempts']}: {message}"
+    )
+
+    if retry:
+        delay = JOB_RETRY_DELAY * (2 ** (job["attempts"] - 1))
+        # Errors can carry a hint, e.g. AdmissionRejected.retry_after
+        delay = max(delay, getattr(error, "retry_after", 0))
+        update = {"status": QUEUED, "error": message, "run_after": _timestamp(delay), "locked_until": None}
+        outcome = "retried"
+    else:
+        update = {"status": FAILED, "error": message, "finished_at": _timestamp(), "locked_until": None}
+        outcome = FAILED
+    await get_db().table("jobs").update(update).eq("id", job["id"]).execute()
+    metrics.jobs_total.inc(kind=job["kind"], outcome=outcome)
+
+    if retry:
+        asyncio.get_running_loop().call_later(delay, _enqueue, job["id"])
+
+
+async def _fail_abandoned(job: dict) -> None:
+    message = f"Lease expired on attempt {job['attempts']}/{job['max_attempts']}; the worker was lost every time"
+    failed = await (
+        get_db().table("jobs")
+        .update({"status": FAILED, "error": message, "finished_at": _timestamp(), "locked_until": None})
+        .eq("id", job["id"])
+        .eq("status", RUNNING)
+        .eq("attempts", job["attempts"])
+        .execute()
+    )
+    if failed.data:
+        logger.error(f"Job {job['id']} ({job['kind']}) failed: {message}")
+        metrics.jobs_total.inc(kind=job["kind"], outcome=FAILED)
+        await _notify()
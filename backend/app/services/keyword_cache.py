@@ -0,0 +1,74 @@
+"""In-process cache of the ``resume_keywords`` table and its compiled matcher.
+
+The table changes rarely, so resume analysis reads it from here instead of
+from the database. The cache is refreshed when a keyword is added through the
+API, when ``KEYWORD_CACHE_TTL`` expires, or on demand via
+``POST /api/resumes/keywords/refresh`` for edits made outside the API.
+
+Each snapshot carries a ``version`` – a hash of the keywords and weights –
+so stored analyses can tell whether they were scored against the current
+table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import List, NamedTuple
+
+from app.config import KEYWORD_CACHE_TTL
+from app.database import get_db
+from app.services.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordSnapshot(NamedTuple):
+    keywords: List[dict]
+    matcher: KeywordMatcher
+    version: str
+
+
+def keyword_version(keywords: List[dict]) -> str:
+    """Stable hash of the keyword table's scoring-relevant columns."""
+    rows = sorted((kw["keyword"], float(kw.get("weight") or 0)) for kw in keywords)
+    return hashlib.sha256(json.dumps(rows).encode()).hexdigest()[:16]
+
+
+class KeywordCache:
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._snapshot: KeywordSnapshot | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> KeywordSnapshot:
+        """Return the current snapshot, reloading it if missing or expired."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._expires_at:
+            return snapshot
+        return await self.refresh()
+
+    async def refresh(self) -> KeywordSnapshot:
+        """Reload the keyword table from the database and recompile the matcher."""
+        async with self._lock:
+            keywords = (await get_db().table("resume_keywords").select("*").execute()).data
+            snapshot = KeywordSnapshot(
+                keywords=keywords,
+                matcher=KeywordMatcher(kw["keyword"] for kw in keywords),
+                version=keyword_version(keywords),
+            )
+            if self._snapshot is None or self._snapshot.version != snapshot.version:
+                logger.info(f"Keyword table loaded: {len(keywords)} keywords, version {snapshot.version}")
+            self._snapshot = snapshot
+            self._expires_at = time.monotonic() + self.ttl
+            return snapshot
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+
+keyword_cache = KeywordCache(KEYWORD_CACHE_TTL)
@@ -0,0 +1,115 @@
+"""Multi-keyword matcher for resume scoring (Aho-Corasick).
+
+The automaton is compiled once from the keyword table and then finds every
+keyword in a single pass over the text, independent of how many keywords
+there are. Matches must sit on word boundaries, so "go" does not match
+inside "google" and "c" not inside "c++" or "c#", while "c++" and "node.js"
+still match as written.
+
+Matching is case-insensitive and treats any run of whitespace as a single
+space; reported positions are offsets into that normalized text.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Iterable
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+def keyword_key(keyword: str) -> str:
+    """The form a keyword is reported under in :meth:`KeywordMatcher.find_all`."""
+    return normalize(keyword).strip()
+
+
+# Trailing symbols that are part of a name ("c++", "c#", "f#"), not punctuation after it
+_NAME_SUFFIX = "+#"
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Compiled Aho-Corasick automaton over a set of keywords."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.patterns: list[str] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+
+        seen: set[str] = set()
+        for keyword in keywords:
+            pattern = keyword_key(keyword)
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._insert(pattern)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _insert(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find_all(self, text: str) -> dict[str, list[int]]:
+        """Return ``{keyword: [start offsets]}`` for every word-bounded match."""
+        text = normalize(text)
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        n = len(text)
+        hits: dict[str, list[int]] = {}
+
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for idx in out[state]:
+                pattern = patterns[idx]
+                start = i - len(pattern) + 1
+                # Word boundaries only matter where the keyword itself starts/ends with a word char
+                if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if i + 1 < n:
+                    nxt = text[i + 1]
+                    if nxt in _NAME_SUFFIX or (_is_word_char(pattern[-1]) and _is_word_char(nxt)):
+                        continue
+                hits.setdefault(pattern, []).append(start)
+        return hits
+
+    def count(self, text: str) -> dict[str, int]:
+        """Return ``{keyword: hit count}`` for keywords found in ``text``."""
+        return {keyword: len(starts) for keyword, starts in self.find_all(text).items()}
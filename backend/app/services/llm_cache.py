@@ -0,0 +1,101 @@
+"""Two-tier cache for LLM responses.
+
+Keys are a hash of the model chain, the generation config, the system
+instruction and the prompt with whitespace normalized, so byte-for-byte repeats (report refreshes,
+canned answers, scripted QA replays) skip the Gemini call. The first tier
+is an in-memory LRU; setting ``LLM_CACHE_SQLITE_PATH`` adds an on-disk
+SQLite tier that survives restarts and is shared by workers on one host.
+Both tiers honour ``LLM_CACHE_TTL``.
+
+Only JSON-serializable results are cached. Callers opt in per call – the
+interview chat does not use the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app import metrics
+from app.config import LLM_CACHE_SIZE, LLM_CACHE_TTL, LLM_CACHE_SQLITE_PATH
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class LLMCache:
+    def __init__(self, max_entries: int, ttl: float, sqlite_path: str | None = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("pragma journal_mode=wal")
+            self._db.execute(
+                "create table if not exists llm_cache (key text primary key, value text not null, expires_at real not null)"
+            )
+
+    @staticmethod
+    def key(models: list[str], config: dict, prompt: str, system_instruction: str | None = None) -> str:
+        normalized = _WHITESPACE.sub(" ", prompt).strip()
+        payload = json.dumps([models, config, system_instruction, normalized], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                metrics.llm_cache_lookups.inc(result="memory_hit")
+                return entry[1]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "select value, expires_at from llm_cache where key = ? and expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    metrics.llm_cache_lookups.inc(result="disk_hit")
+                    return value
+
+            metrics.llm_cache_lookups.inc(result="miss")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            metrics.llm_cache_stores.inc()
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "insert or replace into llm_cache (key, value, expires_at) values (?, ?, ?)",
+                        (key, json.dumps(value), expires_at),
+                    )
+                except (TypeError, sqlite3.Error) as e:
+                    logger.warning(f"LLM cache disk write failed: {e}")
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"memory_entries": len(self._memory), "disk": self._db is not None}
+
+
+llm_cache = LLMCache(LLM_CACHE_SIZE, LLM_CACHE_TTL, LLM_CACHE_SQLITE_PATH)
@@ -0,0 +1,145 @@
+"""Shared ``GenerativeModel`` instances for the Gemini service.
+
+Each (model, system instruction) pair is built once and reused by every
+request, and the static instruction travels as ``system_instruction``
+instead of being pasted into each turn's prompt.
+
+With ``GEMINI_CONTEXT_CACHE`` enabled the instruction is also uploaded once
+as server-side cached content, so each call only sends and is billed for
+the dynamic part. The API rejects content below a per-model minimum token
+count; when creation fails the pair is marked uncacheable and the plain
+model is used from then on.
+
+``LLM_BACKEND=fake`` swaps in the offline models from ``fake_gemini``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import threading
+import time
+
+import google.generativeai as genai
+
+from app.config import (
+    GEMINI_API_KEY,
+    GEMINI_CONTEXT_CACHE,
+    GEMINI_CONTEXT_CACHE_TTL,
+    LLM_BACKEND,
+    FAKE_LLM_CASSETTE_MODE,
+)
+from app.services import fake_gemini
+
+logger = logging.getLogger(__name__)
+
+# Recreate cached content this long before it expires on the server
+CACHE_REFRESH_MARGIN = 60  # seconds
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        context_cache: bool = GEMINI_CONTEXT_CACHE,
+        cache_ttl: float = GEMINI_CONTEXT_CACHE_TTL,
+        backend: str = LLM_BACKEND,
+    ) -> None:
+        self.backend = backend
+        self.context_cache = context_cache and backend != "fake"
+        self.cache_ttl = cache_ttl
+        self._configured = False
+        self._lock = threading.Lock()
+        self._models: dict[tuple[str, str | None], genai.GenerativeModel] = {}
+        # (model, instruction) -> (refresh deadline, cached content, model bound to it)
+        self._cached: dict[tuple[str, str], tuple[float, object, genai.GenerativeModel]] = {}
+        self._uncacheable: set[tuple[str, str]] = set()
+        self._cache_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def _ensure_configured(self) -> None:
+        if not self._configured:
+            if not GEMINI_API_KEY:
+                raise RuntimeError("GEMINI_API_KEY is not set in backend/.env")
+            genai.configure(api_key=GEMINI_API_KEY)
+            self._configured = True
+
+    def model(self, model_name: str, system_instruction: str | None = None) -> genai.GenerativeModel:
+        """The shared plain model for ``model_name`` with ``system_instruction``."""
+        key = (model_name, system_instruction)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._build(model_name, system_instruction)
+                self._models[key] = model
+            return model
+
+    def _build(self, model_name: str, system_instruction: str | None):
+        if self.backend == "fake":
+            real = None
+            if FAKE_LLM_CASSETTE_MODE == "record":
+                self._ensure_configured()
+                real = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+            return fake_gemini.FakeModel(model_name, system_instruction, recorder=real, cassette=fake_gemini.cassette())
+        self._ensure_configured()
+        return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+    async def get(self, model_name: str, system_instruction: str | None = None) -> genai.GenerativeModel:
+        """Like :meth:`model`, but bound to server-side cached content when enabled and supported."""
+        key = (model_name, system_instruction)
+        if not (self.context_cache and system_instruction) or key in self._uncacheable:
+            return self.model(model_name, system_instruction)
+
+        entry = self._cached.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[2]
+
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._cached.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[2]
+            try:
+                cached = await asyncio.to_thread(self._create_cached_content, model_name, system_instruction)
+            except Exception as e:
+                logger.warning(
+                    f"Context caching unavailable for {model_name} ({type(e).__name__}: {e}); "
+                    "sending the instruction with each request"
+                )
+                self._uncacheable.add(key)
+                return self.model(model_name, system_instruction)
+
+            model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+            refresh_at = time.monotonic() + max(self.cache_ttl - CACHE_REFRESH_MARGIN, self.cache_ttl / 2)
+            self._cached[key] = (refresh_at, cached, model)
+            logger.info(f"Cached system instruction for {model_name} as {cached.name}")
+            return model
+
+    def _create_cached_content(self, model_name: str, system_instruction: str):
+        self._ensure_configured()
+        return genai.caching.CachedContent.create(
+            model=f"models/{model_name}",
+            display_name="talentscout-system-instruction",
+            system_instruction=system_instruction,
+            ttl=datetime.timedelta(seconds=self.cache_ttl),
+        )
+
+    def close(self) -> None:
+        """Delete server-side cached content rather than leave it to expire (used on shutdown)."""
+        entries, self._cached = list(self._cached.values()), {}
+        for _, cached, _ in entries:
+            try:
+                cached.delete()
+            except Exception as e:
+                logger.warning(f"Could not delete cached content {cached.name}: {e}")
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": self.backend,
+            "models": len(self._models),
+            "context_cache": self.context_cache,
+            "cached": sorted(name for name, _ in self._cached),
+            "uncacheable": sorted(name for name, _ in self._uncacheable),
+        }
+
+
+registry = ModelRegistry()
@@ -0,0 +1,235 @@
+"""Health-aware routing across the Gemini fallback chain.
+
+Every LLM call in ``gemini_service`` goes through its ``ModelRouter``, which
+keeps rolling latency and error statistics per model (the last ``WINDOW``
+calls within ``STATS_MAX_AGE`` seconds) and orders the chain
+healthiest-first instead of always starting at ``MODELS[0]``. A model that is rate limited, or fails
+``MODEL_FAILURE_THRESHOLD`` times in a row, has its circuit breaker opened
+and is skipped until its cooldown ends; the first call after that is a
+trial that closes the breaker again on success.
+
+Models that ``throttled(name)`` reports as out of rate-limit budget (see
+``admission``) are tried after the rest.
+
+When a model's recent p95 latency is known, a call that runs past it can be
+hedged: a duplicate request goes to the next healthy model and whichever
+answers first wins.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from app import metrics
+from app.config import (
+    MODEL_BREAKER_COOLDOWN,
+    MODEL_RATE_LIMIT_COOLDOWN,
+    MODEL_FAILURE_THRESHOLD,
+    MODEL_HEDGE_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WINDOW = 50  # calls kept per model for latency/error statistics
+STATS_MAX_AGE = 300  # seconds; older calls stop counting, so a demoted model is tried again
+MIN_HEDGE_SAMPLES = 10
+
+
+class InvalidResponse(Exception):
+    """The model answered, but the output was unusable; retry without blaming the model's health."""
+
+
+class AllModelsFailed(Exception):
+    """Every model in the chain failed or is behind an open breaker."""
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return "ResourceExhausted" in type(error).__name__
+
+
+class ModelHealth:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # (monotonic time, value) per call
+        self.latencies: deque[tuple[float, float]] = deque(maxlen=WINDOW)
+        self.outcomes: deque[tuple[float, bool]] = deque(maxlen=WINDOW)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    @staticmethod
+    def _recent(samples: deque) -> list:
+        # A model ranked last is rarely called, so its samples would never be replaced
+        cutoff = time.monotonic() - STATS_MAX_AGE
+        return [value for at, value in samples if at >= cutoff]
+
+    @property
+    def error_rate(self) -> float:
+        outcomes = self._recent(self.outcomes)
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
+    def recent_latencies(self) -> list[float]:
+        return self._recent(self.latencies)
+
+    def percentile(self, q: float) -> float | None:
+        ordered = sorted(self.recent_latencies())
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def record_success(self, latency: float) -> None:
+        now = time.monotonic()
+        self.latencies.append((now, latency))
+        self.outcomes.append((now, True))
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, error: BaseException) -> None:
+        self.outcomes.append((time.monotonic(), False))
+        self.consecutive_failures += 1
+        if is_rate_limited(error):
+            self._trip(MODEL_RATE_LIMIT_COOLDOWN, "rate limited")
+        elif self.consecutive_failures >= MODEL_FAILURE_THRESHOLD:
+            self._trip(MODEL_BREAKER_COOLDOWN, f"{self.consecutive_failures} consecutive failures")
+
+    def _trip(self, cooldown: float, reason: str) -> None:
+        self.open_until = time.monotonic() + cooldown
+        logger.warning(f"Circuit open for {self.name} ({reason}); cooling down {cooldown:g}s")
+
+    def snapshot(self) -> dict:
+        return {
+            "open": self.is_open,
+            "error_rate": round(self.error_rate, 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "calls": len(self._recent(self.outcomes)),
+        }
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        models: list[str],
+        hedge: bool = MODEL_HEDGE_ENABLED,
+        throttled: Callable[[str], bool] | None = None,
+    ) -> None:
+        self.models = list(models)
+        self.hedge = hedge
+        self.throttled = throttled or (lambda name: False)
+        self.health = {name: ModelHealth(name) for name in models}
+
+    def ranked(self) -> list[str]:
+        """Closed-breaker models, healthiest first. If every breaker is open,
+        the model closest to the end of its cooldown is tried anyway."""
+        available = [m for m in self.models if not self.health[m].is_open]
+        if not available:
+            return [min(self.models, key=lambda m: self.health[m].open_until)]
+
+        def key(name: str):
+            h = self.health[name]
+            # Models with rate-limit budget first. Then error rate in coarse steps,
+            # so small differences don't override the configured preference
+            # order; then median latency.
+            return (self.throttled(name), round(h.error_rate, 1), h.percentile(0.5) or 0.0, self.models.index(name))
+
+        return sorted(available, key=key)
+
+    def record_success(self, model: str, latency: float) -> None:
+        self.health[model].record_success(latency)
+        metrics.gemini_call_seconds.observe(latency, model=model, outcome="ok")
+
+    def record_failure(self, model: str, error: BaseException, latency: float | None = None) -> None:
+        if isinstance(error, InvalidResponse):
+            outcome = "invalid"
+        else:
+            outcome = "rate_limited" if is_rate_limited(error) else "error"
+            self.health[model].record_failure(error)
+        if latency is not None:
+            metrics.gemini_call_seconds.observe(latency, model=model, outcome=outcome)
+
+    async def _attempt(self, model: str, call: Callable[[str], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        try:
+            result = await call(model)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record_failure(model, e, time.monotonic() - start)
+            raise
+        self.record_success(model, time.monotonic() - start)
+        return result
+
+    async def _hedged(self, primary: str, backup: str | None, call: Callable[[str], Awaitable[T]]) -> T:
+        deadline = self.health[primary].percentile(0.95)
+        first = asyncio.ensure_future(self._attempt(primary, call))
+        if (
+            backup is None
+            or deadline is None
+            or len(self.health[primary].recent_latencies()) < MIN_HEDGE_SAMPLES
+        ):
+            return await first
+
+        try:
+            done, _ = await asyncio.wait({first}, timeout=deadline)
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        logger.info(f"{primary} exceeded p95 ({deadline:.2f}s); hedging with {backup}")
+        second = asyncio.ensure_future(self._attempt(backup, call))
+        pending = {first, second}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(
+        self,
+        call: Callable[[str], Awaitable[T]],
+        *,
+        retries: int,
+        base_delay: float,
+        label: str = "Gemini",
+    ) -> T:
+        """Run ``call(model_name)`` against the chain until one succeeds.
+
+        Each round tries every available model once (healthiest first) with
+        no sleep in between; rounds are separated by exponential backoff.
+        Raises :class:`AllModelsFailed` when all rounds fail.
+        """
+        for attempt in range(retries):
+            if attempt:
+                metrics.gemini_retries.inc(call=label)
+            ranked = self.ranked()
+            for i, model in enumerate(ranked):
+                backup = ranked[i + 1] if self.hedge and i + 1 < len(ranked) else None
+                try:
+                    return await self._hedged(model, backup, call)
+                except Exception as e:
+                    logger.error(f"{label} [{model}] error (attempt {attempt+1}/{retries}): {type(e).__name__}: {e}")
+            if attempt < retries - 1:
+                await asyncio.sleep(base_delay * (2 ** attempt))
+        metrics.gemini_fallbacks.inc(call=label)
+        raise AllModelsFailed(f"{label}: all models failed")
+
+    def snapshot(self) -> dict:
+        return {name: h.snapshot() for name, h in self.health.items()}
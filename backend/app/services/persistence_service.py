@@ -0,0 +1,93 @@
+"""Batched persistence of interview turns.
+
+A turn's writes (candidate message, score, phase/status update, interviewer
+reply) go to Supabase in one call to the ``record_interview_turn`` RPC
+defined in ``supabase_schema.sql``. With ``PERSIST_WRITE_BEHIND`` enabled the
+call is queued and made by a background worker, taking it off the response
+path entirely; the session cache already reflects the turn by then.
+
+Every turn carries a ``turn_id`` and the RPC skips a turn it has already
+recorded, so a retry after a lost response cannot duplicate rows. A turn
+the worker still cannot write after ``MAX_ATTEMPTS`` is logged in full (it
+would be out of order if written later) and counted under
+``talentscout_write_behind_turns_total{outcome="dropped"}``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+
+from app import metrics
+from app.config import PERSIST_WRITE_BEHIND
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+BASE_DELAY = 0.5  # seconds
+
+_queue: asyncio.Queue | None = None
+_worker: asyncio.Task | None = None
+
+
+async def record_turn(turn: dict) -> None:
+    """Write one turn with a single RPC round trip."""
+    await get_db().rpc("record_interview_turn", {
+        "p_interview_id": turn["interview_id"],
+        "p_user_content": turn["user_content"],
+        "p_user_step": turn["user_step"],
+        "p_reply": turn["reply"],
+        "p_next_step": turn["next_step"],
+        "p_score": turn.get("score"),
+        "p_assessment": turn.get("assessment"),
+        "p_turn_id": turn.get("turn_id"),
+    }).execute()
+
+
+async def submit_turn(turn: dict) -> None:
+    """Persist a turn, either now or via the write-behind queue."""
+    turn = {**turn, "turn_id": turn.get("turn_id") or str(uuid.uuid4())}
+    if not PERSIST_WRITE_BEHIND:
+        await record_turn(turn)
+        return
+
+    global _queue, _worker
+    if _queue is None:
+        _queue = asyncio.Queue()
+    if _worker is None or _worker.done():
+        _worker = asyncio.create_task(_drain())
+    _queue.put_nowait(turn)
+
+
+async def flush() -> None:
+    """Wait until every queued turn has been written (used on shutdown)."""
+    if _queue is not None and _worker is not None and not _worker.done():
+        await _queue.join()
+
+
+async def _drain() -> None:
+    # A single worker keeps each interview's turns in submission order
+    while True:
+        turn = await _queue.get()
+        try:
+            for attempt in range(MAX_ATTEMPTS):
+                try:
+                    await record_turn(turn)
+                    metrics.write_behind_turns.inc(outcome="written")
+                    break
+                except Exception as e:
+                    logger.error(
+                        f"Write-behind error for interview {turn['interview_id']} "
+                        f"(attempt {attempt+1}/{MAX_ATTEMPTS}): {type(e).__name__}: {e}"
+                    )
+                    if attempt < MAX_ATTEMPTS - 1:
+                        await asyncio.sleep(BASE_DELAY * (2 ** attempt))
+            else:
+                metrics.write_behind_turns.inc(outcome="dropped")
+                logger.critical(f"Dropped turn of interview {turn['interview_id']}: {json.dumps(turn)}")
+        finally:
+            _queue.task_done()
+
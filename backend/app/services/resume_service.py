@@ -1,72 +1,533 @@
 from __future__ import annotations
+import asyncio
 import fitz  # PyMuPDF
+import hashlib
+import io
 import json
 import logging
-from typing import BinaryIO, List
-from app.database import get_supabase
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import AsyncIterator, BinaryIO, Iterator, List, Tuple
+from app.config import (
+    RESUME_BULK_WORKERS,
+    RESUME_BULK_BATCH_SIZE,
+    RESUME_BULK_MAX_FILES,
+    RESUME_BULK_MAX_BYTES,
+    PDF_MAX_PAGES,
+    PDF_MAX_BYTES,
+    PDF_TIME_LIMIT,
+    PDF_SPOOL_THRESHOLD,
+    RESUME_HASH_CACHE_SIZE,
+    RESUME_UPLOAD_DIR,
+)
+from app import metrics
+from app.database import get_db
+from app.services import job_service
+from app.services.keyword_cache import keyword_cache
+from app.services.keyword_matcher import KeywordMatcher, keyword_key
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(file_stream: BinaryIO) -> str:
-    """Extract text from PDF stream using PyMuPDF."""
-    text = ""
+class PDFLimitError(ValueError):
+    """Raised when a PDF exceeds the configured size, page or time limits."""
+
+CHUNK_SIZE = 1024 * 1024
+
+@contextmanager
+def _spooled(file_stream: BinaryIO) -> Iterator[dict]:
+    """Yield ``fitz.open`` arguments for an upload without holding large files in memory.
+
+    Small uploads are read into memory; anything above ``PDF_SPOOL_THRESHOLD``
+    is copied chunk by chunk to a temp file that PyMuPDF opens by path.
+    """
+    if isinstance(file_stream, io.BytesIO):
+        data = file_stream.getvalue()
+        if len(data) > PDF_MAX_BYTES:
+            raise PDFLimitError(f"PDF exceeds {PDF_MAX_BYTES} bytes")
+        yield {"stream": data, "filetype": "pdf"}
+        return
+
+    buffer = io.BytesIO()
+    spool = None
+    size = 0
     try:
-        doc = fitz.open(stream=file_stream.read(), filetype="pdf")
+        while chunk := file_stream.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > PDF_MAX_BYTES:
+                raise PDFLimitError(f"PDF exceeds {PDF_MAX_BYTES} bytes")
+            if spool is None and size > PDF_SPOOL_THRESHOLD:
+                spool = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+                spool.write(buffer.getvalue())
+                buffer = None
+            (spool or buffer).write(chunk)
+
+        if spool is None:
+            yield {"stream": buffer.getvalue(), "filetype": "pdf"}
+        else:
+            spool.close()
+            yield {"filename": spool.name, "filetype": "pdf"}
+    finally:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+
+def iter_pdf_pages(open_args: dict) -> Iterator[str]:
+    """Yield the text of each page, enforcing the page count and time limit."""
+    deadline = time.monotonic() + PDF_TIME_LIMIT
+    with fitz.open(**open_args) as doc:
+        if doc.page_count > PDF_MAX_PAGES:
+            raise PDFLimitError(f"PDF has {doc.page_count} pages (limit {PDF_MAX_PAGES})")
+        metrics.pdf_pages.observe(doc.page_count)
         for page in doc:
-            text += page.get_text()
+            if time.monotonic() > deadline:
+                raise PDFLimitError(f"PDF extraction exceeded {PDF_TIME_LIMIT:g}s")
+            yield page.get_text()
+
+def extract_text_from_pdf(file_stream: BinaryIO) -> str:
+    """Extract text from PDF stream using PyMuPDF.
+
+    Blocking and CPU-bound – call it from a worker thread or process.
+    """
+    try:
+        with metrics.span("pdf_extract"), _spooled(file_stream) as open_args:
+            return "".join(iter_pdf_pages(open_args))
+    except PDFLimitError:
+        raise
     except Exception as e:
         logger.error(f"Error reading PDF: {e}")
         raise ValueError("Failed to extract text from PDF")
-    return text
 
-def analyze_resume_text(text: str) -> dict:
-    """Analyze resume text against keywords in Supabase."""
-    sb = get_supabase()
-    
-    # Fetch keywords
-    keywords_res = sb.table("resume_keywords").select("*").execute()
-    keywords = keywords_res.data
-    
+async def analyze_resume_text(text: str) -> dict:
+    """Analyze resume text against the (cached) keyword table."""
+    snapshot = await keyword_cache.get()
+    analysis = await asyncio.to_thread(score_resume_text, text, snapshot.keywords, snapshot.matcher)
+    analysis["keyword_version"] = snapshot.version
+    return analysis
+
+def score_resume_text(text: str, keywords: List[dict], matcher: KeywordMatcher) -> dict:
+    """Score resume text against a keyword table in one pass of the matcher."""
+    with metrics.span("keyword_match"):
+        hits = matcher.count(text)
+
     # Calculate score
     found_skills = []
+    keyword_hits = {}
     total_score = 0
     max_score = 0
     
-    normalized_text = text.lower()
-    
     for kw in keywords:
-        word = kw["keyword"].lower()
         weight = kw.get("weight", 1.0)
         max_score += weight
         
-        if word in normalized_text:
+        count = hits.get(keyword_key(kw["keyword"]), 0)
+        if count:
             found_skills.append(kw["keyword"])
+            keyword_hits[kw["keyword"]] = count
             total_score += weight
             
     # Calculate percentage (0-100) or 0-10 scale
     final_score = (total_score / max_score * 10) if max_score > 0 else 0
+    found = set(found_skills)
     
     return {
         "score": round(final_score, 1),
         "skills_found": found_skills,
+        "keyword_hits": keyword_hits,
         "total_keywords": len(keywords),
-        "missing_keywords": [k["keyword"] for k in keywords if k["keyword"] not in found_skills]
+        "missing_keywords": [k["keyword"] for k in keywords if k["keyword"] not in found]
     }
 
-def save_resume(candidate_id: str, file_path: str, content_text: str, analysis: dict) -> dict:
-    """Save analysis to Supabase."""
-    sb = get_supabase()
+async def save_resume(candidate_id: str, file_path: str, content_text: str, analysis: dict, content_hash: str | None = None) -> dict:
+    """Save analysis to the database."""
+    db = get_db()
     
     data = {
         "candidate_id": candidate_id,
         "file_path": file_path,
         "content_text": content_text,
+        "content_hash": content_hash,
         "skills_found": analysis["skills_found"],
         "score": analysis["score"],
         "analysis_json": analysis,
     }
     
-    res = sb.table("resumes").insert(data).execute()
+    res = await db.table("resumes").insert(data).execute()
     return res.data[0]
+
+async def save_resumes(rows: List[dict]) -> List[dict]:
+    """Insert many analyzed resumes with one request.
+
+    Each row needs ``candidate_id``, ``file_path``, ``content_text`` and
+    ``analysis``.
+    """
+    if not rows:
+        return []
+    res = await get_db().table("resumes").insert([
+        {
+            "candidate_id": r["candidate_id"],
+            "file_path": r["file_path"],
+            "content_text": r["content_text"],
+            "content_hash": r.get("content_hash"),
+            "skills_found": r["analysis"]["skills_found"],
+            "score": r["analysis"]["score"],
+            "analysis_json": r["analysis"],
+        }
+        for r in rows
+    ]).execute()
+    return res.data
+
+# ---------------------------------------------------------------------------
+# Content-hash dedupe
+# ---------------------------------------------------------------------------
+
+# content_hash -> {"content_text", "analysis"}; shared by request threads
+_hash_cache: "OrderedDict[str, dict]" = OrderedDict()
+_hash_cache_lock = threading.Lock()
+
+def hash_upload(file_stream: BinaryIO, limit: int | None = None) -> str:
+    """SHA-256 of an upload, read in chunks; rewinds the stream afterwards.
+
+    With a ``limit``, raises :class:`PDFLimitError` once the upload passes it.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := file_stream.read(CHUNK_SIZE):
+        size += len(chunk)
+        if limit is not None and size > limit:
+            raise PDFLimitError(f"Upload exceeds {limit} bytes")
+        digest.update(chunk)
+    file_stream.seek(0)
+    return digest.hexdigest()
+
+def _remember(content_hash: str, content_text: str, analysis: dict) -> None:
+    with _hash_cache_lock:
+        _hash_cache[content_hash] = {"content_text": content_text, "analysis": analysis}
+        _hash_cache.move_to_end(content_hash)
+        while len(_hash_cache) > RESUME_HASH_CACHE_SIZE:
+            _hash_cache.popitem(last=False)
+
+async def _find_by_hash(content_hash: str, candidate_id: str) -> Tuple[dict | None, dict | None]:
+    """Return ``(known, existing_row)`` for an upload hash.
+
+    ``known`` holds the extracted text and analysis from an earlier upload
+    of the same file; ``existing_row`` is that candidate's own resume row
+    for it, if any.
+    """
+    res = await (
+        get_db().table("resumes")
+        .select("*")
+        .eq("content_hash", content_hash)
+        .eq("candidate_id", candidate_id)
+        .order("created_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if res.data:
+        row = res.data[0]
+        return {"content_text": row["content_text"], "analysis": row["analysis_json"]}, row
+
+    with _hash_cache_lock:
+        known = _hash_cache.get(content_hash)
+    if known is not None:
+        return known, None
+
+    res = await (
+        get_db().table("resumes")
+        .select("content_text, analysis_json")
+        .eq("content_hash", content_hash)
+        .order("created_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if res.data:
+        row = res.data[0]
+        return {"content_text": row["content_text"], "analysis": row["analysis_json"]}, None
+    return None, None
+
+async def analyze_upload(
+    file_stream: BinaryIO, filename: str, candidate_id: str, content_hash: str | None = None
+) -> dict:
+    """Extract, score and save an uploaded resume, reusing earlier work for identical files.
+
+    Files are identified by content hash (pass ``content_hash`` if it is
+    already known). A repeat upload skips extraction; see :func:`_reuse`.
+    Hashing and PyMuPDF run in worker threads.
+    """
+    if content_hash is None:
+        content_hash = await asyncio.to_thread(hash_upload, file_stream)
+    known, existing = await _find_by_hash(content_hash, candidate_id)
+    if known is not None:
+        return await _reuse(content_hash, known, existing, candidate_id, filename)
+
+    content = await asyncio.to_thread(extract_text_from_pdf, file_stream)
+    analysis = await analyze_resume_text(content)
+    _remember(content_hash, content, analysis)
+    return await save_resume(candidate_id, filename, content, analysis, content_hash)
+
+async def analyze_known_upload(
+    file_stream: BinaryIO, filename: str, candidate_id: str
+) -> Tuple[str, dict | None]:
+    """Hash an upload and, if the same file was analyzed before, finish it now.
+
+    Returns ``(content_hash, resume_row)``. The row is None for a file not
+    seen before, which needs :func:`submit_analysis`. Raises
+    :class:`PDFLimitError` for uploads over ``PDF_MAX_BYTES``.
+    """
+    content_hash = await asyncio.to_thread(hash_upload, file_stream, PDF_MAX_BYTES)
+    known, existing = await _find_by_hash(content_hash, candidate_id)
+    if known is None:
+        return content_hash, None
+    return content_hash, await _reuse(content_hash, known, existing, candidate_id, filename)
+
+async def _reuse(content_hash: str, known: dict, existing: dict | None, candidate_id: str, filename: str) -> dict:
+    """Save a repeat upload from its earlier extraction and analysis.
+
+    The analysis is only re-scored if the keyword table has changed since.
+    If the candidate already has a row for the file, that row is returned
+    (and updated when re-scored) instead of inserting a duplicate.
+    """
+    content = known["content_text"]
+    analysis = known["analysis"]
+    if analysis.get("keyword_version") != (await keyword_cache.get()).version:
+        analysis = await analyze_resume_text(content)
+    elif existing is not None:
+        _remember(content_hash, content, analysis)
+        return existing
+    _remember(content_hash, content, analysis)
+
+    if existing is not None:
+        res = await get_db().table("resumes").update({
+            "skills_found": analysis["skills_found"],
+            "score": analysis["score"],
+            "analysis_json": analysis,
+        }).eq("id", existing["id"]).execute()
+        return res.data[0]
+
+    return await save_resume(candidate_id, filename, content, analysis, content_hash)
+
+async def submit_analysis(file_stream: BinaryIO, filename: str, candidate_id: str, content_hash: str) -> dict:
+    """Queue :func:`analyze_upload` as a background job and return the job.
+
+    The upload is copied to ``RESUME_UPLOAD_DIR`` under its content hash and
+    the job payload holds only that path, so the job survives a restart
+    without the PDF passing through the jobs table. Re-submitting the same
+    file for the same candidate while a job for it is unfinished returns
+    that job.
+    """
+    path = await asyncio.to_thread(_store_upload, file_stream, content_hash)
+    return await job_service.submit(
+        "resume_analysis",
+        {"candidate_id": candidate_id, "filename": filename, "content_hash": content_hash, "path": path},
+        dedupe_key=f"resume:{candidate_id}:{content_hash}",
+    )
+
+def _store_upload(file_stream: BinaryIO, content_hash: str) -> str:
+    """Copy an upload to ``RESUME_UPLOAD_DIR`` in chunks and return its path."""
+    os.makedirs(RESUME_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(RESUME_UPLOAD_DIR, f"{content_hash}.pdf")
+    with tempfile.NamedTemporaryFile(dir=RESUME_UPLOAD_DIR, suffix=".part", delete=False) as part:
+        try:
+            while chunk := file_stream.read(CHUNK_SIZE):
+                part.write(chunk)
+        except BaseException:
+            os.unlink(part.name)
+            raise
+    # Same name for the same content, so a concurrent copy can only replace it with identical bytes
+    os.replace(part.name, path)
+    file_stream.seek(0)
+    return path
+
+def _discard_upload(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def read_limited(file_stream: BinaryIO, limit: int) -> bytes:
+    """Read a stream in chunks, failing as soon as it passes ``limit`` bytes."""
+    buffer = io.BytesIO()
+    while chunk := file_stream.read(CHUNK_SIZE):
+        if buffer.tell() + len(chunk) > limit:
+            raise PDFLimitError(f"Upload exceeds {limit} bytes")
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+@job_service.handler("resume_analysis")
+async def _analysis_job(payload: dict) -> dict:
+    content_hash, candidate_id, filename = payload["content_hash"], payload["candidate_id"], payload["filename"]
+    try:
+        with open(payload["path"], "rb") as pdf:
+            result = await analyze_upload(pdf, filename, candidate_id, content_hash)
+    except FileNotFoundError:
+        # Another job for the same file (another candidate) finished first and removed it
+        known, existing = await _find_by_hash(content_hash, candidate_id)
+        if known is None:
+            raise job_service.PermanentError("The uploaded file is no longer available")
+        return await _reuse(content_hash, known, existing, candidate_id, filename)
+    except ValueError as e:
+        # Over the PDF limits or not a readable PDF; another attempt won't help
+        _discard_upload(payload["path"])
+        raise job_service.PermanentError(str(e)) from e
+    _discard_upload(payload["path"])
+    return result
+
+# ---------------------------------------------------------------------------
+# Bulk ingestion
+# ---------------------------------------------------------------------------
+
+def expand_uploads(uploads: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """Flatten uploaded PDFs and zip archives into ``(filename, pdf_bytes)`` pairs.
+
+    Archive members are checked against ``PDF_MAX_BYTES``, and the whole
+    request against ``RESUME_BULK_MAX_FILES`` and ``RESUME_BULK_MAX_BYTES``,
+    from the zip directory before anything is decompressed. Raises
+    :class:`PDFLimitError` when a limit is exceeded.
+    """
+    items = []
+    total = 0
+    for filename, data in uploads:
+        if not zipfile.is_zipfile(io.BytesIO(data)):
+            items.append((filename, data))
+            total += len(data)
+            continue
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            members = [i for i in archive.infolist() if not i.is_dir() and i.filename.lower().endswith(".pdf")]
+            for info in members:
+                if info.file_size > PDF_MAX_BYTES:
+                    raise PDFLimitError(f"{filename}/{info.filename} exceeds {PDF_MAX_BYTES} bytes")
+            total += sum(info.file_size for info in members)
+            if len(items) + len(members) > RESUME_BULK_MAX_FILES:
+                raise PDFLimitError(f"At most {RESUME_BULK_MAX_FILES} resumes per request")
+            if total > RESUME_BULK_MAX_BYTES:
+                raise PDFLimitError(f"Uploads expand to more than {RESUME_BULK_MAX_BYTES} bytes")
+            for info in members:
+                # Bounded read: zipfile stops at the declared size, this guards it anyway
+                with archive.open(info) as member:
+                    items.append((f"{filename}/{info.filename}", read_limited(member, PDF_MAX_BYTES)))
+    if len(items) > RESUME_BULK_MAX_FILES:
+        raise PDFLimitError(f"At most {RESUME_BULK_MAX_FILES} resumes per request")
+    return items
+
+# One process pool per app process, started and stopped by the lifespan
+_bulk_pool: ProcessPoolExecutor | None = None
+
+def start_bulk_pool() -> None:
+    global _bulk_pool
+    if _bulk_pool is None:
+        _bulk_pool = ProcessPoolExecutor(max_workers=max(1, RESUME_BULK_WORKERS))
+
+def stop_bulk_pool() -> None:
+    global _bulk_pool
+    if _bulk_pool is not None:
+        _bulk_pool.shutdown(wait=False, cancel_futures=True)
+        _bulk_pool = None
+
+def _bulk_pool_or_fail() -> ProcessPoolExecutor:
+    if _bulk_pool is None:
+        raise RuntimeError("Bulk resume pool not started – start_bulk_pool() runs in the app lifespan")
+    return _bulk_pool
+
+def _replace_broken_pool(pool: ProcessPoolExecutor) -> None:
+    # A worker died (e.g. killed on a hostile PDF): later requests get a fresh pool
+    global _bulk_pool
+    if _bulk_pool is pool:
+        pool.shutdown(wait=False, cancel_futures=True)
+        _bulk_pool = ProcessPoolExecutor(max_workers=max(1, RESUME_BULK_WORKERS))
+
+# Per-process state for pool workers: the matcher is rebuilt only when the keyword version changes
+_worker_keywords: List[dict] = []
+_worker_matcher: KeywordMatcher | None = None
+_worker_version: str = ""
+
+def _analyze_pdf_in_worker(data: bytes, keywords: List[dict], version: str) -> dict:
+    """Extract and score one PDF inside a pool worker (no database access)."""
+    global _worker_keywords, _worker_matcher, _worker_version
+    if _worker_matcher is None or version != _worker_version:
+        _worker_keywords = keywords
+        _worker_matcher = KeywordMatcher(kw["keyword"] for kw in keywords)
+        _worker_version = version
+    text = extract_text_from_pdf(io.BytesIO(data))
+    analysis = score_resume_text(text, _worker_keywords, _worker_matcher)
+    analysis["keyword_version"] = _worker_version
+    return {"content_text": text, "content_hash": hashlib.sha256(data).hexdigest(), "analysis": analysis}
+
+async def _create_guest_candidates(count: int) -> List[str]:
+    res = await get_db().table("candidates").insert([
+        {"name": "Guest Candidate", "email": "guest@example.com", "status": "Resume Uploaded"}
+        for _ in range(count)
+    ]).execute()
+    return [row["id"] for row in res.data]
+
+async def ingest_resumes_bulk(
+    items: List[Tuple[str, bytes]],
+    candidate_id: str | None = None,
+) -> AsyncIterator[dict]:
+    """Analyze many PDFs across a process pool, yielding events as they finish.
+
+    Yields ``result``/``error`` events per file, a ``saved`` event after each
+    batched insert and a final ``summary`` event. Without ``candidate_id`` a
+    guest candidate is created per resume.
+    """
+    snapshot = await keyword_cache.get()
+    loop = asyncio.get_running_loop()
+    pool = _bulk_pool_or_fail()
+    futures = [
+        loop.run_in_executor(pool, _analyze_pdf_in_worker, data, snapshot.keywords, snapshot.version)
+        for _, data in items
+    ]
+
+    async def run(filename: str, future: asyncio.Future):
+        try:
+            return filename, await future, None
+        except BrokenProcessPool as e:
+            _replace_broken_pool(pool)
+            return filename, None, e
+        except Exception as e:
+            return filename, None, e
+
+    pending: List[dict] = []
+    saved = failed = 0
+
+    async def flush() -> dict:
+        nonlocal pending, saved
+        batch, pending = pending, []
+        ids = [candidate_id] * len(batch) if candidate_id else await _create_guest_candidates(len(batch))
+        rows = await save_resumes([{**row, "candidate_id": cid} for row, cid in zip(batch, ids)])
+        saved += len(rows)
+        return {
+            "type": "saved",
+            "resumes": [{"id": r["id"], "candidate_id": r["candidate_id"], "file_path": r["file_path"]} for r in rows],
+        }
+
+    try:
+        for task in asyncio.as_completed([run(name, future) for (name, _), future in zip(items, futures)]):
+            filename, result, error = await task
+            if error is not None:
+                failed += 1
+                logger.error(f"Bulk resume {filename} failed: {error}")
+                yield {"type": "error", "file": filename, "detail": str(error)}
+                continue
+
+            analysis = result["analysis"]
+            yield {"type": "result", "file": filename, **analysis}
+            pending.append({"file_path": filename, **result})
+            if len(pending) >= RESUME_BULK_BATCH_SIZE:
+                yield await flush()
+
+        if pending:
+            yield await flush()
+        yield {"type": "summary", "total": len(items), "failed": failed, "saved": saved}
+    finally:
+        # The client may have gone away: drop this request's work that hasn't started
+        for future in futures:
+            future.cancel()
+
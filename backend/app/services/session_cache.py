@@ -0,0 +1,102 @@
+"""In-process cache of live interview sessions.
+
+A session holds everything a turn needs – candidate profile, current phase,
+transcript, scores and metadata – so ``process_message`` can skip the read
+round trips to Supabase. Entries are populated by ``start_interview`` (or on
+the first miss) and kept current write-through by the interview service.
+
+The cache is per worker process. Entries expire after ``SESSION_CACHE_TTL``
+seconds, which bounds staleness if another worker writes to the same
+interview; run with sticky sessions when scaling out. Sessions with an open
+WebSocket channel are pinned: they neither expire nor get evicted until
+the last connection closes.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.config import SESSION_CACHE_SIZE, SESSION_CACHE_TTL
+
+
+class SessionCache:
+    """Thread-safe LRU cache with a per-entry TTL and pinning."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._pinned: dict[str, int] = {}  # interview id -> open connections
+        self._lock = threading.Lock()
+
+    def get(self, interview_id: str) -> dict | None:
+        """Return a snapshot of the session, or None on a miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(interview_id)
+            if entry is None:
+                return None
+            expires_at, session = entry
+            if expires_at < time.monotonic() and interview_id not in self._pinned:
+                del self._entries[interview_id]
+                return None
+            self._entries.move_to_end(interview_id)
+            return copy.deepcopy(session)
+
+    def put(self, interview_id: str, session: dict) -> None:
+        with self._lock:
+            self._entries[interview_id] = (time.monotonic() + self.ttl, session)
+            self._entries.move_to_end(interview_id)
+            excess = len(self._entries) - self.max_size
+            for key in [k for k in self._entries if k not in self._pinned][:max(excess, 0)]:
+                del self._entries[key]
+
+    def update(self, interview_id: str, **fields: Any) -> None:
+        """Overwrite top-level session fields; no-op if the session is not cached."""
+        with self._lock:
+            entry = self._entries.get(interview_id)
+            if entry is not None:
+                entry[1].update(fields)
+
+    def append(self, interview_id: str, key: str, item: dict) -> None:
+        """Append to a list field (``messages`` / ``scores``) of a cached session."""
+        with self._lock:
+            entry = self._entries.get(interview_id)
+            if entry is not None:
+                entry[1].setdefault(key, []).append(item)
+
+    def remove(self, interview_id: str, key: str, item: dict) -> None:
+        """Remove the last ``item`` from a list field, undoing an :meth:`append`."""
+        with self._lock:
+            entry = self._entries.get(interview_id)
+            items = entry[1].get(key, []) if entry is not None else []
+            for i in range(len(items) - 1, -1, -1):
+                if items[i] == item:
+                    del items[i]
+                    return
+
+    def pin(self, interview_id: str) -> None:
+        with self._lock:
+            self._pinned[interview_id] = self._pinned.get(interview_id, 0) + 1
+
+    def unpin(self, interview_id: str) -> None:
+        """Release a pin; the entry's TTL starts over when the last one goes."""
+        with self._lock:
+            count = self._pinned.pop(interview_id, 0) - 1
+            if count > 0:
+                self._pinned[interview_id] = count
+            elif interview_id in self._entries:
+                self._entries[interview_id] = (time.monotonic() + self.ttl, self._entries[interview_id][1])
+
+    def invalidate(self, interview_id: str) -> None:
+        with self._lock:
+            self._entries.pop(interview_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+sessions = SessionCache(SESSION_CACHE_SIZE, SESSION_CACHE_TTL)
@@ -0,0 +1,807 @@
+"""Embedded SQLite storage backend (``STORAGE_BACKEND=sqlite``).
+
+``SQLiteClient`` implements the part of the supabase-py / PostgREST query
+builder the services use – ``table(...).select/insert/update/upsert/delete``
+with ``eq``, ``neq``, ``gt(e)``, ``lt(e)``, ``in_``, ``ilike``, ``is_``,
+``or_``, ``order``, ``limit`` and ``single``, embedded resources such as
+``select("*, candidates(*), interview_scores(*)")``, and the
+``record_interview_turn`` / ``get_stats_summary`` RPCs – so
+``get_db()`` can return it in place of the PostgREST client and no
+service code changes. ``execute()`` is awaitable like PostgREST's async
+builder; it runs inline, since queries take well under a millisecond.
+
+The schema mirrors ``supabase_schema.sql``, including its indexes and the
+trigger-maintained stats counters. uuids and timestamps are stored as
+text (timestamps in fixed-width ISO 8601 UTC, so they sort as strings),
+jsonb and array columns as JSON text. Embedded resources are fetched with
+one extra query per relation, not per row. Each ``execute()`` runs in its
+own transaction, as a PostgREST request does, so an RPC or a multi-row
+insert either applies completely or not at all.
+
+Use a file path for a persistent single-node deployment (WAL mode), or
+``:memory:`` for tests and benchmarks.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+UUID, TEXT, REAL, JSON, TIMESTAMP = "uuid", "text", "real", "json", "timestamp"
+UNIQUE_VIOLATION = "23505"  # Postgres SQLSTATE, as PostgREST reports it
+
+# Column types per table; drives value encoding and decoding
+TABLES: dict[str, dict[str, str]] = {
+    "candidates": {
+        "id": UUID, "name": TEXT, "email": TEXT, "phone": TEXT, "experience": REAL, "position": TEXT,
+        "location": TEXT, "tech_stack": TEXT, "status": TEXT, "created_at": TIMESTAMP,
+    },
+    "interviews": {
+        "id": UUID, "candidate_id": UUID, "current_step": TEXT, "metadata": JSON,
+        "created_at": TIMESTAMP, "completed_at": TIMESTAMP,
+    },
+    "interview_messages": {
+        "id": UUID, "interview_id": UUID, "role": TEXT, "content": TEXT, "step": TEXT, "turn_id": UUID,
+        "created_at": TIMESTAMP,
+    },
+    "interview_scores": {
+        "id": UUID, "interview_id": UUID, "category": TEXT, "score": REAL, "strengths": JSON,
+        "improvements": JSON, "assessment": TEXT, "created_at": TIMESTAMP,
+    },
+    "interview_reports": {
+        "id": UUID, "interview_id": UUID, "report": JSON, "transcript_hash": TEXT, "generated_at": TIMESTAMP,
+    },
+    "resumes": {
+        "id": UUID, "candidate_id": UUID, "file_path": TEXT, "content_text": TEXT, "content_hash": TEXT,
+        "skills_found": JSON, "score": REAL, "analysis_json": JSON, "created_at": TIMESTAMP,
+    },
+    "resume_keywords": {
+        "id": UUID, "keyword": TEXT, "category": TEXT, "weight": REAL, "created_at": TIMESTAMP,
+    },
+    "jobs": {
+        "id": UUID, "kind": TEXT, "payload": JSON, "status": TEXT, "dedupe_key": TEXT, "attempts": REAL,
+        "max_attempts": REAL, "result": JSON, "error": TEXT, "run_after": TIMESTAMP, "locked_until": TIMESTAMP,
+        "created_at": TIMESTAMP, "started_at": TIMESTAMP, "finished_at": TIMESTAMP,
+    },
+    "stats_counters": {"dimension": TEXT, "bucket": TEXT, "count": REAL, "score_sum": REAL},
+    "stats_daily": {"day": TEXT, "candidates": REAL, "completed": REAL, "scores": REAL, "score_sum": REAL},
+}
+
+# child table -> {foreign key column: parent table}; used to resolve embedded resources
+FOREIGN_KEYS: dict[str, dict[str, str]] = {
+    "interviews": {"candidate_id": "candidates"},
+    "interview_messages": {"interview_id": "interviews"},
+    "interview_scores": {"interview_id": "interviews"},
+    "interview_reports": {"interview_id": "interviews"},
+    "resumes": {"candidate_id": "candidates"},
+}
+
+# Foreign keys that are also unique embed as a single object, as in PostgREST
+ONE_TO_ONE = {("interview_reports", "interview_id")}
+
+SCHEMA = """
+create table if not exists candidates (
+  id text primary key,
+  name text not null,
+  email text not null,
+  phone text,
+  experience real,
+  position text,
+  location text,
+  tech_stack text,
+  status text default 'New',
+  created_at text not null
+);
+create index if not exists candidates_created_at_id_idx on candidates (created_at desc, id desc);
+create index if not exists candidates_status_idx on candidates (status);
+
+create table if not exists interviews (
+  id text primary key,
+  candidate_id text references candidates(id) on delete cascade,
+  current_step text not null default 'technical_questions',
+  metadata text default '{}',
+  created_at text not null,
+  completed_at text
+);
+create index if not exists interviews_candidate_id_idx on interviews (candidate_id, created_at);
+
+create table if not exists interview_messages (
+  id text primary key,
+  interview_id text references interviews(id) on delete cascade,
+  role text not null,
+  content text not null,
+  step text,
+  turn_id text,
+  created_at text not null
+);
+create index if not exists interview_messages_interview_id_idx on interview_messages (interview_id, created_at);
+create unique index if not exists interview_messages_turn_id_idx on interview_messages (turn_id, role);
+
+create table if not exists interview_scores (
+  id text primary key,
+  interview_id text references interviews(id) on delete cascade,
+  category text not null,
+  score real,
+  strengths text,
+  improvements text,
+  assessment text,
+  created_at text not null
+);
+create index if not exists interview_scores_interview_id_idx on interview_scores (interview_id, created_at);
+
+create table if not exists interview_reports (
+  id text primary key,
+  interview_id text unique references interviews(id) on delete cascade,
+  report text not null,
+  transcript_hash text not null,
+  generated_at text not null
+);
+
+create table if not exists resumes (
+  id text primary key,
+  candidate_id text references candidates(id) on delete cascade,
+  file_path text,
+  content_text text,
+  content_hash text,
+  skills_found text,
+  score real,
+  analysis_json text,
+  created_at text not null
+);
+create index if not exists resumes_content_hash_idx on resumes (content_hash, candidate_id);
+create index if not exists resumes_candidate_id_idx on resumes (candidate_id);
+
+create table if not exists resume_keywords (
+  id text primary key,
+  keyword text unique not null,
+  category text,
+  weight real default 1.0,
+  created_at text not null
+);
+
+create table if not exists jobs (
+  id text primary key,
+  kind text not null,
+  payload text not null default '{}',
+  status text not null default 'queued',
+  dedupe_key text,
+  attempts integer not null default 0,
+  max_attempts integer not null default 3,
+  result text,
+  error text,
+  run_after text not null,
+  locked_until text,
+  created_at text not null,
+  started_at text,
+  finished_at text
+);
+create index if not exists jobs_status_run_after_idx on jobs (status, run_after);
+update jobs set status = 'failed', error = 'Duplicate of an earlier unfinished job',
+       finished_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')
+ where status in ('queued', 'running') and dedupe_key is not null
+   and exists (
+     select 1 from jobs older
+      where older.dedupe_key = jobs.dedupe_key and older.status in ('queued', 'running')
+        and (older.created_at < jobs.created_at or (older.created_at = jobs.created_at and older.id < jobs.id))
+   );
+drop index if exists jobs_dedupe_key_idx;
+create unique index if not exists jobs_dedupe_key_unique_idx on jobs (dedupe_key) where status in ('queued', 'running');
+
+create table if not exists stats_counters (
+  dimension text not null,
+  bucket text not null,
+  count integer not null default 0,
+  score_sum real not null default 0,
+  primary key (dimension, bucket)
+);
+
+create table if not exists stats_daily (
+  day text primary key,
+  candidates integer not null default 0,
+  completed integer not null default 0,
+  scores integer not null default 0,
+  score_sum real not null default 0
+);
+
+create trigger if not exists candidates_stats_insert after insert on candidates begin
+  insert into stats_counters (dimension, bucket, count) values ('status', coalesce(new.status, 'Unknown'), 1)
+    on conflict (dimension, bucket) do update set count = count + 1;
+  insert into stats_daily (day, candidates) values (date(new.created_at), 1)
+    on conflict (day) do update set candidates = candidates + 1;
+end;
+
+create trigger if not exists candidates_stats_update after update of status on candidates begin
+  update stats_counters set count = count - 1 where dimension = 'status' and bucket = coalesce(old.status, 'Unknown');
+  insert into stats_counters (dimension, bucket, count) values ('status', coalesce(new.status, 'Unknown'), 1)
+    on conflict (dimension, bucket) do update set count = count + 1;
+end;
+
+create trigger if not exists candidates_stats_delete after delete on candidates begin
+  update stats_counters set count = count - 1 where dimension = 'status' and bucket = coalesce(old.status, 'Unknown');
+end;
+
+create trigger if not exists interview_scores_stats_insert after insert on interview_scores
+when new.score is not null begin
+  insert into stats_counters (dimension, bucket, count, score_sum) values ('phase', new.category, 1, new.score)
+    on conflict (dimension, bucket) do update set count = count + 1, score_sum = score_sum + excluded.score_sum;
+  insert into stats_counters (dimension, bucket, count, score_sum) values ('overall', 'all', 1, new.score)
+    on conflict (dimension, bucket) do update set count = count + 1, score_sum = score_sum + excluded.score_sum;
+  insert into stats_daily (day, scores, score_sum) values (date(new.created_at), 1, new.score)
+    on conflict (day) do update set scores = scores + 1, score_sum = score_sum + excluded.score_sum;
+end;
+
+create trigger if not exists interview_scores_stats_delete after delete on interview_scores
+when old.score is not null begin
+  update stats_counters set count = count - 1, score_sum = score_sum - old.score
+   where (dimension = 'phase' and bucket = old.category) or (dimension = 'overall' and bucket = 'all');
+end;
+
+create trigger if not exists interviews_stats_completed after update of completed_at on interviews
+when old.completed_at is null and new.completed_at is not null begin
+  insert into stats_daily (day, completed) values (date(new.completed_at), 1)
+    on conflict (day) do update set completed = completed + 1;
+end;
+"""
+
+
+class StorageError(Exception):
+    """A query could not be executed (mirrors postgrest's APIError, including its SQLSTATE ``code``)."""
+
+    def __init__(self, message: str, code: str | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def _storage_error(error: sqlite3.Error) -> StorageError:
+    unique = isinstance(error, sqlite3.IntegrityError) and "UNIQUE constraint failed" in str(error)
+    return StorageError(f"{type(error).__name__}: {error}", code=UNIQUE_VIOLATION if unique else None)
+
+
+class APIResponse:
+    def __init__(self, data: Any, count: int | None = None) -> None:
+        self.data = data
+        self.count = count
+
+
+_ts_lock = threading.Lock()
+_last_ts: datetime.datetime | None = None
+
+
+def now() -> str:
+    """Current UTC time as fixed-width ISO 8601, strictly increasing within the process.
+
+    Strictly increasing so that rows written back to back (e.g. the two
+    messages of a turn) keep their order, like clock_timestamp() in Postgres.
+    """
+    global _last_ts
+    with _ts_lock:
+        ts = datetime.datetime.now(datetime.timezone.utc)
+        if _last_ts is not None and ts <= _last_ts:
+            ts = _last_ts + datetime.timedelta(microseconds=1)
+        _last_ts = ts
+    return ts.isoformat(timespec="microseconds")
+
+
+def _encode(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == JSON:
+        return json.dumps(value)
+    if kind == TIMESTAMP:
+        return _timestamp(value)
+    if kind in (UUID, TEXT):
+        return str(value)
+    return value
+
+
+def _timestamp(value: Any) -> str:
+    """Fixed-width UTC ISO 8601 (naive values taken as UTC), so timestamps compare as strings."""
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.astimezone(datetime.timezone.utc).isoformat(timespec="microseconds")
+    return str(value)
+
+
+def _decode(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == JSON:
+        return json.loads(value)
+    return value
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split on commas that are not inside parentheses or double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    if current and "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+_EMBED = re.compile(r"^(\w+)(?:!\w+)?\((.*)\)$", re.DOTALL)
+
+
+def _parse_select(columns: str) -> tuple[list[str], dict[str, str]]:
+    """``"a, b, rel(x, y)"`` -> (["a", "b"], {"rel": "x, y"})."""
+    plain, embeds = [], {}
+    for part in _split_top_level(columns or "*"):
+        match = _EMBED.match(part)
+        if match:
+            embeds[match.group(1)] = match.group(2)
+        else:
+            plain.append(part)
+    return plain, embeds
+
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class _Filters:
+    """Accumulates a WHERE clause from PostgREST-style filter calls."""
+
+    def __init__(self, table: str) -> None:
+        self.table = table
+        self.columns = TABLES[table]
+        self.clauses: list[str] = []
+        self.params: list[Any] = []
+
+    def _column(self, name: str) -> str:
+        if name not in self.columns:
+            raise StorageError(f'column {self.table}.{name} does not exist')
+        return f'"{name}"'
+
+    def condition(self, column: str, op: str, value: Any) -> tuple[str, list[Any]]:
+        col = self._column(column)
+        kind = self.columns[column]
+        if op in _OPERATORS:
+            return f"{col} {_OPERATORS[op]} ?", [_encode(kind, value)]
+        if op == "in":
+            values = list(value)
+            if not values:
+                return "0", []
+            return f"{col} in ({', '.join('?' * len(values))})", [_encode(kind, v) for v in values]
+        if op == "ilike":
+            # SQLite's LIKE is already case-insensitive for ASCII
+            return f"{col} like ?", [str(value).replace("*", "%")]
+        if op == "is":
+            if value in (None, "null"):
+                return f"{col} is null", []
+            if value in (True, "true"):
+                return f"{col} = 1", []
+            if value in (False, "false"):
+                return f"{col} = 0", []
+        raise StorageError(f"unsupported filter operator {op!r}")
+
+    def add(self, column: str, op: str, value: Any) -> None:
+        clause, params = self.condition(column, op, value)
+        self.clauses.append(clause)
+        self.params.extend(params)
+
+    def add_logic(self, expression: str, joiner: str = "or") -> None:
+        clause, params = self._logic(expression, joiner)
+        # Parenthesized: the clauses are joined with "and", which binds tighter than "or"
+        self.clauses.append(f"({clause})")
+        self.params.extend(params)
+
+    def _logic(self, expression: str, joiner: str) -> tuple[str, list[Any]]:
+        clauses, params = [], []
+        for part in _split_top_level(expression):
+            nested = re.match(r"^(and|or)\((.*)\)$", part, re.DOTALL)
+            if nested:
+                clause, p = self._logic(nested.group(2), nested.group(1))
+            else:
+                column, op, raw = part.split(".", 2)
+                value: Any = raw
+                if op == "in":
+                    value = [v.strip().strip('"') for v in _split_top_level(raw.strip("()"))]
+                elif raw.startswith('"') and raw.endswith('"'):
+                    value = raw[1:-1]
+                clause, p = self.condition(column, op, value)
+            clauses.append(f"({clause})")
+            params.extend(p)
+        return f" {joiner} ".join(clauses), params
+
+    def sql(self) -> str:
+        return f" where {' and '.join(self.clauses)}" if self.clauses else ""
+
+
+class QueryBuilder:
+    def __init__(self, client: "SQLiteClient", table: str) -> None:
+        if table not in TABLES:
+            raise StorageError(f'relation "{table}" does not exist')
+        self._client = client
+        self._table = table
+        self._columns = TABLES[table]
+        self._filters = _Filters(table)
+        self._action = "select"
+        self._select = "*"
+        self._payload: list[dict] = []
+        self._on_conflict: str | None = None
+        self._order: list[str] = []
+        self._limit: int | None = None
+        self._single = False
+
+    # -- actions ------------------------------------------------------------
+
+    def select(self, columns: str = "*") -> "QueryBuilder":
+        self._action, self._select = "select", columns
+        return self
+
+    def insert(self, data: dict | list[dict]) -> "QueryBuilder":
+        self._action, self._payload = "insert", data if isinstance(data, list) else [data]
+        return self
+
+    def upsert(self, data: dict | list[dict], on_conflict: str = "id") -> "QueryBuilder":
+        self._action, self._payload = "upsert", data if isinstance(data, list) else [data]
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, data: dict) -> "QueryBuilder":
+        self._action, self._payload = "update", [data]
+        return self
+
+    def delete(self) -> "QueryBuilder":
+        self._action = "delete"
+        return self
+
+    # -- filters and modifiers ---------------------------------------------
+
+    def eq(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "eq", value)
+        return self
+
+    def neq(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "neq", value)
+        return self
+
+    def gt(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "gt", value)
+        return self
+
+    def gte(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "gte", value)
+        return self
+
+    def lt(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "lt", value)
+        return self
+
+    def lte(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "lte", value)
+        return self
+
+    def in_(self, column: str, values: list) -> "QueryBuilder":
+        self._filters.add(column, "in", values)
+        return self
+
+    def ilike(self, column: str, pattern: str) -> "QueryBuilder":
+        self._filters.add(column, "ilike", pattern)
+        return self
+
+    def is_(self, column: str, value: Any) -> "QueryBuilder":
+        self._filters.add(column, "is", value)
+        return self
+
+    def or_(self, filters: str) -> "QueryBuilder":
+        self._filters.add_logic(filters)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "QueryBuilder":
+        self._order.append(f"{self._filters._column(column)} {'desc' if desc else 'asc'}")
+        return self
+
+    def limit(self, count: int) -> "QueryBuilder":
+        self._limit = count
+        return self
+
+    def single(self) -> "QueryBuilder":
+        self._single = True
+        return self
+
+    # -- execution ----------------------------------------------------------
+
+    async def execute(self) -> APIResponse:
+        # A request is atomic in PostgREST too, e.g. a multi-row insert
+        with self._client.transaction():
+            try:
+                rows = getattr(self, f"_run_{self._action}")()
+            except sqlite3.Error as e:
+                raise _storage_error(e) from e
+
+        if self._single:
+            if len(rows) != 1:
+                raise StorageError(f"JSON object requested, multiple (or no) rows returned ({len(rows)} rows)")
+            return APIResponse(rows[0])
+        return APIResponse(rows)
+
+    def _run_select(self) -> list[dict]:
+        plain, embeds = _parse_select(self._select)
+        columns = list(self._columns) if "*" in plain else [c.strip() for c in plain]
+        for c in columns:
+            self._filters._column(c)
+
+        # Join keys must be fetched even when not selected; dropped again below
+        join_keys = {self._embed_keys(name)[0] for name in embeds}
+        fetched = list(dict.fromkeys(columns + sorted(join_keys)))
+
+        sql = f'select {", ".join(f"{chr(34)}{c}{chr(34)}" for c in fetched)} from {self._table}{self._filters.sql()}'
+        if self._order:
+            sql += " order by " + ", ".join(self._order)
+        if self._limit is not None:
+            sql += f" limit {int(self._limit)}"
+        rows = [self._client.decode_row(self._table, r) for r in self._client.db.execute(sql, self._filters.params)]
+
+        for name, sub_select in embeds.items():
+            self._embed(rows, name, sub_select)
+        for row in rows:
+            for key in join_keys - set(columns):
+                row.pop(key, None)
+        return rows
+
+    def _embed_keys(self, name: str) -> tuple[str, str, bool]:
+        """``(local key, remote key, embeds a list?)`` for embedding ``name`` into this table."""
+        for column, parent in FOREIGN_KEYS.get(self._table, {}).items():
+            if parent == name:
+                return column, "id", False  # many-to-one
+        for column, parent in FOREIGN_KEYS.get(name, {}).items():
+            if parent == self._table:
+                return "id", column, (name, column) not in ONE_TO_ONE  # one-to-many
+        raise StorageError(f"Could not find a relationship between '{self._table}' and '{name}'")
+
+    def _embed(self, rows: list[dict], name: str, sub_select: str) -> None:
+        local, remote, many = self._embed_keys(name)
+        keys = list({r[local] for r in rows if r.get(local) is not None})
+        related: list[dict] = []
+        if keys:
+            sub = QueryBuilder(self._client, name).select(sub_select)
+            sub._filters.add(remote, "in", keys)
+            plain, _ = _parse_select(sub_select)
+            wanted = set(TABLES[name]) if "*" in plain else {c.strip() for c in plain}
+            # Fetch the join column, then hide it again if it wasn't asked for
+            if remote not in wanted:
+                sub._select = f"{sub_select}, {remote}"
+            related = sub._run_select()
+            if remote not in wanted:
+                for r in related:
+                    r["__key"] = r.pop(remote)
+            else:
+                for r in related:
+                    r["__key"] = r[remote]
+
+        grouped: dict[Any, list[dict]] = {}
+        for r in related:
+            grouped.setdefault(r.pop("__key"), []).append(r)
+        for row in rows:
+            matches = grouped.get(row.get(local), [])
+            row[name] = matches if many else (matches[0] if matches else None)
+
+    def _prepare(self, row: dict) -> dict:
+        unknown = set(row) - set(self._columns)
+        if unknown:
+            raise StorageError(f"Could not find the '{sorted(unknown)[0]}' column of '{self._table}'")
+        prepared = {c: _encode(self._columns[c], v) for c, v in row.items()}
+        if "id" in self._columns and self._columns["id"] == UUID and prepared.get("id") is None:
+            prepared["id"] = str(uuid.uuid4())
+        for column in ("created_at", "generated_at"):
+            if column in self._columns and prepared.get(column) is None:
+                prepared[column] = now()
+        return prepared
+
+    def _run_insert(self) -> list[dict]:
+        return self._write_rows(conflict_clause="")
+
+    def _run_upsert(self) -> list[dict]:
+        targets = [c.strip() for c in (self._on_conflict or "id").split(",")]
+        for c in targets:
+            self._filters._column(c)
+        updates = sorted({c for row in self._payload for c in row} - set(targets) - {"id"})
+        action = (
+            "do update set " + ", ".join(f'"{c}" = excluded."{c}"' for c in updates) if updates else "do nothing"
+        )
+        return self._write_rows(conflict_clause=f' on conflict ({", ".join(targets)}) {action}')
+
+    def _write_rows(self, conflict_clause: str) -> list[dict]:
+        out = []
+        for row in self._payload:
+            prepared = self._prepare(row)
+            cols = list(prepared)
+            sql = (
+                f'insert into {self._table} ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in cols)}) '
+                f'values ({", ".join("?" * len(cols))}){conflict_clause} returning *'
+            )
+            out.extend(self._client.decode_row(self._table, r) for r in self._client.db.execute(sql, list(prepared.values())))
+        return out
+
+    def _run_update(self) -> list[dict]:
+        values = self._payload[0]
+        unknown = set(values) - set(self._columns)
+        if unknown:
+            raise StorageError(f"Could not find the '{sorted(unknown)[0]}' column of '{self._table}'")
+        assignments = ", ".join(f'"{c}" = ?' for c in values)
+        params = [_encode(self._columns[c], v) for c, v in values.items()] + self._filters.params
+        sql = f"update {self._table} set {assignments}{self._filters.sql()} returning *"
+        return [self._client.decode_row(self._table, r) for r in self._client.db.execute(sql, params)]
+
+    def _run_delete(self) -> list[dict]:
+        sql = f"delete from {self._table}{self._filters.sql()} returning *"
+        return [self._client.decode_row(self._table, r) for r in self._client.db.execute(sql, self._filters.params)]
+
+
+class RPCCall:
+    def __init__(self, client: "SQLiteClient", name: str, params: dict) -> None:
+        self._client = client
+        self._name = name
+        self._params = params or {}
+
+    async def execute(self) -> APIResponse:
+        function = self._client.functions.get(self._name)
+        if function is None:
+            raise StorageError(f"Could not find the function {self._name}")
+        # One transaction per call, like a plpgsql function
+        with self._client.transaction():
+            try:
+                return APIResponse(function(self._client.db, **self._params))
+            except sqlite3.Error as e:
+                raise _storage_error(e) from e
+
+
+def _record_interview_turn(
+    db: sqlite3.Connection,
+    p_interview_id: str,
+    p_user_content: str | None,
+    p_user_step: str,
+    p_reply: str,
+    p_next_step: str,
+    p_score: float | None = None,
+    p_assessment: str | None = None,
+    p_turn_id: str | None = None,
+) -> None:
+    """``record_interview_turn`` from ``supabase_schema.sql``; runs in the transaction :class:`RPCCall` opens."""
+    if p_turn_id is not None and db.execute(
+        "select 1 from interview_messages where turn_id = ?", (p_turn_id,)
+    ).fetchone():
+        return
+    if p_user_content is not None:
+        db.execute(
+            "insert into interview_messages (id, interview_id, role, content, step, turn_id, created_at) "
+            "values (?, ?, 'user', ?, ?, ?, ?)",
+            (str(uuid.uuid4()), p_interview_id, p_user_content, p_user_step, p_turn_id, now()),
+        )
+    if p_score is not None:
+        db.execute(
+            "insert into interview_scores (id, interview_id, category, score, strengths, improvements, assessment, created_at) "
+            "values (?, ?, ?, ?, '[]', '[]', ?, ?)",
+            (str(uuid.uuid4()), p_interview_id, p_user_step, p_score, p_assessment or "", now()),
+        )
+    completed = p_next_step == "completed"
+    db.execute(
+        "update interviews set current_step = ?, completed_at = case when ? then ? else completed_at end where id = ?",
+        (p_next_step, completed, now(), p_interview_id),
+    )
+    if completed:
+        db.execute(
+            "update candidates set status = 'Completed' where id = (select candidate_id from interviews where id = ?)",
+            (p_interview_id,),
+        )
+    db.execute(
+        "insert into interview_messages (id, interview_id, role, content, step, turn_id, created_at) "
+        "values (?, ?, 'assistant', ?, ?, ?, ?)",
+        (str(uuid.uuid4()), p_interview_id, p_reply, p_next_step, p_turn_id, now()),
+    )
+
+
+def _avg(score_sum: float, count: int) -> float | None:
+    return round(score_sum / count, 1) if count else None
+
+
+def _get_stats_summary(db: sqlite3.Connection, p_days: int = 30) -> dict:
+    counters = db.execute("select dimension, bucket, count, score_sum from stats_counters").fetchall()
+    status = {b: c for d, b, c, _ in counters if d == "status"}
+    overall = next(((c, s) for d, b, c, s in counters if d == "overall" and b == "all"), (0, 0))
+    since = (datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=p_days)).isoformat()
+    days = db.execute(
+        "select day, candidates, completed, scores, score_sum from stats_daily where day > ? order by day", (since,)
+    ).fetchall()
+    return {
+        "total_candidates": sum(status.values()),
+        "completed_interviews": status.get("Completed", 0),
+        "avg_score": _avg(overall[1], overall[0]) or 0,
+        "by_status": {b: c for b, c in status.items() if c > 0},
+        "by_phase": {
+            b: {"scores": c, "avg_score": _avg(s, c)}
+            for d, b, c, s in counters if d == "phase" and c > 0
+        },
+        "by_day": [
+            {"day": day, "candidates": c, "completed": x, "scores": n, "avg_score": _avg(s, n)}
+            for day, c, x, n, s in days
+        ],
+    }
+
+
+class SQLiteClient:
+    """Supabase-compatible client over an embedded SQLite database."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        # One connection, serialized by ``lock``. Queries are local and short,
+        # so ``execute()`` runs them inline on the event loop; the lock covers
+        # any caller that still comes in from a worker thread.
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        self.db.execute("pragma foreign_keys = on")
+        if path != ":memory:":
+            self.db.execute("pragma journal_mode = wal")
+            self.db.execute("pragma synchronous = normal")
+        self._add_missing_columns()
+        self.db.executescript(SCHEMA)
+        self.functions = {
+            "record_interview_turn": _record_interview_turn,
+            "get_stats_summary": _get_stats_summary,
+        }
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements atomically.
+
+        The connection is in autocommit mode (``isolation_level=None``), where
+        ``with db:`` does not open a transaction, so begin and end it explicitly.
+        """
+        with self.lock:
+            self.db.execute("begin")
+            try:
+                yield self.db
+            except BaseException:
+                self.db.execute("rollback")
+                raise
+            self.db.execute("commit")
+
+    def _add_missing_columns(self) -> None:
+        # Databases created by an older schema: add new (nullable) columns before the indexes on them
+        for table, columns in TABLES.items():
+            existing = {r["name"] for r in self.db.execute(f"pragma table_info({table})")}
+            if not existing:
+                continue  # created by SCHEMA below
+            for column in columns.keys() - existing:
+                kind = "real" if columns[column] == REAL else "text"
+                self.db.execute(f"alter table {table} add column {column} {kind}")
+
+    def table(self, name: str) -> QueryBuilder:
+        return QueryBuilder(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: dict | None = None) -> RPCCall:
+        return RPCCall(self, name, params or {})
+
+    def decode_row(self, table: str, row: sqlite3.Row) -> dict:
+        columns = TABLES[table]
+        return {key: _decode(columns.get(key, TEXT), row[key]) for key in row.keys()}
+
+    async def aclose(self) -> None:
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,251 @@
+"""End-to-end load test for the interview flow.
+
+Each simulated candidate starts an interview, sends ``--turns`` answers
+(stopping early if the interviewer completes the interview) and then
+fetches the report. Candidates run ``--concurrency`` at a time, and the
+run ends with throughput and p50/p95/p99 latency per endpoint.
+
+By default the app is driven in-process over ASGI with ``LLM_BACKEND=fake``,
+so no Gemini quota is used; storage still goes wherever the app is
+configured to put it. ``--base-url`` targets a running server instead.
+
+``httpx.ASGITransport`` hands back a response only once the app has
+finished it, so time to first delta can't be observed over ASGI. With
+``--stream`` the in-process app is therefore served by a local uvicorn
+server on a free port, and requests go over real sockets.
+
+    cd backend
+    python scripts/loadtest.py --candidates 50 --concurrency 10 --turns 6
+    FAKE_LLM_LATENCY=0.3 FAKE_LLM_RATE_LIMIT_RATE=0.05 python scripts/loadtest.py --stream
+    python scripts/loadtest.py --base-url http://localhost:8000 --candidates 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+ANSWERS = [
+    "I'd start by profiling to find where the time actually goes, then fix the hottest path first.",
+    "In my last project I built the ingestion pipeline in Python with FastAPI and Postgres.",
+    "I would add an index on the foreign key and batch the writes to cut round trips.",
+    "We had a conflict about the API design, so I wrote up both options and we chose together.",
+    "idk",
+    "I usually learn new tools by building a small prototype and reading the source.",
+]
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        if ok:
+            self.latencies[endpoint].append(seconds)
+        else:
+            self.errors[endpoint] += 1
+
+    def report(self, wall: float) -> list[dict]:
+        rows = []
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            values = sorted(self.latencies[endpoint])
+            rows.append({
+                "endpoint": endpoint,
+                "ok": len(values),
+                "errors": self.errors[endpoint],
+                "rps": round(len(values) / wall, 2) if wall else 0.0,
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "p99": _percentile(values, 0.99),
+            })
+        return rows
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 1)
+
+
+async def _timed(stats: Stats, endpoint: str, request) -> httpx.Response | None:
+    start = time.perf_counter()
+    try:
+        response = await request
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        response, ok = None, False
+    stats.record(endpoint, time.perf_counter() - start, ok)
+    return response if ok else None
+
+
+async def _send_streamed(client: httpx.AsyncClient, stats: Stats, interview_id: str, content: str) -> str | None:
+    """Send one answer over SSE; records time to first delta and to the done event."""
+    start = time.perf_counter()
+    first = None
+    step = None
+    try:
+        async with client.stream(
+            "POST", f"/api/interviews/{interview_id}/message/stream", json={"role": "user", "content": content}
+        ) as response:
+            if response.status_code >= 400:
+                raise httpx.HTTPStatusError("stream failed", request=response.request, response=response)
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                    if event == "delta" and first is None:
+                        first = time.perf_counter() - start
+                elif line.startswith("data: ") and event == "done":
+                    step = json.loads(line[6:]).get("current_step")
+                elif line.startswith("data: ") and event == "error":
+                    raise httpx.HTTPError(line[6:])
+    except httpx.HTTPError:
+        stats.record("POST message/stream", time.perf_counter() - start, False)
+        return None
+
+    stats.record("POST message/stream", time.perf_counter() - start, True)
+    if first is not None:
+        stats.record("POST message/stream (first delta)", first, True)
+    return step
+
+
+async def _candidate(client: httpx.AsyncClient, stats: Stats, n: int, turns: int, stream: bool, rng: random.Random) -> None:
+    response = await _timed(stats, "POST start", client.post("/api/interviews/start", json={
+        "candidate": {
+            "name": f"Load Test {n}",
+            "email": f"loadtest{n}@example.com",
+            "phone": "0000000000",
+            "experience": rng.randint(0, 12),
+            "position": "Software Engineer",
+            "location": "Remote",
+            "tech_stack": rng.sample(["Python", "FastAPI", "React", "PostgreSQL", "Go", "Docker"], 3),
+        }
+    }))
+    if response is None:
+        return
+    interview_id = response.json()["interview_id"]
+
+    for _ in range(turns):
+        answer = rng.choice(ANSWERS)
+        if stream:
+            step = await _send_streamed(client, stats, interview_id, answer)
+        else:
+            response = await _timed(stats, "POST message", client.post(
+                f"/api/interviews/{interview_id}/message", json={"role": "user", "content": answer}
+            ))
+            step = response.json()["current_step"] if response is not None else None
+        if step is None or step == "completed":
+            break
+
+    start = time.perf_counter()
+    response = await _timed(stats, "GET report", client.get(f"/api/interviews/{interview_id}/report"))
+    if response is not None and response.status_code == 202:
+        # Report is being built by a background job; long-poll it to completion
+        job_id = response.json()["job_id"]
+        while response is not None and response.json()["status"] not in ("done", "failed"):
+            response = await _timed(stats, "GET job (long-poll)", client.get(f"/api/jobs/{job_id}", params={"wait": 30}))
+        ok = response is not None and response.json()["status"] == "done"
+        stats.record("report ready", time.perf_counter() - start, ok)
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    if args.base_url:
+        return await _run(args, None, args.base_url)
+
+    from app.main import app
+
+    if args.stream:
+        return await _run_served(args, app)
+
+    # ASGITransport doesn't send lifespan events, so open the app's lifespan here;
+    # its shutdown flushes the persistence queue
+    async with app.router.lifespan_context(app):
+        return await _run(args, httpx.ASGITransport(app=app), "http://loadtest")
+
+
+async def _run_served(args: argparse.Namespace, app) -> list[dict]:
+    # Streaming metrics need a real server: ASGITransport buffers the whole response
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()  # startup failed
+            raise RuntimeError("uvicorn exited during startup")
+        await asyncio.sleep(0.05)
+    try:
+        return await _run(args, None, f"http://127.0.0.1:{port}")
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def _run(args: argparse.Namespace, transport: httpx.ASGITransport | None, base_url: str) -> list[dict]:
+    stats = Stats()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(args.seed)
+    timeout = httpx.Timeout(args.timeout)
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=timeout) as client:
+        async def one(n: int) -> None:
+            async with semaphore:
+                await _candidate(client, stats, n, args.turns, args.stream, random.Random(rng.random()))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(args.candidates)))
+        wall = time.perf_counter() - start
+
+    rows = stats.report(wall)
+    print(f"\n{args.candidates} candidates, concurrency {args.concurrency}, {wall:.1f}s wall\n")
+    print(f"{'endpoint':<36}{'ok':>7}{'err':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for row in rows:
+        print(
+            f"{row['endpoint']:<36}{row['ok']:>7}{row['errors']:>6}{row['rps']:>9}"
+            f"{_fmt(row['p50']):>10}{_fmt(row['p95']):>10}{_fmt(row['p99']):>10}"
+        )
+    return rows
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=6, help="answers per candidate (fewer if the interview completes)")
+    parser.add_argument("--stream", action="store_true", help="use the SSE message endpoint")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results table as JSON")
+    args = parser.parse_args()
+
+    if not args.base_url:
+        os.environ.setdefault("LLM_BACKEND", "fake")
+
+    rows = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Admission control: concurrency slots, priority queueing, displacement and rate-limit budgets."""
+
+import asyncio
+
+import pytest
+
+from app.services.admission import BACKGROUND, INTERACTIVE, AdmissionController, AdmissionRejected, TokenBucket
+
+MODELS = ["primary", "secondary"]
+
+
+def controller(**settings) -> AdmissionController:
+    options = {"max_concurrency": 1, "queue_size": 10, "queue_timeout": 5, "rpm": 0, "tpm": 0, **settings}
+    return AdmissionController(MODELS, **options)
+
+
+async def waiter(admission: AdmissionController, priority: int, order: list, name: str) -> None:
+    await admission.acquire(priority, 10)
+    order.append(name)
+
+
+def test_calls_beyond_the_concurrency_limit_wait_for_a_slot():
+    async def run():
+        admission = controller()
+        await admission.acquire(INTERACTIVE, 10)
+        order = []
+        task = asyncio.create_task(waiter(admission, INTERACTIVE, order, "second"))
+        await asyncio.sleep(0.01)
+        queued = admission.snapshot()["queued"]
+
+        admission.release()
+        await task
+        return queued, order, admission.active
+
+    queued, order, active = asyncio.run(run())
+    assert queued == 1
+    assert order == ["second"]
+    assert active == 1
+
+
+def test_interview_turns_go_ahead_of_background_work():
+    async def run():
+        admission = controller()
+        await admission.acquire(INTERACTIVE, 10)
+        order = []
+        tasks = [asyncio.create_task(waiter(admission, BACKGROUND, order, "report"))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(waiter(admission, INTERACTIVE, order, "turn")))
+        await asyncio.sleep(0)
+
+        admission.release()
+        await asyncio.sleep(0)
+        admission.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(run()) == ["turn", "report"]
+
+
+def test_full_queue_displaces_background_work_for_a_turn():
+    async def run():
+        admission = controller(queue_size=1)
+        await admission.acquire(INTERACTIVE, 10)
+        order = []
+        report = asyncio.create_task(waiter(admission, BACKGROUND, order, "report"))
+        await asyncio.sleep(0)
+        turn = asyncio.create_task(waiter(admission, INTERACTIVE, order, "turn"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await report
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire(INTERACTIVE, 10)  # nothing left to displace
+
+        admission.release()
+        await turn
+        return order, rejected.value
+
+    order, rejected = asyncio.run(run())
+    assert order == ["turn"]
+    assert rejected.retry_after >= 1
+    assert rejected.retry_after_header == "1"
+
+
+def test_waiting_past_the_queue_timeout_is_rejected():
+    async def run():
+        admission = controller(queue_timeout=0.01)
+        await admission.acquire(INTERACTIVE, 10)
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire(INTERACTIVE, 10)
+        return admission.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["queued"] == 0
+    assert snapshot["active"] == 1
+
+
+def test_cancelled_waiter_gives_up_its_place_without_leaking_a_slot():
+    async def run():
+        admission = controller()
+        await admission.acquire(INTERACTIVE, 10)
+        task = asyncio.create_task(admission.acquire(INTERACTIVE, 10))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        admission.release()
+        return admission.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["active"] == 0
+    assert snapshot["queued"] == 0
+
+
+def test_calls_wait_for_rate_limit_budget():
+    async def run():
+        admission = controller(max_concurrency=10, rpm=6000)  # refills 100 requests a second
+        for model in MODELS:
+            admission.buckets[model][0].take(6001)
+        throttled = admission.throttled("primary")
+
+        task = asyncio.create_task(admission.acquire(INTERACTIVE, 10))
+        await asyncio.sleep(0)
+        queued = admission.snapshot()["queued"]
+        await asyncio.wait_for(task, 1)
+        return throttled, queued, admission.active
+
+    throttled, queued, active = asyncio.run(run())
+    assert throttled
+    assert queued == 1
+    assert active == 1
+
+
+def test_rate_limited_model_is_throttled_until_its_bucket_refills():
+    admission = controller(rpm=60)
+
+    admission.exhaust("primary")
+
+    assert admission.throttled("primary")
+    assert not admission.throttled("secondary")
+
+
+def test_request_larger_than_the_bucket_waits_only_for_a_full_bucket():
+    bucket = TokenBucket(per_minute=600)
+    bucket.take(600)
+
+    assert bucket.wait_time(10_000) == pytest.approx(60, rel=0.01)
@@ -0,0 +1,61 @@
+"""Limits on bulk uploads hold before anything large is read or decompressed."""
+
+import io
+import zipfile
+
+import pytest
+
+from app.services import resume_service
+from app.services.resume_service import PDFLimitError, expand_uploads, read_limited
+
+
+def zip_of(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def small_limits(monkeypatch):
+    monkeypatch.setattr(resume_service, "PDF_MAX_BYTES", 1000)
+    monkeypatch.setattr(resume_service, "RESUME_BULK_MAX_FILES", 3)
+    monkeypatch.setattr(resume_service, "RESUME_BULK_MAX_BYTES", 2000)
+
+
+def test_zip_members_are_expanded():
+    archive = zip_of({"a.pdf": b"%PDF a", "notes.txt": b"skip", "dir/b.PDF": b"%PDF b"})
+
+    items = expand_uploads([("batch.zip", archive), ("c.pdf", b"%PDF c")])
+
+    assert sorted(items) == [("batch.zip/a.pdf", b"%PDF a"), ("batch.zip/dir/b.PDF", b"%PDF b"), ("c.pdf", b"%PDF c")]
+
+
+def test_oversized_member_is_rejected_without_decompressing(monkeypatch):
+    # Compresses to a few bytes, expands past the per-PDF limit
+    archive = zip_of({"bomb.pdf": b"\0" * 50_000})
+    monkeypatch.setattr(zipfile.ZipFile, "open", lambda *args, **kwargs: pytest.fail("member was read"))
+
+    with pytest.raises(PDFLimitError):
+        expand_uploads([("bomb.zip", archive)])
+
+
+def test_total_expanded_size_is_limited():
+    archive = zip_of({f"{i}.pdf": b"\0" * 900 for i in range(3)})
+
+    with pytest.raises(PDFLimitError):
+        expand_uploads([("many.zip", archive)])
+
+
+def test_member_count_is_limited():
+    archive = zip_of({f"{i}.pdf": b"%PDF" for i in range(4)})
+
+    with pytest.raises(PDFLimitError):
+        expand_uploads([("many.zip", archive)])
+
+
+def test_read_limited_stops_at_the_limit():
+    assert read_limited(io.BytesIO(b"x" * 10), 10) == b"x" * 10
+    with pytest.raises(PDFLimitError):
+        read_limited(io.BytesIO(b"x" * 11), 10)
@@ -0,0 +1,86 @@
+"""Keyset pagination over GET /api/candidates and validation of its cursor."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import candidates
+from app.sqlite_backend import SQLiteClient
+
+
+def cursor_of(created_at, candidate_id) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at, candidate_id]).encode()).decode()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = SQLiteClient(":memory:")
+    monkeypatch.setattr(candidates, "get_db", lambda: client)
+    # Several candidates share a timestamp, so the id tiebreak matters
+    rows = [
+        {"name": f"Candidate {i}", "email": f"c{i}@example.com", "created_at": f"2024-01-0{1 + i // 2}T00:00:00.000000+00:00"}
+        for i in range(7)
+    ]
+    asyncio.run(client.table("candidates").insert(rows).execute())
+    return client
+
+
+def list_page(**params):
+    params = {"status": None, "position": None, "location": None, "min_experience": None, "fields": None,
+              "limit": 50, "cursor": None, **params}
+    return asyncio.run(candidates.list_candidates(**params))
+
+
+def test_pages_cover_every_candidate_once(db):
+    seen, cursor = [], None
+    while True:
+        page = list_page(limit=3, cursor=cursor)
+        seen.extend(row["id"] for row in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    everything = list_page()["items"]
+    assert seen == [row["id"] for row in everything]
+    assert len(set(seen)) == 7
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 json",
+    cursor_of("2024-01-01T00:00:00+00:00", 'x),status.eq.Completed,or(id.gt.0'),
+    cursor_of('2024-01-01",id.gt.0),(created_at.eq."x', "6f1c3a52-55d4-4d0c-9d43-9c5ab4f6d7a1"),
+    cursor_of("2024-01-01T00:00:00", "6f1c3a52-55d4-4d0c-9d43-9c5ab4f6d7a1"),
+    cursor_of(["2024-01-01"], "6f1c3a52-55d4-4d0c-9d43-9c5ab4f6d7a1"),
+])
+def test_malformed_cursor_is_rejected(db, cursor):
+    with pytest.raises(HTTPException) as error:
+        list_page(cursor=cursor)
+    assert error.value.status_code == 400
+
+
+def test_cursor_values_are_canonicalized():
+    created_at, candidate_id = candidates._decode_cursor(
+        cursor_of("2024-01-01T02:00:00+02:00", "6F1C3A5255D44D0C9D439C5AB4F6D7A1")
+    )
+    assert created_at == "2024-01-01T00:00:00.000000+00:00"
+    assert candidate_id == "6f1c3a52-55d4-4d0c-9d43-9c5ab4f6d7a1"
+
+
+def test_filters_and_projection_hold_across_pages(db):
+    asyncio.run(db.table("candidates").update({"status": "Completed"}).in_("name", ["Candidate 1", "Candidate 4", "Candidate 6"]).execute())
+
+    first = list_page(status="Completed", fields="name", limit=2)
+    second = list_page(status="Completed", fields="name", limit=2, cursor=first["next_cursor"])
+
+    assert [r["name"] for r in first["items"] + second["items"]] == ["Candidate 6", "Candidate 4", "Candidate 1"]
+    assert set(first["items"][0]) == {"id", "created_at", "name"}
+    assert second["next_cursor"] is None
+
+
+def test_unknown_projection_field_is_rejected(db):
+    with pytest.raises(HTTPException) as error:
+        list_page(fields="name,password")
+    assert error.value.status_code == 400
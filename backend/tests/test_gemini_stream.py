@@ -0,0 +1,51 @@
+"""Streamed interview replies fall back across models and report each outcome to the router."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.services import gemini_service
+from app.services.admission import AdmissionController
+from app.services.model_router import InvalidResponse, ModelRouter
+
+MODELS = ["primary", "secondary"]
+REPLY = {"reply": "Tell me about Python.", "phase": "technical", "score": None, "assessment": None}
+
+
+class Model:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        async def chunks():
+            yield SimpleNamespace(text=self.text)
+        return chunks()
+
+
+def test_unusable_stream_is_reported_and_the_next_model_answers(monkeypatch):
+    router = ModelRouter(MODELS, hedge=False)
+    failures = []
+    record_failure = router.record_failure
+    monkeypatch.setattr(
+        router, "record_failure",
+        lambda model, error, latency=None: (failures.append((model, error)), record_failure(model, error, latency)),
+    )
+    monkeypatch.setattr(gemini_service, "router", router)
+    monkeypatch.setattr(gemini_service, "admission", AdmissionController(MODELS, rpm=0, tpm=0))
+    monkeypatch.setattr(gemini_service, "MAX_RETRIES", 1)
+    models = {"primary": Model("{}"), "secondary": Model(json.dumps(REPLY))}
+
+    async def get(model_name, system_instruction):
+        return models[model_name]
+
+    monkeypatch.setattr(gemini_service.registry, "get", get)
+
+    async def run():
+        stream = gemini_service.stream_next_message({"name": "Ada"}, [], "technical")
+        return [event async for event in stream]
+
+    events = asyncio.run(run())
+
+    assert [(model, type(error)) for model, error in failures] == [("primary", InvalidResponse)]
+    assert events[-1] == {"type": "done", **REPLY}
+    assert not router.health["primary"].is_open
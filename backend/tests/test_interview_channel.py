@@ -0,0 +1,118 @@
+"""WebSocket channel: reconnects see the turn in flight, and resends never answer a message twice."""
+
+import asyncio
+
+import pytest
+
+from app.services import interview_channel, interview_service
+from app.services.interview_channel import InterviewChannel
+from app.services.session_cache import sessions
+from app.sqlite_backend import SQLiteClient
+
+INTERVIEW_ID = "interview-channel-test"
+GREETING = {"role": "assistant", "content": "Hello!", "step": "technical"}
+DONE = {"type": "done", "reply": "Tell me more.", "phase": "technical", "score": 7, "assessment": "ok"}
+
+
+@pytest.fixture
+def turn(monkeypatch):
+    """Replies stream one delta, then wait for ``proceed``; persisting waits for ``persist``."""
+    sessions.put(INTERVIEW_ID, {
+        "interview_id": INTERVIEW_ID,
+        "step": "technical",
+        "candidate": {"name": "Ada", "status": "In Progress"},
+        "metadata": {},
+        "messages": [dict(GREETING)],
+        "scores": [],
+        "report": None,
+    })
+    state = {"streams": 0, "proceed": None, "persist": None}
+
+    def stream_next_message(**kwargs):
+        state["streams"] += 1
+
+        async def stream():
+            yield {"type": "delta", "text": "Tell me"}
+            await state["proceed"].wait()
+            yield DONE
+        return stream()
+
+    async def submit_turn(record):
+        await state["persist"].wait()
+
+    monkeypatch.setattr(interview_service, "stream_next_message", stream_next_message)
+    monkeypatch.setattr(interview_service, "submit_turn", submit_turn)
+    monkeypatch.setattr(interview_service, "schedule_fold", lambda *args: None)
+    yield state
+    sessions.invalidate(INTERVIEW_ID)
+
+
+async def until(outbox: asyncio.Queue, kind: str) -> dict:
+    while (event := await asyncio.wait_for(outbox.get(), 1))["type"] != kind:
+        pass
+    return event
+
+
+async def settle():
+    await asyncio.gather(*interview_channel._tasks)
+
+
+def test_reconnect_gets_the_reply_so_far_then_the_rest(turn):
+    async def run():
+        turn["proceed"], turn["persist"] = asyncio.Event(), asyncio.Event()
+        turn["persist"].set()
+        first = InterviewChannel(INTERVIEW_ID)
+        await first.open()
+        await first.handle({"type": "message", "id": "m1", "content": "I use Python"})
+        await until(first.outbox, "delta")
+        first.close()  # the socket dropped
+
+        second = InterviewChannel(INTERVIEW_ID)
+        snapshot = await second.open()
+        turn["proceed"].set()
+        done = await until(second.outbox, "done")
+        await settle()
+        second.close()
+        return snapshot, done
+
+    snapshot, done = asyncio.run(run())
+    assert snapshot["pending"] == {"id": "m1", "reply": "Tell me"}
+    assert snapshot["messages"][-1] == {"role": "user", "content": "I use Python"}
+    assert done["id"] == "m1" and done["message"] == DONE["reply"]
+
+
+def test_resend_while_the_turn_is_persisted_is_not_answered_again(turn):
+    async def run():
+        turn["proceed"], turn["persist"] = asyncio.Event(), asyncio.Event()
+        turn["proceed"].set()
+        channel = InterviewChannel(INTERVIEW_ID)
+        await channel.open()
+        await channel.handle({"type": "message", "id": "m1", "content": "I use Python"})
+        await until(channel.outbox, "done")
+
+        # "done" was sent but the turn is not recorded yet
+        last_before_persisted = (sessions.get(INTERVIEW_ID) or {}).get("last_message_id")
+        await channel.handle({"type": "message", "id": "m1", "content": "I use Python"})
+        resent_early = await until(channel.outbox, "done")
+
+        turn["persist"].set()
+        await settle()
+        await channel.handle({"type": "message", "id": "m1", "content": "I use Python"})
+        resent_late = await until(channel.outbox, "done")
+        channel.close()
+        return last_before_persisted, resent_early, resent_late
+
+    last_before_persisted, resent_early, resent_late = asyncio.run(run())
+    assert last_before_persisted is None
+    assert resent_early["message"] == resent_late["message"] == DONE["reply"]
+    assert turn["streams"] == 1
+    assert sessions.get(INTERVIEW_ID)["last_message_id"] == "m1"
+    assert [m["role"] for m in sessions.get(INTERVIEW_ID)["messages"]] == ["assistant", "user", "assistant"]
+
+
+def test_missing_interview_is_reported_as_not_found(monkeypatch):
+    client = SQLiteClient(":memory:")
+    monkeypatch.setattr(interview_service, "get_db", lambda: client)
+
+    with pytest.raises(interview_service.InterviewNotFound):
+        asyncio.run(InterviewChannel("00000000-0000-0000-0000-000000000000").open())
@@ -0,0 +1,25 @@
+"""GET /api/interviews/{id}/report answers 404 for an interview that doesn't exist."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import interviews
+from app.services import interview_service
+from app.sqlite_backend import SQLiteClient
+
+
+@pytest.fixture(autouse=True)
+def db(monkeypatch):
+    client = SQLiteClient(":memory:")
+    monkeypatch.setattr(interview_service, "get_db", lambda: client)
+    return client
+
+
+@pytest.mark.parametrize("interview_id", ["6f1c3a52-55d4-4d0c-9d43-9c5ab4f6d7a1", "not-a-uuid"])
+@pytest.mark.parametrize("regenerate", [False, True])
+def test_unknown_interview_is_not_found(interview_id, regenerate):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(interviews.get_report(interview_id, regenerate=regenerate))
+    assert error.value.status_code == 404
@@ -0,0 +1,144 @@
+"""A streamed turn either completes (cache and database both get it) or is abandoned."""
+
+import asyncio
+
+import pytest
+
+from app.services import interview_service, persistence_service
+from app.services.session_cache import sessions
+
+INTERVIEW_ID = "interview-stream-test"
+GREETING = {"role": "assistant", "content": "Hello!", "step": "technical"}
+DONE = {"type": "done", "reply": "Tell me more.", "phase": "technical", "score": 7, "assessment": "ok"}
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    sessions.put(INTERVIEW_ID, {
+        "interview_id": INTERVIEW_ID,
+        "step": "technical",
+        "candidate": {"name": "Ada", "status": "In Progress"},
+        "metadata": {},
+        "messages": [dict(GREETING)],
+        "scores": [],
+        "report": None,
+    })
+    turns = []
+
+    async def submit_turn(turn):
+        turns.append(turn)
+
+    monkeypatch.setattr(interview_service, "submit_turn", submit_turn)
+    monkeypatch.setattr(interview_service, "schedule_fold", lambda *args: None)
+    yield turns
+    sessions.invalidate(INTERVIEW_ID)
+
+
+def stream_of(*events, error=None):
+    def stream_next_message(**kwargs):
+        async def stream():
+            for event in events:
+                yield event
+            if error is not None:
+                raise error
+        return stream()
+    return stream_next_message
+
+
+def transcript():
+    return sessions.get(INTERVIEW_ID)["messages"]
+
+
+def test_completed_stream_records_the_turn(monkeypatch, recorded):
+    monkeypatch.setattr(interview_service, "stream_next_message", stream_of({"type": "delta", "text": "Tell"}, DONE))
+
+    async def run():
+        events = await interview_service.open_message_stream(INTERVIEW_ID, "I use Python")
+        return [event async for event in events]
+
+    events = asyncio.run(run())
+    assert [e["type"] for e in events] == ["delta", "done"]
+    assert len(recorded) == 1
+    assert [m["role"] for m in transcript()] == ["assistant", "user", "assistant"]
+
+
+def test_client_leaving_mid_stream_abandons_the_turn(monkeypatch, recorded):
+    monkeypatch.setattr(interview_service, "stream_next_message", stream_of({"type": "delta", "text": "Tell"}, DONE))
+
+    async def run():
+        events = await interview_service.open_message_stream(INTERVIEW_ID, "I use Python")
+        await anext(events)
+        await events.aclose()
+
+    asyncio.run(run())
+    assert recorded == []
+    assert transcript() == [GREETING]
+
+
+def test_stream_error_abandons_the_turn(monkeypatch, recorded):
+    monkeypatch.setattr(
+        interview_service, "stream_next_message", stream_of({"type": "delta", "text": "Tell"}, error=RuntimeError("boom"))
+    )
+
+    async def run():
+        events = await interview_service.open_message_stream(INTERVIEW_ID, "I use Python")
+        async for _ in events:
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert recorded == []
+    assert transcript() == [GREETING]
+
+
+def test_error_before_the_first_event_abandons_the_turn(monkeypatch, recorded):
+    monkeypatch.setattr(interview_service, "stream_next_message", stream_of(error=RuntimeError("boom")))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(interview_service.open_message_stream(INTERVIEW_ID, "I use Python"))
+    assert transcript() == [GREETING]
+
+
+def test_closing_at_done_still_records_the_turn(monkeypatch, recorded):
+    monkeypatch.setattr(interview_service, "stream_next_message", stream_of(DONE))
+
+    async def run():
+        events = await interview_service.open_message_stream(INTERVIEW_ID, "I use Python")
+        assert (await anext(events))["type"] == "done"
+        await events.aclose()  # the client went away right after receiving "done"
+
+    asyncio.run(run())
+    assert len(recorded) == 1
+    assert transcript()[-1]["content"] == DONE["reply"]
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_failed_write_leaves_the_cache_as_the_database_has_it(monkeypatch, recorded, streamed):
+    async def record_turn(turn):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(persistence_service, "PERSIST_WRITE_BEHIND", False)
+    monkeypatch.setattr(persistence_service, "record_turn", record_turn)
+    monkeypatch.setattr(interview_service, "submit_turn", persistence_service.submit_turn)
+    completing = {**DONE, "phase": "completed"}
+    monkeypatch.setattr(interview_service, "stream_next_message", stream_of(completing))
+
+    async def generate_next_message(**kwargs):
+        return completing
+
+    monkeypatch.setattr(interview_service, "generate_next_message", generate_next_message)
+
+    async def run():
+        if not streamed:
+            return await interview_service.process_message(INTERVIEW_ID, "I use Python")
+        events = await interview_service.open_message_stream(INTERVIEW_ID, "I use Python")
+        async for _ in events:
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    session = sessions.get(INTERVIEW_ID)
+    assert session["messages"] == [GREETING]
+    assert session["step"] == "technical"
+    assert session["scores"] == []
+    assert session["candidate"]["status"] == "In Progress"
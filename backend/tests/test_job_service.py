@@ -0,0 +1,138 @@
+"""Job claiming, retries and lease reclaim, on the SQLite backend."""
+
+import asyncio
+
+import pytest
+
+from app.services import job_service
+from app.sqlite_backend import SQLiteClient
+
+calls = []
+
+
+@job_service.handler("test_job")
+async def _test_job(payload: dict) -> dict:
+    calls.append(payload)
+    await asyncio.sleep(0)  # let a competing worker run in between
+    if payload.get("fail") == "retry":
+        raise RuntimeError("transient")
+    if payload.get("fail") == "permanent":
+        raise job_service.PermanentError("bad input")
+    return {"ok": True}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = SQLiteClient(":memory:")
+    monkeypatch.setattr(job_service, "get_db", lambda: client)
+    calls.clear()
+    return client
+
+
+def insert(db, **fields) -> str:
+    row = {
+        "kind": "test_job", "payload": {}, "status": job_service.QUEUED, "attempts": 0, "max_attempts": 3,
+        "run_after": job_service._timestamp(), **fields,
+    }
+    return asyncio.run(db.table("jobs").insert(row).execute()).data[0]["id"]
+
+
+def job(db, job_id) -> dict:
+    return asyncio.run(db.table("jobs").select("*").eq("id", job_id).single().execute()).data
+
+
+def test_job_runs_once_when_two_workers_race(db):
+    job_id = insert(db)
+
+    async def race():
+        await asyncio.gather(job_service._run(job_id), job_service._run(job_id))
+
+    asyncio.run(race())
+    assert len(calls) == 1
+    done = job(db, job_id)
+    assert done["status"] == job_service.DONE
+    assert done["attempts"] == 1
+    assert done["result"] == {"ok": True}
+
+
+def test_failed_attempt_is_requeued_with_backoff(db):
+    job_id = insert(db, payload={"fail": "retry"})
+
+    asyncio.run(job_service._run(job_id))
+
+    retried = job(db, job_id)
+    assert retried["status"] == job_service.QUEUED
+    assert retried["attempts"] == 1
+    assert retried["run_after"] > job_service._timestamp()
+    assert not job_service._claimable(retried)
+
+
+def test_permanent_error_fails_at_once(db):
+    job_id = insert(db, payload={"fail": "permanent"})
+
+    asyncio.run(job_service._run(job_id))
+
+    assert job(db, job_id)["status"] == job_service.FAILED
+
+
+def test_expired_lease_is_reclaimed(db):
+    job_id = insert(db, status=job_service.RUNNING, attempts=1, locked_until=job_service._timestamp(-60))
+
+    asyncio.run(job_service._run(job_id))
+
+    reclaimed = job(db, job_id)
+    assert len(calls) == 1
+    assert reclaimed["status"] == job_service.DONE
+    assert reclaimed["attempts"] == 2
+
+
+def test_live_lease_is_not_reclaimed(db):
+    job_id = insert(db, status=job_service.RUNNING, attempts=1, locked_until=job_service._timestamp(60))
+
+    asyncio.run(job_service._run(job_id))
+
+    assert calls == []
+    assert job(db, job_id)["status"] == job_service.RUNNING
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_job(db):
+    # The worker died on every attempt, e.g. a payload that crashes it
+    job_id = insert(db, status=job_service.RUNNING, attempts=3, locked_until=job_service._timestamp(-60))
+
+    asyncio.run(job_service._run(job_id))
+
+    failed = job(db, job_id)
+    assert calls == []
+    assert failed["status"] == job_service.FAILED
+    assert "Lease expired" in failed["error"]
+
+
+def test_submit_with_a_taken_dedupe_key_returns_the_unfinished_job(db):
+    job_id = insert(db, dedupe_key="report:1", status=job_service.RUNNING, attempts=1)
+
+    submitted = asyncio.run(job_service.submit("test_job", {}, dedupe_key="report:1"))
+
+    assert submitted["id"] == job_id
+    assert len(asyncio.run(db.table("jobs").select("id").execute()).data) == 1
+
+
+def test_dedupe_key_is_free_again_once_the_job_finished(db):
+    insert(db, dedupe_key="report:1", status=job_service.DONE)
+
+    submitted = asyncio.run(job_service.submit("test_job", {}, dedupe_key="report:1"))
+
+    assert job(db, submitted["id"])["status"] == job_service.QUEUED
+
+
+def test_duplicate_unfinished_jobs_from_an_older_schema_are_failed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    old = SQLiteClient(path)
+    old.db.execute("drop index jobs_dedupe_key_unique_idx")
+    first = insert(old, dedupe_key="report:1", created_at="2024-01-01T00:00:00Z")
+    second = insert(old, dedupe_key="report:1", created_at="2024-01-02T00:00:00Z")
+    old.db.close()
+
+    client = SQLiteClient(path)
+
+    assert job(client, first)["status"] == job_service.QUEUED
+    assert job(client, second)["status"] == job_service.FAILED
@@ -0,0 +1,28 @@
+from app.services.keyword_matcher import KeywordMatcher
+
+
+def test_single_letter_keyword_does_not_match_inside_c_plus_plus_or_c_sharp():
+    matcher = KeywordMatcher(["C", "C++", "C#"])
+
+    assert matcher.count("Skills: C++, C# and plain C.") == {"c++": 1, "c#": 1, "c": 1}
+    assert matcher.count("C++ and C#") == {"c++": 1, "c#": 1}
+
+
+def test_symbol_keywords_match_before_version_numbers_and_punctuation():
+    matcher = KeywordMatcher(["C++", "node.js"])
+
+    assert matcher.count("Modern C++17; node.js/express") == {"c++": 1, "node.js": 1}
+
+
+def test_word_boundaries():
+    matcher = KeywordMatcher(["go", "java"])
+
+    assert matcher.count("google javascript") == {}
+    assert matcher.count("Go, Java and go-kit") == {"go": 2, "java": 1}
+
+
+def test_overlapping_keywords_and_offsets():
+    matcher = KeywordMatcher(["machine learning", "learning", "Learning"])
+
+    assert len(matcher) == 2
+    assert matcher.find_all("Deep   Machine\nLearning") == {"machine learning": [5], "learning": [13]}
@@ -0,0 +1,159 @@
+"""Model routing: fallback order, circuit breakers and hedged calls."""
+
+import asyncio
+
+import pytest
+
+from app.services import model_router
+from app.services.model_router import AllModelsFailed, InvalidResponse, ModelRouter
+
+MODELS = ["primary", "secondary", "tertiary"]
+
+
+class ResourceExhausted(Exception):
+    """Named like the google.api_core error the router treats as a rate limit."""
+
+
+@pytest.fixture(autouse=True)
+def breaker_settings(monkeypatch):
+    monkeypatch.setattr(model_router, "MODEL_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(model_router, "MODEL_BREAKER_COOLDOWN", 30)
+    monkeypatch.setattr(model_router, "MODEL_RATE_LIMIT_COOLDOWN", 60)
+
+
+def caller(behaviour: dict):
+    """``call(model)`` that raises the model's exception, else answers with its name."""
+    calls = []
+
+    async def call(model: str) -> str:
+        calls.append(model)
+        error = behaviour.get(model)
+        if error is not None:
+            raise error
+        return model
+
+    return call, calls
+
+
+def run(router: ModelRouter, call, retries: int = 1):
+    return asyncio.run(router.call(call, retries=retries, base_delay=0))
+
+
+def test_failures_fall_through_to_the_next_model():
+    router = ModelRouter(MODELS, hedge=False)
+    call, calls = caller({"primary": RuntimeError("down")})
+
+    assert run(router, call) == "secondary"
+    assert calls == ["primary", "secondary"]
+
+
+def trip(router: ModelRouter, model: str) -> None:
+    for _ in range(model_router.MODEL_FAILURE_THRESHOLD):
+        router.record_failure(model, RuntimeError("down"))
+
+
+def test_breaker_opens_after_consecutive_failures_and_skips_the_model():
+    router = ModelRouter(MODELS, hedge=False)
+    router.record_failure("primary", RuntimeError("down"))
+    assert not router.health["primary"].is_open
+    router.record_failure("primary", RuntimeError("down"))
+    assert router.health["primary"].is_open
+
+    call, calls = caller({})
+    assert run(router, call) == "secondary"
+    assert calls == ["secondary"]
+
+
+def test_trial_call_after_cooldown_closes_the_breaker(monkeypatch):
+    router = ModelRouter(MODELS, hedge=False)
+    trip(router, "primary")
+
+    router.health["primary"].open_until = 0.0  # cooldown over
+    monkeypatch.setattr(model_router, "STATS_MAX_AGE", -1)  # and the failures are old
+    healthy, calls = caller({})
+    assert run(router, healthy) == "primary"
+    assert not router.health["primary"].is_open
+    assert router.health["primary"].consecutive_failures == 0
+
+
+def test_failed_trial_reopens_the_breaker_at_once():
+    router = ModelRouter(MODELS, hedge=False)
+    trip(router, "primary")
+
+    router.health["primary"].open_until = 0.0
+    router.record_failure("primary", RuntimeError("still down"))
+    assert router.health["primary"].is_open
+
+
+def test_demoted_model_is_preferred_again_once_its_errors_age_out(monkeypatch):
+    router = ModelRouter(MODELS, hedge=False)
+    router.record_failure("primary", RuntimeError("blip"))
+    assert router.ranked()[0] == "secondary"
+
+    monkeypatch.setattr(model_router, "STATS_MAX_AGE", -1)
+    assert router.ranked()[0] == "primary"
+
+
+def test_rate_limit_opens_the_breaker_on_the_first_error():
+    router = ModelRouter(MODELS, hedge=False)
+    call, _ = caller({"primary": ResourceExhausted("quota")})
+
+    assert run(router, call) == "secondary"
+    assert router.health["primary"].is_open
+
+
+def test_invalid_output_does_not_count_against_the_model():
+    router = ModelRouter(MODELS, hedge=False)
+    call, _ = caller({"primary": InvalidResponse("not JSON")})
+    for _ in range(3):
+        run(router, call)
+
+    assert not router.health["primary"].is_open
+    assert router.health["primary"].error_rate == 0.0
+
+
+def test_all_models_failing_raises_after_every_round():
+    router = ModelRouter(MODELS, hedge=False)
+    call, calls = caller({m: RuntimeError("down") for m in MODELS})
+
+    with pytest.raises(AllModelsFailed):
+        run(router, call, retries=2)
+    assert calls == MODELS * 2
+
+
+def test_ranking_prefers_healthy_unthrottled_models():
+    router = ModelRouter(MODELS, hedge=False, throttled=lambda name: name == "primary")
+    for _ in range(5):
+        router.record_success("secondary", 0.1)
+        router.record_success("tertiary", 0.1)
+    router.record_failure("secondary", RuntimeError("blip"))
+
+    assert router.ranked() == ["tertiary", "secondary", "primary"]
+
+
+def test_with_every_breaker_open_the_one_cooling_down_first_is_tried():
+    router = ModelRouter(MODELS, hedge=False)
+    for i, model in enumerate(MODELS):
+        router.health[model].open_until = 10**9 - i
+
+    assert router.ranked() == ["tertiary"]
+
+
+def test_slow_call_is_hedged_and_the_loser_cancelled():
+    router = ModelRouter(MODELS[:2], hedge=True)
+    for _ in range(model_router.MIN_HEDGE_SAMPLES):
+        router.record_success("primary", 0.01)
+        router.record_success("secondary", 0.02)
+    cancelled = []
+
+    async def call(model: str) -> str:
+        if model == "primary":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(model)
+                raise
+        return model
+
+    assert run(router, call) == "secondary"
+    assert cancelled == ["primary"]
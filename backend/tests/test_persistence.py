@@ -0,0 +1,88 @@
+"""record_interview_turn is atomic and idempotent per turn (SQLite backend)."""
+
+import asyncio
+
+import pytest
+
+from app.sqlite_backend import SQLiteClient, StorageError
+
+
+def make_interview(client):
+    async def run():
+        candidate = await client.table("candidates").insert({"name": "Ada", "email": "ada@example.com"}).execute()
+        interview = await client.table("interviews").insert({
+            "candidate_id": candidate.data[0]["id"], "current_step": "technical",
+        }).execute()
+        return interview.data[0]["id"]
+    return asyncio.run(run())
+
+
+def record(client, interview_id, **overrides):
+    params = {
+        "p_interview_id": interview_id,
+        "p_user_content": "I use Python",
+        "p_user_step": "technical",
+        "p_reply": "Tell me more.",
+        "p_next_step": "technical",
+        "p_score": 7,
+        "p_turn_id": "7f1c3a52-55d4-4d0c-9d43-9c5ab4f6d7a1",
+        **overrides,
+    }
+    asyncio.run(client.rpc("record_interview_turn", params).execute())
+
+
+def count(client, table):
+    return client.db.execute(f"select count(*) from {table}").fetchone()[0]
+
+
+def test_retried_turn_is_recorded_once():
+    client = SQLiteClient(":memory:")
+    interview_id = make_interview(client)
+
+    record(client, interview_id)
+    record(client, interview_id)
+
+    assert count(client, "interview_messages") == 2
+    assert count(client, "interview_scores") == 1
+
+
+def test_turns_without_an_id_are_always_recorded():
+    client = SQLiteClient(":memory:")
+    interview_id = make_interview(client)
+
+    record(client, interview_id, p_turn_id=None)
+    record(client, interview_id, p_turn_id=None)
+
+    assert count(client, "interview_messages") == 4
+
+
+def test_failed_turn_writes_nothing():
+    client = SQLiteClient(":memory:")
+    interview_id = make_interview(client)
+
+    # The reply insert is the last statement and violates "content not null",
+    # after the user message, score and status updates have already run
+    with pytest.raises(StorageError):
+        record(client, interview_id, p_reply=None, p_next_step="completed")
+
+    assert count(client, "interview_messages") == 0
+    assert count(client, "interview_scores") == 0
+    interview = client.db.execute("select current_step, completed_at from interviews").fetchone()
+    assert tuple(interview) == ("technical", None)
+    assert client.db.execute("select status from candidates").fetchone()[0] == "New"
+
+    # The connection is usable afterwards and the turn can be retried
+    record(client, interview_id, p_next_step="completed")
+    assert count(client, "interview_messages") == 2
+
+
+def test_multi_row_insert_is_all_or_nothing():
+    client = SQLiteClient(":memory:")
+
+    with pytest.raises(StorageError):
+        asyncio.run(client.table("candidates").insert([
+            {"name": "Ada", "email": "ada@example.com"},
+            {"name": None, "email": "nobody@example.com"},
+        ]).execute())
+
+    assert count(client, "candidates") == 0
@@ -0,0 +1,54 @@
+"""ReplyStreamParser decodes the ``reply`` field however the JSON is split into chunks."""
+
+import json
+
+import pytest
+
+from app.services.gemini_service import ReplyStreamParser
+
+REPLY = 'Say "hi" \\ then\na tab\t, café, 😀 and 中文'
+RESPONSE = json.dumps({"phase": "technical", "reply": REPLY, "score": 7, "assessment": "a \"quoted\" note"})
+
+
+def feed(chunks) -> tuple[str, list[str]]:
+    parser = ReplyStreamParser()
+    deltas = [parser.feed(chunk) for chunk in chunks]
+    assert parser.done
+    return parser.reply, deltas
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, len(RESPONSE)])
+def test_any_chunking_decodes_the_reply(size):
+    reply, deltas = feed(RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size))
+
+    assert reply == REPLY
+    assert "".join(deltas) == REPLY
+
+
+def test_escaped_surrogate_pair_is_one_character():
+    # json.dumps escapes non-ASCII; the emoji arrives as two \u escapes, split between chunks
+    response = json.dumps({"reply": "ok 😀"})
+    split = response.index("\\ude00") + 3
+
+    reply, deltas = feed([response[:split], response[split:]])
+
+    assert reply == "ok 😀"
+    assert all("\ud83d" not in delta for delta in deltas)
+
+
+def test_text_after_the_reply_is_not_emitted():
+    parser = ReplyStreamParser()
+
+    assert parser.feed('{"reply": "Hel') == "Hel"
+    assert parser.feed('lo", "phase": "technical", "reply": "again"}') == "lo"
+    assert parser.feed("more") == ""
+    assert parser.reply == "Hello"
+
+
+def test_nothing_is_emitted_before_the_reply_key():
+    parser = ReplyStreamParser()
+
+    assert parser.feed('{"phase": "tech') == ""
+    assert parser.feed('nical", "rep') == ""
+    assert not parser.emitted
+    assert parser.feed('ly": "Hi"}') == "Hi"
@@ -0,0 +1,61 @@
+"""The request metrics middleware times streamed responses until the body is done."""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app import metrics
+from app.main import record_request_metrics
+
+DELAY = 0.1
+
+
+def streaming_app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(record_request_metrics)
+
+    @app.get("/test/stream")
+    async def stream():
+        async def events():
+            yield "event: delta\n\n"
+            await asyncio.sleep(DELAY)
+            yield "event: done\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+async def get(app, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "", "headers": [],
+        "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+    sent = []
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()  # the client stays connected until the response is complete
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    await app(scope, receive, send)
+    return b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+
+def test_streamed_response_is_timed_until_the_last_chunk():
+    body = asyncio.run(get(streaming_app(), "/test/stream"))
+
+    assert body == b"event: delta\n\nevent: done\n\n"
+    series = metrics.http_request_seconds._series[("GET", "/test/stream", "200")]
+    assert series[-1] >= DELAY
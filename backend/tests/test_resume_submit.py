@@ -0,0 +1,75 @@
+"""Single-resume analysis: known files are answered at once, new ones queue a job by file path."""
+
+import asyncio
+import io
+import os
+
+import pytest
+
+from app.services import job_service, keyword_cache, resume_service
+from app.sqlite_backend import SQLiteClient
+
+PDF = b"%PDF-1.4 resume"
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    client = SQLiteClient(":memory:")
+    for module in (job_service, keyword_cache, resume_service):
+        monkeypatch.setattr(module, "get_db", lambda: client)
+    monkeypatch.setattr(resume_service, "RESUME_UPLOAD_DIR", str(tmp_path))
+    keyword_cache.keyword_cache.invalidate()
+    resume_service._hash_cache.clear()
+    return client
+
+
+def candidate(db) -> str:
+    return asyncio.run(db.table("candidates").insert({"name": "Ada", "email": "ada@example.com"}).execute()).data[0]["id"]
+
+
+def jobs(db) -> list:
+    return asyncio.run(db.table("jobs").select("*").execute()).data
+
+
+def test_known_file_is_answered_without_a_job(db, monkeypatch):
+    candidate_id = candidate(db)
+    version = asyncio.run(keyword_cache.keyword_cache.get()).version
+    analysis = {"skills_found": ["python"], "score": 10, "keyword_version": version}
+    content_hash = resume_service.hash_upload(io.BytesIO(PDF))
+    asyncio.run(resume_service.save_resume(candidate_id, "old.pdf", "text", analysis, content_hash))
+    monkeypatch.setattr(resume_service, "extract_text_from_pdf", lambda stream: pytest.fail("extracted again"))
+
+    found_hash, resume = asyncio.run(resume_service.analyze_known_upload(io.BytesIO(PDF), "cv.pdf", candidate_id))
+
+    assert found_hash == content_hash
+    assert resume["file_path"] == "old.pdf"
+    assert jobs(db) == []
+
+
+def test_new_file_is_queued_by_path_and_removed_once_analyzed(db, monkeypatch):
+    candidate_id = candidate(db)
+    upload = io.BytesIO(PDF)
+
+    content_hash, resume = asyncio.run(resume_service.analyze_known_upload(upload, "cv.pdf", candidate_id))
+    assert resume is None
+    asyncio.run(resume_service.submit_analysis(upload, "cv.pdf", candidate_id, content_hash))
+
+    [job] = jobs(db)
+    payload = job["payload"]
+    assert "pdf" not in payload
+    with open(payload["path"], "rb") as f:
+        assert f.read() == PDF
+
+    monkeypatch.setattr(resume_service, "extract_text_from_pdf", lambda stream: stream.read().decode())
+    result = asyncio.run(resume_service._analysis_job(payload))
+
+    assert result["content_text"] == PDF.decode()
+    assert result["content_hash"] == content_hash
+    assert not os.path.exists(payload["path"])
+
+
+def test_oversized_upload_is_rejected_while_hashing(db, monkeypatch):
+    monkeypatch.setattr(resume_service, "PDF_MAX_BYTES", len(PDF) - 1)
+
+    with pytest.raises(resume_service.PDFLimitError):
+        asyncio.run(resume_service.analyze_known_upload(io.BytesIO(PDF), "cv.pdf", candidate(db)))
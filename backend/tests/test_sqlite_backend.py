@@ -0,0 +1,133 @@
+"""The SQLite backend answers the PostgREST-style queries the services send."""
+
+import asyncio
+
+import pytest
+
+from app.sqlite_backend import SQLiteClient, StorageError
+
+
+@pytest.fixture
+def db():
+    return SQLiteClient(":memory:")
+
+
+def run(query):
+    return asyncio.run(query.execute()).data
+
+
+def add_candidate(db, name, **fields):
+    return run(db.table("candidates").insert({"name": name, "email": f"{name.lower()}@example.com", **fields}))[0]
+
+
+def names(rows):
+    return sorted(r["name"] for r in rows)
+
+
+def test_filters(db):
+    add_candidate(db, "Ada", experience=5, status="Completed", position="Backend")
+    add_candidate(db, "Grace", experience=2, status="In Progress", position="Frontend")
+    add_candidate(db, "Linus", experience=9, position=None)
+
+    assert names(run(db.table("candidates").select("name").eq("status", "Completed"))) == ["Ada"]
+    assert names(run(db.table("candidates").select("name").neq("status", "Completed"))) == ["Grace", "Linus"]
+    assert names(run(db.table("candidates").select("name").gte("experience", 5))) == ["Ada", "Linus"]
+    assert names(run(db.table("candidates").select("name").in_("name", ["Ada", "Linus"]))) == ["Ada", "Linus"]
+    assert names(run(db.table("candidates").select("name").in_("name", []))) == []
+    assert names(run(db.table("candidates").select("name").ilike("position", "*END*"))) == ["Ada", "Grace"]
+    assert names(run(db.table("candidates").select("name").is_("position", "null"))) == ["Linus"]
+
+
+def test_or_with_nested_and_pages_by_keyset(db):
+    rows = [add_candidate(db, name) for name in ("A", "B", "C", "D")]
+    # Same shape as the candidate list cursor: (created_at, id) < (ts, id)
+    last = rows[2]
+    page = run(
+        db.table("candidates").select("name")
+        .or_(f"created_at.lt.{last['created_at']},and(created_at.eq.{last['created_at']},id.lt.{last['id']})")
+        .order("created_at", desc=True).order("id", desc=True)
+        .limit(10)
+    )
+
+    assert [r["name"] for r in page] == ["B", "A"]
+
+
+def test_or_combines_with_the_other_filters(db):
+    add_candidate(db, "Ada", status="Completed", experience=1)
+    add_candidate(db, "Grace", status="In Progress", experience=1)
+    add_candidate(db, "Linus", status="Completed", experience=9)
+
+    rows = run(db.table("candidates").select("name").eq("status", "Completed").or_("experience.lt.2,name.eq.Grace"))
+
+    assert names(rows) == ["Ada"]
+
+
+def test_timestamp_filters_compare_across_formats(db):
+    add_candidate(db, "Ada", created_at="2024-01-01T10:00:00+02:00")  # 08:00 UTC
+    add_candidate(db, "Grace", created_at="2024-01-01T09:00:00Z")
+
+    assert names(run(db.table("candidates").select("name").lt("created_at", "2024-01-01T08:30:00"))) == ["Ada"]
+    assert run(db.table("candidates").select("created_at").eq("name", "Ada"))[0]["created_at"] == (
+        "2024-01-01T08:00:00.000000+00:00"
+    )
+
+
+def test_embedded_resources(db):
+    ada = add_candidate(db, "Ada")
+    interview = run(db.table("interviews").insert({"candidate_id": ada["id"], "current_step": "technical"}))[0]
+    run(db.table("interview_messages").insert([
+        {"interview_id": interview["id"], "role": "assistant", "content": "Hello", "step": "technical"},
+        {"interview_id": interview["id"], "role": "user", "content": "Hi", "step": "technical"},
+    ]))
+
+    row = run(
+        db.table("interviews")
+        .select("id, candidates(name), interview_messages(role, content), interview_reports(report)")
+        .eq("id", interview["id"])
+        .single()
+    )
+
+    assert row["candidates"] == {"name": "Ada"}  # many-to-one: an object, join key hidden
+    assert sorted(m["role"] for m in row["interview_messages"]) == ["assistant", "user"]
+    assert set(row["interview_messages"][0]) == {"role", "content"}
+    assert row["interview_reports"] is None  # one-to-one, nothing yet
+
+    embedded = run(db.table("candidates").select("name, interviews(current_step)"))
+    assert embedded == [{"name": "Ada", "interviews": [{"current_step": "technical"}]}]
+
+
+def test_upsert_updates_on_conflict_and_round_trips_json(db):
+    ada = add_candidate(db, "Ada")
+    interview = run(db.table("interviews").insert({"candidate_id": ada["id"], "current_step": "completed"}))[0]
+    report = {"interview_id": interview["id"], "report": {"summary": "v1"}, "transcript_hash": "h1"}
+    run(db.table("interview_reports").upsert(report, on_conflict="interview_id"))
+    run(db.table("interview_reports").upsert(
+        {**report, "report": {"summary": "v2", "strengths": ["sql"]}, "transcript_hash": "h2"},
+        on_conflict="interview_id",
+    ))
+
+    [stored] = run(db.table("interview_reports").select("report, transcript_hash"))
+    assert stored == {"report": {"summary": "v2", "strengths": ["sql"]}, "transcript_hash": "h2"}
+
+
+def test_update_and_delete_return_the_affected_rows(db):
+    ada = add_candidate(db, "Ada")
+    add_candidate(db, "Grace")
+
+    updated = run(db.table("candidates").update({"status": "Completed"}).eq("id", ada["id"]))
+    deleted = run(db.table("candidates").delete().eq("name", "Grace"))
+
+    assert [r["status"] for r in updated] == ["Completed"]
+    assert names(deleted) == ["Grace"]
+    assert names(run(db.table("candidates").select("name"))) == ["Ada"]
+
+
+def test_errors_mirror_postgrest(db):
+    with pytest.raises(StorageError):
+        db.table("nope")
+    with pytest.raises(StorageError):
+        run(db.table("candidates").select("nope"))
+    with pytest.raises(StorageError):
+        run(db.table("candidates").insert({"name": "Ada", "email": "a@example.com", "nope": 1}))
+    with pytest.raises(StorageError):
+        run(db.table("candidates").select("*").single())  # no rows
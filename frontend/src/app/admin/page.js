@@ -8,18 +8,48 @@ export default function AdminPage() {
   const [loading, setLoading] = useState(true);
   const [expandedId, setExpandedId] = useState(null);
   const [scores, setScores] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     Promise.all([
-      api.getCandidates().catch(() => []),
+      api.getCandidates().catch(() => ({ items: [], next_cursor: null })),
       api.getStats().catch(() => null)
-    ]).then(([cands, sts]) => {
-      setCandidates(cands);
+    ]).then(([page, sts]) => {
+      setCandidates(page.items);
+      setNextCursor(page.next_cursor);
       setStats(sts);
       setLoading(false);
+      prefetchScores(page.items);
     });
   }, []);
 
+  // One request for the whole page instead of one per expanded row
+  const prefetchScores = async (items) => {
+    if (!items.length) return;
+    try {
+      const batch = await api.getCandidateScoresBatch(items.map(c => c.id));
+      setScores(prev => ({
+        ...prev,
+        ...Object.fromEntries(Object.entries(batch).map(([id, entry]) => [id, entry.scores])),
+      }));
+    } catch {
+      // Rows fall back to fetching their own scores when expanded
+    }
+  };
+
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await api.getCandidates({ cursor: nextCursor });
+      setCandidates(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+      prefetchScores(page.items);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const toggleExpand = async (id) => {
     if (expandedId === id) {
       setExpandedId(null);
@@ -134,6 +164,13 @@ export default function AdminPage() {
             </tbody>
           </table>
         )}
+        {nextCursor && (
+          <div className="load-more">
+            <button className="btn btn-secondary" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
 
       <style jsx>{`
@@ -281,6 +318,10 @@ export default function AdminPage() {
                     margin-top: 6px;
                     line-height: 1.4;
                 }
+                .load-more {
+                    padding: 16px;
+                    text-align: center;
+                }
                 .no-scores {
                     color: var(--text-muted);
                     font-style: italic;
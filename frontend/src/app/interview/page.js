@@ -46,13 +46,71 @@ export default function InterviewPage() {
     const [thinking, setThinking] = useState(false);
     const [interviewId, setInterviewId] = useState(null);
     const [currentStepIdx, setCurrentStepIdx] = useState(0);
+    const [connection, setConnection] = useState("connecting");
     const chatEndRef = useRef(null);
+    const channelRef = useRef(null);
+    const streamingRef = useRef(false); // a reply bubble is being filled in
     const suggestionsRef = useRef(null);
 
     useEffect(() => {
         chatEndRef.current?.scrollIntoView({ behavior: "smooth" });
     }, [messages, thinking]);
 
+    const showStep = (step) => {
+        if (step && STEP_MAP[step] !== undefined) {
+            setCurrentStepIdx(STEP_MAP[step]);
+        }
+    };
+
+    // One WebSocket for the whole interview; it reconnects and resyncs on its own
+    useEffect(() => {
+        if (!interviewId) return;
+        const channel = api.connectInterview(interviewId, {
+            onSession: (session) => {
+                const partial = session.pending?.reply;
+                streamingRef.current = Boolean(partial);
+                setMessages([
+                    ...session.messages,
+                    ...(partial ? [{ role: "assistant", content: partial }] : []),
+                ]);
+                setThinking(Boolean(session.pending) && !partial);
+                showStep(session.current_step);
+            },
+            onDelta: (text) => {
+                if (!streamingRef.current) {
+                    streamingRef.current = true;
+                    setThinking(false);
+                    setMessages((prev) => [...prev, { role: "assistant", content: "" }]);
+                }
+                setMessages((prev) => {
+                    const last = prev[prev.length - 1];
+                    return [...prev.slice(0, -1), { ...last, content: last.content + text }];
+                });
+            },
+            onDone: (res) => {
+                const streaming = streamingRef.current;
+                streamingRef.current = false;
+                setMessages((prev) => streaming
+                    ? [...prev.slice(0, -1), { role: "assistant", content: res.message }]
+                    : [...prev, { role: "assistant", content: res.message }]);
+                setThinking(false);
+                showStep(res.current_step);
+            },
+            onError: (err) => {
+                console.error(err);
+                streamingRef.current = false;
+                setThinking(false);
+                const content = err.retry_after
+                    ? `The interviewer is busy right now. Please try again in ${Math.ceil(err.retry_after)} seconds.`
+                    : "Sorry, I encountered an error. Please try again.";
+                setMessages((prev) => [...prev, { role: "assistant", content }]);
+            },
+            onStatus: setConnection,
+        });
+        channelRef.current = channel;
+        return () => channel.close();
+    }, [interviewId]);
+
     // Close suggestions on outside click
     useEffect(() => {
         const handleClick = (e) => {
@@ -118,28 +176,15 @@ export default function InterviewPage() {
         }
     };
 
-    const handleSend = async (e) => {
+    const handleSend = (e) => {
         e.preventDefault();
-        if (!input.trim()) return;
+        if (!input.trim() || !channelRef.current) return;
 
         const userMsg = input;
         setInput("");
         setMessages((prev) => [...prev, { role: "user", content: userMsg }]);
-
         setThinking(true);
-        try {
-            const res = await api.sendMessage(interviewId, userMsg);
-            setMessages((prev) => [...prev, { role: "assistant", content: res.message }]);
-
-            if (res.current_step && STEP_MAP[res.current_step] !== undefined) {
-                setCurrentStepIdx(STEP_MAP[res.current_step]);
-            }
-        } catch (err) {
-            console.error(err);
-            setMessages((prev) => [...prev, { role: "assistant", content: "Sorry, I encountered an error. Please try again." }]);
-        } finally {
-            setThinking(false);
-        }
+        channelRef.current.send(userMsg);
     };
 
     const isCompleted = currentStepIdx === 5;
@@ -263,6 +308,9 @@ export default function InterviewPage() {
                             <div ref={chatEndRef} />
                         </div>
 
+                        {connection === "reconnecting" && (
+                            <div className="connection-notice">Connection lost. Reconnecting…</div>
+                        )}
                         <form onSubmit={handleSend} className="chat-input-area">
                             <input
                                 className="input"
@@ -485,6 +533,12 @@ export default function InterviewPage() {
                     margin-top: -4px;
                     flex-shrink: 0;
                 }
+                .connection-notice {
+                    padding: 8px 20px;
+                    font-size: 0.85rem;
+                    color: var(--text-secondary);
+                    text-align: center;
+                }
                 .chat-input-area {
                     padding: 20px;
                     border-top: 1px solid rgba(34, 197, 94, 0.1);
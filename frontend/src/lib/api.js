@@ -26,6 +26,15 @@ async function fetchAPI(endpoint, options = {}) {
     }
 }
 
+// Long-polls a background job until it finishes; resolves with its result.
+async function waitForJob(jobId) {
+    while (true) {
+        const job = await fetchAPI(`/jobs/${jobId}?wait=25`);
+        if (job.status === "done") return job.result;
+        if (job.status === "failed") throw new Error(job.error || "Job failed");
+    }
+}
+
 export const api = {
     login: (password) => fetchAPI("/auth/login", {
         method: "POST",
@@ -42,6 +51,79 @@ export const api = {
         body: JSON.stringify({ content, role: "user" }),
     }),
 
+    // Opens the interview's WebSocket channel and keeps it open, reconnecting
+    // with backoff. Every (re)connect delivers a `session` snapshot to onSession.
+    // A message still unanswered when the socket dropped is resent with its
+    // original id, so the server attaches to that turn instead of answering twice.
+    connectInterview: (interviewId, { onSession, onDelta, onDone, onError, onStatus } = {}) => {
+        const url = `${API_BASE.replace(/^http/, "ws")}/interviews/${interviewId}/ws`;
+        let socket = null;
+        let pending = null; // { id, content } awaiting its reply
+        let retries = 0;
+        let timer = null;
+        let closed = false;
+
+        const transmit = () => socket.send(JSON.stringify({ type: "message", ...pending }));
+
+        const connect = () => {
+            onStatus?.(retries ? "reconnecting" : "connecting");
+            socket = new WebSocket(url);
+            socket.onopen = () => {
+                retries = 0;
+                onStatus?.("open");
+            };
+            socket.onmessage = (e) => {
+                const event = JSON.parse(e.data);
+                if (event.type === "session") {
+                    if (pending && event.last_message_id === pending.id) pending = null;
+                    if (pending && event.pending?.id !== pending.id) {
+                        // The server never saw it: send again, and show it as in flight meanwhile
+                        transmit();
+                        onSession?.({
+                            ...event,
+                            messages: [...event.messages, { role: "user", content: pending.content }],
+                            pending: { id: pending.id, reply: "" },
+                        });
+                        return;
+                    }
+                    onSession?.(event);
+                } else if (event.type === "delta") {
+                    onDelta?.(event.text);
+                } else if (event.type === "done") {
+                    if (pending?.id === event.id) pending = null;
+                    onDone?.(event);
+                } else if (event.type === "error") {
+                    if (pending?.id === event.id) pending = null;
+                    onError?.(event);
+                }
+            };
+            socket.onclose = (e) => {
+                if (closed) return;
+                if (e.code === 4404) {
+                    onStatus?.("closed");
+                    onError?.({ detail: e.reason || "Interview not found" });
+                    return;
+                }
+                onStatus?.("reconnecting");
+                timer = setTimeout(connect, Math.min(10000, 500 * 2 ** retries++));
+            };
+        };
+        connect();
+
+        return {
+            send: (content) => {
+                pending = { id: crypto.randomUUID(), content };
+                // Otherwise it goes out after the next snapshot
+                if (socket.readyState === WebSocket.OPEN) transmit();
+            },
+            close: () => {
+                closed = true;
+                clearTimeout(timer);
+                socket.close();
+            },
+        };
+    },
+
     getInterviewStatus: (interviewId) => fetchAPI(`/interviews/${interviewId}/status`),
 
     analyzeResume: (formData) => {
@@ -56,12 +138,25 @@ export const api = {
                 const errorData = await res.json().catch(() => ({}));
                 throw new Error(errorData.detail || "Analysis failed");
             }
-            return res.json();
+            // 202: analysis runs as a background job
+            const body = await res.json();
+            return res.status === 202 ? waitForJob(body.job_id) : body;
         });
     },
 
-    getCandidates: (status) => fetchAPI(`/candidates${status ? `?status=${status}` : ""}`),
+    getJob: (jobId) => fetchAPI(`/jobs/${jobId}`),
+    waitForJob,
+
+    // Returns one page: { items, next_cursor }. Pass next_cursor back as `cursor`.
+    getCandidates: (params = {}) => {
+        const query = new URLSearchParams(
+            Object.entries(params).filter(([, v]) => v !== undefined && v !== null && v !== "")
+        ).toString();
+        return fetchAPI(`/candidates/${query ? `?${query}` : ""}`);
+    },
     getCandidateScores: (id) => fetchAPI(`/candidates/${id}/scores`),
+    // { [candidateId]: { scores, phase_averages, avg_score, interviews } }
+    getCandidateScoresBatch: (ids) => fetchAPI(`/candidates/scores/batch?ids=${ids.map(encodeURIComponent).join(",")}`),
     getStats: () => fetchAPI("/candidates/stats/summary"),
 
     getKeywords: () => fetchAPI("/resumes/keywords"),
@@ -15,6 +15,9 @@ create table if not exists candidates (
   created_at timestamp with time zone default now()
 );
 
+-- Keyset pagination for the admin candidate list
+create index if not exists candidates_created_at_id_idx on candidates (created_at desc, id desc);
+
 -- Interviews table
 create table if not exists interviews (
   id uuid primary key default uuid_generate_v4(),
@@ -32,9 +35,13 @@ create table if not exists interview_messages (
   role text not null, -- 'assistant' or 'user'
   content text not null,
   step text,
+  turn_id uuid, -- set by record_interview_turn, so a retried turn is not written twice
   created_at timestamp with time zone default now()
 );
 
+alter table interview_messages add column if not exists turn_id uuid;
+create unique index if not exists interview_messages_turn_id_idx on interview_messages (turn_id, role);
+
 -- Interview Scores table
 create table if not exists interview_scores (
   id uuid primary key default uuid_generate_v4(),
@@ -47,18 +54,31 @@ create table if not exists interview_scores (
   created_at timestamp with time zone default now()
 );
 
+-- Interview Reports table (one generated report per interview)
+create table if not exists interview_reports (
+  id uuid primary key default uuid_generate_v4(),
+  interview_id uuid unique references interviews(id) on delete cascade,
+  report jsonb not null,
+  transcript_hash text not null, -- report is regenerated when the transcript changes
+  generated_at timestamp with time zone default now()
+);
+
 -- Resumes table
 create table if not exists resumes (
   id uuid primary key default uuid_generate_v4(),
   candidate_id uuid references candidates(id) on delete cascade,
   file_path text,
   content_text text,
+  content_hash text, -- sha256 of the uploaded file, for dedupe
   skills_found text[],
   score numeric,
   analysis_json jsonb,
   created_at timestamp with time zone default now()
 );
 
+alter table resumes add column if not exists content_hash text;
+create index if not exists resumes_content_hash_idx on resumes (content_hash, candidate_id);
+
 -- Keywords table (for resume matching)
 create table if not exists resume_keywords (
   id uuid primary key default uuid_generate_v4(),
@@ -68,6 +88,217 @@ create table if not exists resume_keywords (
   created_at timestamp with time zone default now()
 );
 
+-- Background jobs (report generation, resume analysis); see backend/app/services/job_service.py
+create table if not exists jobs (
+  id uuid primary key default uuid_generate_v4(),
+  kind text not null,
+  payload jsonb not null default '{}',
+  status text not null default 'queued' check (status in ('queued', 'running', 'done', 'failed')),
+  dedupe_key text, -- at most one unfinished job per key is reused instead of queueing another
+  attempts integer not null default 0,
+  max_attempts integer not null default 3,
+  result jsonb,
+  error text,
+  run_after timestamp with time zone not null default now(), -- backoff before a retry
+  locked_until timestamp with time zone, -- lease of the worker running it
+  created_at timestamp with time zone default now(),
+  started_at timestamp with time zone,
+  finished_at timestamp with time zone
+);
+
+create index if not exists jobs_status_run_after_idx on jobs (status, run_after);
+-- At most one unfinished job per dedupe key. Duplicates left from before the
+-- index was unique are failed first, keeping the oldest.
+update jobs set status = 'failed', error = 'Duplicate of an earlier unfinished job', finished_at = now()
+ where status in ('queued', 'running') and dedupe_key is not null
+   and exists (
+     select 1 from jobs older
+      where older.dedupe_key = jobs.dedupe_key and older.status in ('queued', 'running')
+        and (older.created_at < jobs.created_at or (older.created_at = jobs.created_at and older.id < jobs.id))
+   );
+drop index if exists jobs_dedupe_key_idx;
+create unique index if not exists jobs_dedupe_key_unique_idx on jobs (dedupe_key) where status in ('queued', 'running');
+
+-- Record one interview turn in a single round trip: the candidate message,
+-- the score for it, the phase transition and the interviewer reply.
+-- clock_timestamp() keeps the two messages ordered within the transaction.
+-- A turn already recorded under p_turn_id is skipped, so retries are safe.
+drop function if exists record_interview_turn(uuid, text, text, text, text, numeric, text);
+create or replace function record_interview_turn(
+  p_interview_id uuid,
+  p_user_content text,
+  p_user_step text,
+  p_reply text,
+  p_next_step text,
+  p_score numeric default null,
+  p_assessment text default null,
+  p_turn_id uuid default null
+) returns void
+language plpgsql
+as $$
+declare
+  v_candidate_id uuid;
+begin
+  if p_turn_id is not null and exists (select 1 from interview_messages where turn_id = p_turn_id) then
+    return;
+  end if;
+
+  if p_user_content is not null then
+    insert into interview_messages (interview_id, role, content, step, turn_id, created_at)
+    values (p_interview_id, 'user', p_user_content, p_user_step, p_turn_id, clock_timestamp());
+  end if;
+
+  if p_score is not null then
+    insert into interview_scores (interview_id, category, score, strengths, improvements, assessment)
+    values (p_interview_id, p_user_step, p_score, '{}', '{}', coalesce(p_assessment, ''));
+  end if;
+
+  update interviews
+     set current_step = p_next_step,
+         completed_at = case when p_next_step = 'completed' then now() else completed_at end
+   where id = p_interview_id
+  returning candidate_id into v_candidate_id;
+
+  if p_next_step = 'completed' then
+    update candidates set status = 'Completed' where id = v_candidate_id;
+  end if;
+
+  insert into interview_messages (interview_id, role, content, step, turn_id, created_at)
+  values (p_interview_id, 'assistant', p_reply, p_next_step, p_turn_id, clock_timestamp());
+end;
+$$;
+
+-- Dashboard statistics, maintained incrementally by triggers so that
+-- get_stats_summary() is O(1) in the number of candidates and scores.
+create table if not exists stats_counters (
+  dimension text not null, -- 'status' | 'phase' | 'overall'
+  bucket text not null,    -- candidate status, interview phase, or 'all'
+  count bigint not null default 0,
+  score_sum numeric not null default 0,
+  primary key (dimension, bucket)
+);
+
+create table if not exists stats_daily (
+  day date primary key,
+  candidates bigint not null default 0,
+  completed bigint not null default 0,
+  scores bigint not null default 0,
+  score_sum numeric not null default 0
+);
+
+-- security definer: triggers fire for any role, but only these functions write the counters
+create or replace function bump_stat(p_dimension text, p_bucket text, p_count bigint, p_score_sum numeric)
+returns void language sql security definer as $$
+  insert into stats_counters (dimension, bucket, count, score_sum)
+  values (p_dimension, p_bucket, p_count, p_score_sum)
+  on conflict (dimension, bucket) do update
+    set count = stats_counters.count + excluded.count,
+        score_sum = stats_counters.score_sum + excluded.score_sum;
+$$;
+
+create or replace function bump_daily(p_day date, p_candidates bigint, p_completed bigint, p_scores bigint, p_score_sum numeric)
+returns void language sql security definer as $$
+  insert into stats_daily (day, candidates, completed, scores, score_sum)
+  values (p_day, p_candidates, p_completed, p_scores, p_score_sum)
+  on conflict (day) do update
+    set candidates = stats_daily.candidates + excluded.candidates,
+        completed = stats_daily.completed + excluded.completed,
+        scores = stats_daily.scores + excluded.scores,
+        score_sum = stats_daily.score_sum + excluded.score_sum;
+$$;
+
+create or replace function stats_on_candidate() returns trigger language plpgsql as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform bump_stat('status', coalesce(old.status, 'Unknown'), -1, 0);
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform bump_stat('status', coalesce(new.status, 'Unknown'), 1, 0);
+  end if;
+  if tg_op = 'INSERT' then
+    perform bump_daily(coalesce(new.created_at, now())::date, 1, 0, 0, 0);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists candidates_stats on candidates;
+create trigger candidates_stats
+  after insert or delete or update of status on candidates
+  for each row execute function stats_on_candidate();
+
+create or replace function stats_on_score() returns trigger language plpgsql as $$
+begin
+  if tg_op = 'INSERT' and new.score is not null then
+    perform bump_stat('phase', new.category, 1, new.score);
+    perform bump_stat('overall', 'all', 1, new.score);
+    perform bump_daily(coalesce(new.created_at, now())::date, 0, 0, 1, new.score);
+  elsif tg_op = 'DELETE' and old.score is not null then
+    perform bump_stat('phase', old.category, -1, -old.score);
+    perform bump_stat('overall', 'all', -1, -old.score);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists interview_scores_stats on interview_scores;
+create trigger interview_scores_stats
+  after insert or delete on interview_scores
+  for each row execute function stats_on_score();
+
+create or replace function stats_on_interview() returns trigger language plpgsql as $$
+begin
+  if old.completed_at is null and new.completed_at is not null then
+    perform bump_daily(new.completed_at::date, 0, 1, 0, 0);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists interviews_stats on interviews;
+create trigger interviews_stats
+  after update of completed_at on interviews
+  for each row execute function stats_on_interview();
+
+create or replace function get_stats_summary(p_days integer default 30)
+returns jsonb language sql stable as $$
+  select jsonb_build_object(
+    'total_candidates', coalesce((select sum(count) from stats_counters where dimension = 'status'), 0),
+    'completed_interviews', coalesce((select count from stats_counters where dimension = 'status' and bucket = 'Completed'), 0),
+    'avg_score', coalesce((select round(score_sum / nullif(count, 0), 1) from stats_counters where dimension = 'overall' and bucket = 'all'), 0),
+    'by_status', coalesce((select jsonb_object_agg(bucket, count) from stats_counters where dimension = 'status' and count > 0), '{}'::jsonb),
+    'by_phase', coalesce((
+      select jsonb_object_agg(bucket, jsonb_build_object('scores', count, 'avg_score', round(score_sum / nullif(count, 0), 1)))
+      from stats_counters where dimension = 'phase' and count > 0
+    ), '{}'::jsonb),
+    'by_day', coalesce((
+      select jsonb_agg(jsonb_build_object(
+        'day', day, 'candidates', candidates, 'completed', completed,
+        'scores', scores, 'avg_score', round(score_sum / nullif(scores, 0), 1)
+      ) order by day)
+      from stats_daily where day > current_date - p_days
+    ), '[]'::jsonb)
+  );
+$$;
+
+-- Backfill counters for databases created before the triggers existed
+insert into stats_counters (dimension, bucket, count, score_sum)
+select 'status', coalesce(status, 'Unknown'), count(*), 0 from candidates group by 2
+on conflict do nothing;
+insert into stats_counters (dimension, bucket, count, score_sum)
+select 'phase', category, count(*), sum(score) from interview_scores where score is not null group by 2
+on conflict do nothing;
+insert into stats_counters (dimension, bucket, count, score_sum)
+select 'overall', 'all', count(*), coalesce(sum(score), 0) from interview_scores where score is not null
+on conflict do nothing;
+insert into stats_daily (day, candidates, completed, scores, score_sum)
+select d, sum(c), sum(x), sum(n), sum(s) from (
+  select created_at::date d, 1 c, 0 x, 0 n, 0 s from candidates
+  union all select completed_at::date, 0, 1, 0, 0 from interviews where completed_at is not null
+  union all select created_at::date, 0, 0, 1, score from interview_scores where score is not null
+) t group by d
+on conflict do nothing;
+
 -- RLS Policies (Open availability for demo purposes)
 alter table candidates enable row level security;
 create policy "Public candidates" on candidates for all using (true);
@@ -81,8 +312,20 @@ create policy "Public messages" on interview_messages for all using (true);
 alter table interview_scores enable row level security;
 create policy "Public scores" on interview_scores for all using (true);
 
+alter table interview_reports enable row level security;
+create policy "Public reports" on interview_reports for all using (true);
+
 alter table resumes enable row level security;
 create policy "Public resumes" on resumes for all using (true);
 
 alter table resume_keywords enable row level security;
 create policy "Public keywords" on resume_keywords for all using (true);
+
+alter table jobs enable row level security;
+create policy "Public jobs" on jobs for all using (true);
+
+alter table stats_counters enable row level security;
+create policy "Public stats" on stats_counters for select using (true);
+
+alter table stats_daily enable row level security;
+create policy "Public daily stats" on stats_daily for select using (true);